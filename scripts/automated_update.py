@@ -11,6 +11,9 @@ import logging
 from pathlib import Path
 import update_models
 from update_models import validate_yaml_file
+from catalog import CONFIG_FILES
+from consistency import check_files, log_report
+from model_diff import write_diff_artifact
 
 from log_config import setup_logging
 
@@ -26,10 +29,28 @@ def parse_args():
         action="store_true",
         help="Fetch models and report what would change without writing YAML files",
     )
+    parser.add_argument(
+        "--diff-output",
+        metavar="PATH",
+        help="With --dry-run, save the unified diff to PATH instead of printing it",
+    )
     return parser.parse_args()
 
 
-def main(dry_run=False):
+def emit_diff(stats, diff_output=None):
+    """Print the dry-run diff, or save it to ``diff_output``."""
+    diff = stats.combined_diff()
+    if not diff:
+        logger.info("No model list changes to preview")
+        return
+    if diff_output:
+        Path(diff_output).write_text(diff, encoding="utf-8")
+        logger.info("Diff of %d file(s) written to %s", len(stats.file_diffs), diff_output)
+    else:
+        sys.stdout.write(diff)
+
+
+def main(dry_run=False, diff_output=None):
     """Main function for automated updates."""
     setup_logging()
     if dry_run:
@@ -50,6 +71,7 @@ def main(dry_run=False):
             if stats is None:
                 logger.error("Model update failed")
                 return 1
+            emit_diff(stats, diff_output)
             logger.info("DRY RUN completed successfully")
             return 0
 
@@ -64,20 +86,14 @@ def main(dry_run=False):
 
         parent_dir = Path(__file__).parent.parent
 
-        files_to_validate = [
-            parent_dir / 'librechat-env-f.yaml',
-            parent_dir / 'librechat-env-l.yaml',
-            parent_dir / 'librechat-up-f.yaml',
-            parent_dir / 'librechat-up-l.yaml',
-            parent_dir / 'librechat-test.yaml',
-        ]
+        files_to_validate = [parent_dir / name for name in CONFIG_FILES]
 
         validation_failed = False
         validation_errors = []
 
         for yaml_file in files_to_validate:
             if yaml_file.exists():
-                is_valid, error = validate_yaml_file(yaml_file)
+                is_valid, error = validate_yaml_file(yaml_file, use_cache=True)
                 if not is_valid:
                     validation_failed = True
                     validation_errors.append("%s: %s" % (yaml_file.name, error))
@@ -85,6 +101,19 @@ def main(dry_run=False):
                 else:
                     logger.info("[OK] %s validated successfully", yaml_file.name)
 
+        # Cross-file drift: same provider, different models or baseURL
+        if not validation_failed:
+            logger.info("Checking consistency across YAML files...")
+            try:
+                report = check_files([f for f in files_to_validate if f.exists()])
+                log_report(report)
+                if not report.ok:
+                    validation_failed = True
+                    for finding in report.errors:
+                        validation_errors.append("%s: %s" % (finding.provider, finding.message))
+            except Exception as e:
+                logger.warning("Consistency check could not run: %s", e)
+
         if validation_failed:
             logger.error("=" * 70)
             logger.error("YAML VALIDATION FAILED")
@@ -115,6 +144,13 @@ def main(dry_run=False):
             except Exception as e:
                 logger.warning("Failed to write commit message: %s", e)
 
+            diff_path = Path(__file__).parent.parent / ".model_diff.json"
+            try:
+                write_diff_artifact(stats.model_diffs, diff_path)
+                logger.info("Model diff written to %s", diff_path)
+            except Exception as e:
+                logger.warning("Failed to write model diff: %s", e)
+
         return 0
 
     except Exception as e:
@@ -124,5 +160,5 @@ def main(dry_run=False):
 
 if __name__ == "__main__":
     args = parse_args()
-    exit_code = main(dry_run=args.dry_run)
+    exit_code = main(dry_run=args.dry_run, diff_output=args.diff_output)
     sys.exit(exit_code)
@@ -0,0 +1,186 @@
+"""Rotating, compressed backups of the YAML configs.
+
+Replaces the single ``<file>.yaml.bak`` each script used to overwrite on
+every run. Backups live in ``.backups/<file name>/`` next to the file:
+
+    .backups/librechat-env-f.yaml/librechat-env-f.yaml.1      newest
+    .backups/librechat-env-f.yaml/librechat-env-f.yaml.2.gz
+    ...
+    .backups/librechat-env-f.yaml/librechat-env-f.yaml.5.gz   oldest
+
+Taking a backup costs (almost) no I/O: the newest generation is a reflink
+clone where the filesystem supports it (btrfs, XFS, APFS via copy), else a
+hard link, else a plain copy. A hard link is only a valid snapshot because
+every writer in this repo *replaces* the config (temp file + rename)
+instead of writing into it, so the linked inode keeps the old content.
+
+Older generations are gzip-compressed by ``compact()``, which the scripts
+call once at the end of a run, off the per-file hot path. When the newest
+generation is still a hard link to the live file (nothing was written
+since the last backup) no new generation is taken, so the history only
+holds real changes.
+
+Environment:
+    BACKUP_GENERATIONS  generations kept per file (default 5)
+    BACKUP_DIR          backup root instead of ``<config dir>/.backups``
+"""
+
+from __future__ import annotations
+
+import gzip
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GENERATIONS = 5
+BACKUP_DIR_NAME = ".backups"
+
+# Linux ioctl that makes ``dst`` share ``src``'s extents (copy-on-write).
+_FICLONE = 0x40049409
+
+
+def _reflink(src: Path, dst: Path) -> None:
+    import fcntl
+
+    with src.open("rb") as s, dst.open("wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        except OSError:
+            d.close()
+            dst.unlink()
+            raise
+    shutil.copystat(src, dst)
+
+
+class BackupStore:
+    """Keeps ``generations`` rotating backups per file."""
+
+    def __init__(self, root: Optional[Path] = None, generations: Optional[int] = None):
+        if root is None and os.environ.get("BACKUP_DIR"):
+            root = Path(os.environ["BACKUP_DIR"])
+        if generations is None:
+            generations = int(os.environ.get("BACKUP_GENERATIONS", DEFAULT_GENERATIONS))
+        if generations < 1:
+            raise ValueError("generations must be at least 1")
+        self.root = Path(root) if root is not None else None
+        self.generations = generations
+
+    def _dir_for(self, file_path: Path) -> Path:
+        root = self.root if self.root is not None else file_path.parent / BACKUP_DIR_NAME
+        return root / file_path.name
+
+    def _generation_path(self, file_path: Path, generation: int) -> Optional[Path]:
+        """Existing path of ``generation`` (raw or gzipped), or None."""
+        base = self._dir_for(file_path) / ("%s.%d" % (file_path.name, generation))
+        for candidate in (base, base.with_name(base.name + ".gz")):
+            if candidate.exists():
+                return candidate
+        return None
+
+    def list_generations(self, file_path) -> list[Path]:
+        """Backups of ``file_path``, newest first."""
+        file_path = Path(file_path)
+        found = []
+        for generation in range(1, self.generations + 1):
+            path = self._generation_path(file_path, generation)
+            if path is not None:
+                found.append(path)
+        return found
+
+    def backup(self, file_path) -> Path:
+        """Snapshot ``file_path`` as the newest generation and rotate the rest.
+
+        Returns:
+            Path: the newest generation.
+        """
+        file_path = Path(file_path)
+        backup_dir = self._dir_for(file_path)
+        backup_dir.mkdir(parents=True, exist_ok=True)
+
+        newest = self._generation_path(file_path, 1)
+        if newest is not None and newest.suffix != ".gz" and os.path.samefile(newest, file_path):
+            logger.info("Backup %s is still current", newest)
+            return newest
+
+        self._rotate(file_path)
+        target = backup_dir / ("%s.1" % file_path.name)
+        method = self._clone(file_path, target)
+        logger.info("Created backup at %s (%s)", target, method)
+        return target
+
+    def _rotate(self, file_path: Path) -> None:
+        oldest = self._generation_path(file_path, self.generations)
+        if oldest is not None:
+            oldest.unlink()
+        for generation in range(self.generations - 1, 0, -1):
+            current = self._generation_path(file_path, generation)
+            if current is None:
+                continue
+            suffix = ".gz" if current.suffix == ".gz" else ""
+            os.replace(current, current.with_name("%s.%d%s" % (file_path.name, generation + 1, suffix)))
+
+    @staticmethod
+    def _clone(src: Path, dst: Path) -> str:
+        try:
+            _reflink(src, dst)
+            return "reflink"
+        except (ImportError, OSError):
+            pass
+        try:
+            os.link(src, dst)
+            return "hardlink"
+        except OSError:
+            pass
+        shutil.copy2(src, dst)
+        return "copy"
+
+    def compact(self, file_path=None) -> list[Path]:
+        """Gzip every uncompressed generation older than the newest.
+
+        Args:
+            file_path: Limit to one file's backups; default is every file
+                under an explicit ``root``.
+
+        Returns:
+            list: the compressed files written.
+        """
+        if file_path is not None:
+            dirs = [self._dir_for(Path(file_path))]
+        elif self.root is not None and self.root.exists():
+            dirs = [d for d in self.root.iterdir() if d.is_dir()]
+        else:
+            dirs = []
+
+        written = []
+        for backup_dir in dirs:
+            if not backup_dir.is_dir():
+                continue
+            for raw in sorted(backup_dir.iterdir()):
+                generation = raw.name.rsplit(".", 1)[-1]
+                if not generation.isdigit() or int(generation) < 2:
+                    continue
+                packed = raw.with_name(raw.name + ".gz")
+                stat = raw.stat()
+                with raw.open("rb") as src, gzip.open(packed, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                os.utime(packed, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+                raw.unlink()
+                written.append(packed)
+        return written
+
+    def restore(self, file_path, generation: int = 1) -> None:
+        """Atomically put ``generation`` back in place of ``file_path``."""
+        file_path = Path(file_path)
+        source = self._generation_path(file_path, generation)
+        if source is None:
+            raise FileNotFoundError("No backup generation %d for %s" % (generation, file_path))
+        tmp = file_path.with_name(file_path.name + ".restore.tmp")
+        opener = gzip.open if source.suffix == ".gz" else open
+        with opener(source, "rb") as src, open(tmp, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp, file_path)
+        logger.info("Restored %s from %s", file_path, source)
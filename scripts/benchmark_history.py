@@ -0,0 +1,284 @@
+"""Time the history-based staleness tooling on synthetic histories.
+
+``benchmark_yaml.py`` covers parsing and writing the configs; this covers
+the tools whose cost grows with the git history:
+
+    report_staleness               git blame of every provider range, no cache
+    report_staleness[cached]       the same with a blame cache already at HEAD
+    report_staleness[incremental]  blame cache one commit behind (a daily run)
+    model_index                    index rebuilt from the whole history
+    model_index[incremental]       index one commit behind
+    churn_report                   weekly series and flags from the index
+    staleness_thresholds.tune      per-provider thresholds from the index
+
+Each history size in ``--commits`` gets a repository from
+``synthetic_history.py``, built in a temporary directory together with
+the caches, so neither the real repository nor its caches are touched.
+The incremental cases restore caches built at ``HEAD~1`` before every
+run. Timing and the tracemalloc peak come from ``benchmark_yaml.measure``
+(blame and log run in git subprocesses, so the peak is the Python side
+only).
+
+Results are written as JSON (default ``scripts/.cache/bench/``):
+
+    python benchmark_history.py                          # 1 and 5 years of daily commits
+    python benchmark_history.py --commits 3650 --providers 40 --models 300
+    python benchmark_history.py --compare old.json       # also print new/old ratios
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+import churn_report
+import report_staleness
+import staleness_thresholds
+from benchmark_yaml import (
+    DEFAULT_BUDGET,
+    DEFAULT_OUTPUT_DIR,
+    DEFAULT_REPEAT,
+    environment,
+    measure,
+    save_results,
+)
+from log_config import setup_logging
+from model_index import ModelIndex
+from synthetic_history import BRANCH, HistorySpec, build_history
+
+logger = logging.getLogger(__name__)
+
+RESULTS_VERSION = 1
+DEFAULT_COMMITS = (365, 1825)
+
+OPERATIONS = (
+    "report_staleness",
+    "report_staleness[cached]",
+    "report_staleness[incremental]",
+    "model_index",
+    "model_index[incremental]",
+    "churn_report",
+    "staleness_thresholds.tune",
+)
+
+
+def _restore(snapshot: Path, target: Path) -> Callable[[], None]:
+    """Setup that puts ``snapshot`` (a file or directory) back at ``target``."""
+    def restore() -> None:
+        if target.is_dir():
+            shutil.rmtree(target)
+        if snapshot.is_dir():
+            shutil.copytree(snapshot, target)
+        else:
+            shutil.copyfile(snapshot, target)
+    return restore
+
+
+def _benchmark_history(
+    spec: HistorySpec,
+    workdir: Path,
+    repeat: int,
+    budget: float,
+    memory: bool,
+) -> list[dict[str, Any]]:
+    root = workdir / "repo"
+    started = time.perf_counter()
+    build_history(root, spec)
+    build_s = time.perf_counter() - started
+
+    files = list(spec.file_names)
+    blame_dir = Path(os.environ["BLAME_CACHE_DIR"])
+    index_path = Path(os.environ["MODEL_INDEX_PATH"])
+
+    def report() -> dict:
+        return report_staleness.build_report(root, files, report_staleness.DEFAULT_WEEKS)
+
+    def uncached_report() -> dict:
+        with environment({"BLAME_CACHE": "0"}):
+            return report()
+
+    def index_update(rebuild: bool = False) -> ModelIndex:
+        index = ModelIndex(root, files, index_path)
+        index.update(rebuild=rebuild)
+        return index
+
+    # Caches as a daily run finds them: built one commit earlier ...
+    subprocess.run(["git", "-C", str(root), "checkout", "-q", "--detach", "HEAD~1"], check=True)
+    report()
+    index_update()
+    shutil.copytree(blame_dir, workdir / "blame-previous")
+    shutil.copyfile(index_path, workdir / "index-previous.json")
+    # ... and as a second run on the same day finds them.
+    subprocess.run(["git", "-C", str(root), "checkout", "-q", BRANCH], check=True)
+    report()
+    index = index_update()
+    shutil.copytree(blame_dir, workdir / "blame-head")
+
+    operations: dict[str, tuple[Callable[[], Any], Optional[Callable[[], None]]]] = {
+        "report_staleness": (uncached_report, None),
+        "report_staleness[cached]": (report, _restore(workdir / "blame-head", blame_dir)),
+        "report_staleness[incremental]": (report, _restore(workdir / "blame-previous", blame_dir)),
+        "model_index": (lambda: index_update(rebuild=True), None),
+        "model_index[incremental]": (index_update, _restore(workdir / "index-previous.json", index_path)),
+        "churn_report": (lambda: churn_report.build_report(index), None),
+        "staleness_thresholds.tune": (lambda: staleness_thresholds.tune(index.events), None),
+    }
+
+    base = {
+        "commits": spec.commits,
+        "providers": spec.providers,
+        "models": spec.models,
+        "files": len(files),
+        "events": len(index.events),
+        "build_s": round(build_s, 3),
+    }
+    results = []
+    for operation, (run, setup) in operations.items():
+        sys.stderr.write("%d commits: %s\n" % (spec.commits, operation))
+        results.append({"operation": operation, **base,
+                        **measure(run, setup, repeat, budget, memory)})
+    return results
+
+
+def run_benchmarks(
+    commits: Iterable[int] = DEFAULT_COMMITS,
+    providers: int = HistorySpec.providers,
+    models: int = HistorySpec.models,
+    files: int = HistorySpec.files,
+    seed: int = HistorySpec.seed,
+    repeat: int = DEFAULT_REPEAT,
+    budget: float = DEFAULT_BUDGET,
+    memory: bool = True,
+) -> dict[str, Any]:
+    """Benchmark every operation on one synthetic history per ``commits`` size."""
+    results = []
+    with tempfile.TemporaryDirectory(prefix="history-bench-") as tmp:
+        for count in commits:
+            workdir = Path(tmp) / ("c%d" % count)
+            workdir.mkdir()
+            spec = HistorySpec(commits=max(2, count), providers=providers, models=models,
+                               files=files, seed=seed)
+            overrides = {
+                "BLAME_CACHE_DIR": str(workdir / "blame"),
+                "MODEL_INDEX_PATH": str(workdir / "index.json"),
+                "YAML_CACHE": "0",
+            }
+            with environment(overrides):
+                results.extend(_benchmark_history(spec, workdir, repeat, budget, memory))
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "git": subprocess.run(["git", "--version"], capture_output=True, text=True).stdout.strip(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def _key(row: Mapping[str, Any]) -> tuple:
+    return (row["operation"], row["commits"], row["providers"], row["models"], row["files"])
+
+
+def compare(old: Mapping[str, Any], new: Mapping[str, Any]) -> list[dict[str, Any]]:
+    """Pair up the measurements of two runs with the same history shapes.
+
+    Returns:
+        list: one row per measurement in ``new`` that ``old`` also has,
+        with ``time_ratio`` (new/old median) and ``memory_ratio``.
+    """
+    previous = {_key(row): row for row in old.get("results", [])}
+    rows = []
+    for row in new.get("results", []):
+        before = previous.get(_key(row))
+        if before is None:
+            continue
+        memory_ratio = None
+        if row.get("peak_kib") and before.get("peak_kib"):
+            memory_ratio = round(row["peak_kib"] / before["peak_kib"], 3)
+        rows.append({
+            "operation": row["operation"],
+            "commits": row["commits"],
+            "time_ratio": round(row["median_s"] / before["median_s"], 3),
+            "memory_ratio": memory_ratio,
+        })
+    return rows
+
+
+def format_table(results: Mapping[str, Any]) -> str:
+    lines = ["%-30s %7s %8s %10s %10s %12s" % (
+        "operation", "commits", "events", "min s", "median s", "peak KiB")]
+    for row in results["results"]:
+        lines.append("%-30s %7d %8d %10.4f %10.4f %12s" % (
+            row["operation"], row["commits"], row["events"], row["min_s"], row["median_s"],
+            "-" if row["peak_kib"] is None else "%.1f" % row["peak_kib"]))
+    return "\n".join(lines) + "\n"
+
+
+def format_comparison(rows: Iterable[Mapping[str, Any]]) -> str:
+    lines = ["%-30s %7s %8s %8s" % ("operation", "commits", "time", "memory")]
+    for row in rows:
+        lines.append("%-30s %7d %7.2fx %8s" % (
+            row["operation"], row["commits"], row["time_ratio"],
+            "-" if row["memory_ratio"] is None else "%.2fx" % row["memory_ratio"]))
+    return "\n".join(lines) + "\n"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the staleness tooling on synthetic histories")
+    parser.add_argument("--commits", type=int, nargs="+", default=list(DEFAULT_COMMITS),
+                        help="History lengths in daily commits (default: 365 1825)")
+    parser.add_argument("--providers", type=int, default=HistorySpec.providers,
+                        help="Providers per config (default: %d)" % HistorySpec.providers)
+    parser.add_argument("--models", type=int, default=HistorySpec.models,
+                        help="Models per provider (default: %d)" % HistorySpec.models)
+    parser.add_argument("--files", type=int, default=HistorySpec.files,
+                        help="Configs per commit (default: %d)" % HistorySpec.files)
+    parser.add_argument("--seed", type=int, default=HistorySpec.seed, help="Random seed")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="Timed runs per measurement (default: %d)" % DEFAULT_REPEAT)
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET,
+                        help="Stop repeating once a measurement took this many seconds")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc run")
+    parser.add_argument("--output", type=Path, help="Results JSON (default: .cache/bench/)")
+    parser.add_argument("--compare", type=Path, metavar="OLD", help="Earlier results JSON")
+    args = parser.parse_args(argv)
+
+    setup_logging(logging.WARNING)
+    results = run_benchmarks(
+        commits=args.commits,
+        providers=max(1, args.providers),
+        models=max(1, args.models),
+        files=args.files,
+        seed=args.seed,
+        repeat=max(1, args.repeat),
+        budget=args.budget,
+        memory=not args.no_memory,
+    )
+    output = args.output or DEFAULT_OUTPUT_DIR / (
+        "history-%s.json" % datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"))
+    save_results(results, output)
+    sys.stdout.write(format_table(results))
+    sys.stdout.write("Results written to %s\n" % output)
+
+    if args.compare:
+        with args.compare.open("r", encoding="utf-8") as f:
+            old = json.load(f)
+        sys.stdout.write(format_comparison(compare(old, results)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
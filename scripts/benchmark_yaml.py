@@ -0,0 +1,367 @@
+"""Time and memory baseline for the YAML layer.
+
+Measures the functions every update run goes through:
+
+    load_yaml_file            full round-trip load
+    save_yaml_file            dump + validate + atomic replace
+    validate_yaml_file        parse + structure check
+    convert_yaml_style        flow -> block conversion of the model lists
+    find_provider_ranges      line ranges used by report_staleness / catalog
+    find_provider_ranges[parser]  the same through the ruamel fallback
+
+on the five real configs (scale 1) and on synthetic copies of one config
+whose ``models.default`` lists are N times longer (scale N). Every
+operation runs on a scratch copy, so the configs are never touched.
+
+Each measurement is timed ``--repeat`` times (fewer when the operation is
+slow, see ``--budget``) and then run once more under ``tracemalloc`` for
+the peak Python allocation. The parsed-YAML cache is disabled unless
+``--cache`` is given, so the numbers are cold parses.
+
+Results are written as JSON (default ``scripts/.cache/bench/``) and can be
+compared with an earlier run:
+
+    python benchmark_yaml.py                       # scales 1, 10, 100
+    python benchmark_yaml.py --scales 1 10 --repeat 5
+    python benchmark_yaml.py --compare old.json    # also print new/old ratios
+
+Scale 100 turns a 3,300-line config into ~300,000 lines; expect that part
+alone to take several minutes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Iterable, Iterator, Mapping, Optional
+
+import ruamel.yaml
+
+from catalog import ProviderCatalog, config_paths, render_config
+from convert_yaml_style import convert_file
+from log_config import setup_logging
+from report_staleness import find_provider_ranges, parse_provider_ranges
+from update_models import load_yaml_file, save_yaml_file, validate_yaml_file
+
+logger = logging.getLogger(__name__)
+
+RESULTS_VERSION = 1
+DEFAULT_SCALES = (1, 10, 100)
+DEFAULT_REPEAT = 3
+DEFAULT_BUDGET = 2.0  # seconds of timed runs per measurement before stopping early
+DEFAULT_OUTPUT_DIR = Path(__file__).resolve().parent / ".cache" / "bench"
+SYNTHETIC_SOURCE = "librechat-env-f.yaml"
+
+OPERATIONS = (
+    "load_yaml_file",
+    "save_yaml_file",
+    "validate_yaml_file",
+    "convert_yaml_style",
+    "find_provider_ranges",
+    "find_provider_ranges[parser]",
+)
+
+
+def scale_text(path: Path, factor: int) -> str:
+    """``path``'s text with every model list ``factor`` times as long.
+
+    Each id ``m`` is followed by ``m-x1`` .. ``m-x<factor-1>``; everything
+    outside the lists is unchanged.
+    """
+    text = path.read_text(encoding="utf-8")
+    if factor == 1:
+        return text
+    source = ProviderCatalog.from_files([path])
+    scaled = ProviderCatalog({
+        name: [
+            variant
+            for model in models
+            for variant in [model] + ["%s-x%d" % (model, k) for k in range(1, factor)]
+        ]
+        for name, models in source.items()
+    })
+    return render_config(text, scaled, find_provider_ranges(path))[0]
+
+
+def flow_text(path: Path) -> str:
+    """``path``'s text with every block ``models.default`` written in flow style.
+
+    This is the input ``convert_yaml_style`` exists for; the real configs
+    are already block style and would only be scanned.
+    """
+    lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+    for start, end in sorted(find_provider_ranges(path).values(), reverse=True):
+        key = lines[start - 2]
+        if key.strip() != "default:":
+            continue
+        items = [json.dumps(line.strip()[2:].strip("'\"")) for line in lines[start - 1:end]]
+        lines[start - 2:end] = ["%s [%s]\n" % (key.rstrip("\n"), ", ".join(items))]
+    return "".join(lines)
+
+
+@contextmanager
+def environment(overrides: Mapping[str, str]) -> Iterator[None]:
+    """Set the ``overrides`` environment variables for the duration."""
+    saved = {key: os.environ.get(key) for key in overrides}
+    os.environ.update(overrides)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def _environment(workdir: Path, cache: bool) -> ContextManager[None]:
+    """Send backups and cache entries into ``workdir`` for the duration."""
+    overrides = {"BACKUP_DIR": str(workdir / "backups")}
+    if cache:
+        overrides["YAML_CACHE_DIR"] = str(workdir / "yaml-cache")
+    else:
+        overrides["YAML_CACHE"] = "0"
+    return environment(overrides)
+
+
+def measure(
+    run: Callable[[], Any],
+    setup: Optional[Callable[[], None]] = None,
+    repeat: int = DEFAULT_REPEAT,
+    budget: float = DEFAULT_BUDGET,
+    memory: bool = True,
+) -> dict[str, Any]:
+    """Time ``run`` up to ``repeat`` times, then measure its peak allocation.
+
+    ``setup`` runs before every call and is not timed, nor is collecting
+    the garbage earlier runs left behind. Timing stops early once
+    ``budget`` seconds have been spent, but always covers one run.
+    """
+    times = []
+    while len(times) < repeat:
+        if setup is not None:
+            setup()
+        gc.collect()
+        started = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - started)
+        if sum(times) >= budget:
+            break
+
+    peak = None
+    if memory:
+        if setup is not None:
+            setup()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "runs": len(times),
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "peak_kib": None if peak is None else round(peak / 1024, 1),
+    }
+
+
+def _benchmark_file(
+    source: Path,
+    name: str,
+    scale: int,
+    workdir: Path,
+    repeat: int,
+    budget: float,
+    memory: bool,
+) -> list[dict[str, Any]]:
+    target = workdir / name
+    block = scale_text(source, scale)
+    target.write_text(block, encoding="utf-8")
+    flow_path = workdir / ("flow-" + name)
+    flow = flow_text(target)
+
+    def reset_flow():
+        flow_path.write_text(flow, encoding="utf-8")
+
+    data = load_yaml_file(target)
+    if data is None:
+        raise ValueError("Cannot load %s" % target)
+    operations: dict[str, tuple[Callable[[], Any], Optional[Callable[[], None]]]] = {
+        "load_yaml_file": (lambda: load_yaml_file(target), None),
+        "save_yaml_file": (lambda: save_yaml_file(workdir / ("saved-" + name), data), None),
+        "validate_yaml_file": (lambda: validate_yaml_file(target), None),
+        "convert_yaml_style": (lambda: convert_file(str(flow_path)), reset_flow),
+        "find_provider_ranges": (lambda: find_provider_ranges(target), None),
+        "find_provider_ranges[parser]": (lambda: parse_provider_ranges(target), None),
+    }
+
+    base = {
+        "file": source.name,
+        "scale": scale,
+        "lines": block.count("\n"),
+        "bytes": len(block.encode("utf-8")),
+    }
+    results = []
+    for operation, (run, setup) in operations.items():
+        sys.stderr.write("%s x%d: %s\n" % (source.name, scale, operation))
+        results.append({"operation": operation, **base,
+                        **measure(run, setup, repeat, budget, memory)})
+    return results
+
+
+def run_benchmarks(
+    scales: Iterable[int] = DEFAULT_SCALES,
+    paths: Optional[Iterable[Path]] = None,
+    synthetic_source: Optional[Path] = None,
+    repeat: int = DEFAULT_REPEAT,
+    budget: float = DEFAULT_BUDGET,
+    memory: bool = True,
+    cache: bool = False,
+) -> dict[str, Any]:
+    """Benchmark every operation; see the module docstring.
+
+    Args:
+        paths: Configs measured at scale 1 (default: the five real ones).
+        synthetic_source: Config scaled up for scales above 1 (default:
+            ``librechat-env-f.yaml`` or the first of ``paths``).
+    """
+    paths = [Path(p) for p in (paths if paths is not None else config_paths())]
+    paths = [p for p in paths if p.exists()]
+    if synthetic_source is None:
+        default = [p for p in paths if p.name == SYNTHETIC_SOURCE]
+        synthetic_source = (default or paths)[0]
+    synthetic_source = Path(synthetic_source)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="yaml-bench-") as tmp:
+        workdir = Path(tmp)
+        with _environment(workdir, cache):
+            for scale in scales:
+                sources = paths if scale == 1 else [synthetic_source]
+                for source in sources:
+                    scale_dir = workdir / ("x%d" % scale)
+                    scale_dir.mkdir(exist_ok=True)
+                    results.extend(_benchmark_file(
+                        source, source.name, scale, scale_dir, repeat, budget, memory))
+                shutil.rmtree(workdir / ("x%d" % scale), ignore_errors=True)
+
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "ruamel_yaml": ruamel.yaml.__version__,
+        "platform": platform.platform(),
+        "cache": cache,
+        "results": results,
+    }
+
+
+def _key(row: Mapping[str, Any]) -> tuple:
+    return (row["operation"], row["file"], row["scale"])
+
+
+def compare(old: Mapping[str, Any], new: Mapping[str, Any]) -> list[dict[str, Any]]:
+    """Pair up the measurements of two runs.
+
+    Returns:
+        list: one row per measurement in ``new`` that ``old`` also has,
+        with ``time_ratio`` (new/old median) and ``memory_ratio``.
+    """
+    previous = {_key(row): row for row in old.get("results", [])}
+    rows = []
+    for row in new.get("results", []):
+        before = previous.get(_key(row))
+        if before is None:
+            continue
+        memory_ratio = None
+        if row.get("peak_kib") and before.get("peak_kib"):
+            memory_ratio = round(row["peak_kib"] / before["peak_kib"], 3)
+        rows.append({
+            "operation": row["operation"],
+            "file": row["file"],
+            "scale": row["scale"],
+            "time_ratio": round(row["median_s"] / before["median_s"], 3),
+            "memory_ratio": memory_ratio,
+        })
+    return rows
+
+
+def format_table(results: Mapping[str, Any]) -> str:
+    lines = ["%-24s %-22s %5s %10s %10s %12s" % (
+        "operation", "file", "scale", "min s", "median s", "peak KiB")]
+    for row in results["results"]:
+        lines.append("%-24s %-22s %5d %10.4f %10.4f %12s" % (
+            row["operation"], row["file"], row["scale"], row["min_s"], row["median_s"],
+            "-" if row["peak_kib"] is None else "%.1f" % row["peak_kib"]))
+    return "\n".join(lines) + "\n"
+
+
+def format_comparison(rows: Iterable[Mapping[str, Any]]) -> str:
+    lines = ["%-24s %-22s %5s %8s %8s" % ("operation", "file", "scale", "time", "memory")]
+    for row in rows:
+        lines.append("%-24s %-22s %5d %7.2fx %8s" % (
+            row["operation"], row["file"], row["scale"], row["time_ratio"],
+            "-" if row["memory_ratio"] is None else "%.2fx" % row["memory_ratio"]))
+    return "\n".join(lines) + "\n"
+
+
+def save_results(results: Mapping[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the YAML load/save/validate path")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES),
+                        help="Model list multipliers (default: 1 10 100)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="Timed runs per measurement (default: %d)" % DEFAULT_REPEAT)
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET,
+                        help="Stop repeating once a measurement took this many seconds")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc run")
+    parser.add_argument("--cache", action="store_true", help="Leave the parsed-YAML cache on")
+    parser.add_argument("--output", type=Path, help="Results JSON (default: .cache/bench/)")
+    parser.add_argument("--compare", type=Path, metavar="OLD", help="Earlier results JSON")
+    args = parser.parse_args(argv)
+
+    setup_logging(logging.WARNING)
+    results = run_benchmarks(
+        scales=args.scales,
+        repeat=max(1, args.repeat),
+        budget=args.budget,
+        memory=not args.no_memory,
+        cache=args.cache,
+    )
+    output = args.output or DEFAULT_OUTPUT_DIR / (
+        "yaml-io-%s.json" % datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"))
+    save_results(results, output)
+    sys.stdout.write(format_table(results))
+    sys.stdout.write("Results written to %s\n" % output)
+
+    if args.compare:
+        with args.compare.open("r", encoding="utf-8") as f:
+            old = json.load(f)
+        sys.stdout.write(format_comparison(compare(old, results)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""Persistent cache of per-line blame times for report_staleness.
+
+``git blame`` walks the file's whole history, and the staleness report
+asks the same question again on every run (locally with a different
+``--weeks``, once per config, in CI every week). The answer only changes
+when the file or the history does, so each file's
+``{line_number: committer-time}`` map is stored together with the blob SHA
+of the file and the HEAD commit it was computed at:
+
+- same blob and HEAD: every line is answered from the cache, no git blame.
+- different blob or HEAD: ``git diff`` between the cached blob and the
+  current one tells which lines changed. Unchanged lines keep their time
+  (shifted to their new line numbers), and only lines inside changed hunks
+  are blamed again. A line that was edited and later restored between the
+  two states keeps its older time.
+- anything else (no entry, the cached blob is gone from the object
+  database, the current file is not a stored blob): the requested lines
+  are blamed and the entry replaced.
+
+Entries are small JSON files under ``BLAME_CACHE_DIR`` (default
+``scripts/.cache/blame``), one per repository file; set ``BLAME_CACHE=0``
+to bypass the cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from git_utils import git, parse_hunks
+from transaction import write_atomic
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "blame"
+CACHE_FORMAT_VERSION = 1
+
+# blame(repo_root, rel_path, ranges) -> {line_number: committer-time}
+Blame = Callable[[Path, str, "list[tuple[int, int]]"], "dict[int, int]"]
+
+
+def cache_enabled() -> bool:
+    return os.environ.get("BLAME_CACHE", "1").lower() not in ("0", "false", "no")
+
+
+def line_ranges(lines: Iterable[int]) -> list[tuple[int, int]]:
+    """Collapse line numbers into sorted inclusive ``(start, end)`` runs."""
+    ranges: list[tuple[int, int]] = []
+    for number in sorted(set(lines)):
+        if ranges and ranges[-1][1] == number - 1:
+            ranges[-1] = (ranges[-1][0], number)
+        else:
+            ranges.append((number, number))
+    return ranges
+
+
+def remap_lines(times: dict[int, int], hunks: list[tuple[int, int, int, int]]) -> dict[int, int]:
+    """Carry the times of lines outside every hunk to their new numbers.
+
+    Lines inside a hunk are dropped; their new counterparts need blaming.
+    """
+    remapped = {}
+    hunks = sorted(hunks)
+    for number, time in times.items():
+        shift = 0
+        for old_start, old_count, new_start, new_count in hunks:
+            # With a zero count, the start names the line *before* the hunk.
+            old_end = old_start + old_count - 1 if old_count else old_start
+            if old_count and old_start <= number <= old_end:
+                break
+            if number <= old_end:
+                continue
+            shift = (new_start + new_count - 1 if new_count else new_start) - old_end
+        else:
+            remapped[number + shift] = time
+    return remapped
+
+
+class BlameCache:
+    """Answer per-line blame times for one repository from the cache."""
+
+    def __init__(self, repo_root: Path, blame: Blame, cache_dir: Optional[Path] = None):
+        self.repo_root = Path(repo_root)
+        self.blame = blame
+        if cache_dir is None:
+            cache_dir = Path(os.environ.get("BLAME_CACHE_DIR", DEFAULT_CACHE_DIR))
+        self.cache_dir = Path(cache_dir)
+
+    def _has_object(self, sha: str) -> bool:
+        return git(self.repo_root, "cat-file", "-e", sha) is not None
+
+    def _entry_path(self, rel_path: str) -> Path:
+        key = "%s\0%s" % (self.repo_root.resolve(), rel_path)
+        return self.cache_dir / (hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + ".json")
+
+    def _load(self, rel_path: str) -> Optional[dict]:
+        try:
+            with self._entry_path(rel_path).open("r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("version") != CACHE_FORMAT_VERSION:
+            return None
+        return entry
+
+    def _store(self, rel_path: str, head: str, blob: str, times: dict[int, int]) -> None:
+        entry = {
+            "version": CACHE_FORMAT_VERSION,
+            "path": rel_path,
+            "head": head,
+            "blob": blob,
+            "lines": {str(number): time for number, time in sorted(times.items())},
+        }
+        path = self._entry_path(rel_path)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # A plain rename: concurrent report workers each own their entry.
+            write_atomic(path, json.dumps(entry), fsync=False)
+        except OSError as e:
+            logger.warning("Cannot write blame cache entry %s: %s", path, e)
+
+    def _cached_times(self, rel_path: str, entry: Optional[dict], head: str, blob: str) -> dict[int, int]:
+        if entry is None:
+            return {}
+        times = {int(number): time for number, time in entry["lines"].items()}
+        if entry["blob"] == blob and entry["head"] == head:
+            return times
+        if not (self._has_object(entry["blob"]) and self._has_object(blob)):
+            return {}
+        diff = git(self.repo_root, "diff", "--no-color", "--no-ext-diff", "-U0", entry["blob"], blob)
+        if diff is None:
+            return {}
+        return remap_lines(times, parse_hunks(diff))
+
+    def line_times(self, rel_path: str, ranges: list[tuple[int, int]]) -> dict[int, int]:
+        """``{line_number: committer-time}`` for every line in ``ranges``.
+
+        Lines git could not blame are missing from the result.
+        """
+        head = (git(self.repo_root, "rev-parse", "HEAD") or "").strip()
+        blob = (git(self.repo_root, "hash-object", "--", rel_path) or "").strip()
+        if not head or not blob:
+            return self.blame(self.repo_root, rel_path, ranges)
+
+        times = self._cached_times(rel_path, self._load(rel_path), head, blob)
+        wanted = {n for start, end in ranges for n in range(start, end + 1)}
+        missing = line_ranges(wanted - set(times))
+        if missing:
+            logger.info("Blaming %d range(s) of %s", len(missing), rel_path)
+            times.update(self.blame(self.repo_root, rel_path, missing))
+        self._store(rel_path, head, blob, times)
+        return {n: times[n] for n in wanted if n in times}
@@ -0,0 +1,374 @@
+"""Canonical provider catalog and the renderer that publishes it.
+
+The five ``librechat-*.yaml`` files repeat the same ``endpoints.custom``
+model lists. Everything *else* in them legitimately differs per file:
+``fileStrategy``, ``interface``, ``mcpServers``, per-endpoint ``apiKey``
+(env var vs ``user_provided``), ``dropParams``, even which providers are
+present at all. So the catalog is split along that line:
+
+- ``ProviderCatalog`` is the single structure a model update touches:
+  provider name -> shared, read-only list of model ids.
+- Each published file is its own overlay: all of its text outside the
+  ``models.default`` blocks belongs to that file and is kept byte for byte.
+
+``render_all`` splices the catalog into every overlay in one pass. The
+block item lines are formatted once per provider (with the same ruamel
+settings ``update_models.save_yaml_file`` uses, so the output is identical
+to a full round-trip dump) and rendering a file is then plain line
+splicing, which runs in parallel across files.
+
+Usage:
+    # snapshot the current model lists into a catalog file
+    python catalog.py --export catalog.json
+
+    # re-render all configs from a (hand-edited or generated) catalog
+    python catalog.py --render catalog.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Mapping, Optional
+
+from ruamel.yaml import YAML
+
+from log_config import setup_logging
+from model_store import FrozenModelList, ModelListStore
+from report_staleness import find_provider_ranges
+from transaction import ConfigTransaction
+from yaml_cache import load_yaml_cached
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+CONFIG_FILES = (
+    "librechat-env-f.yaml",
+    "librechat-env-l.yaml",
+    "librechat-up-f.yaml",
+    "librechat-up-l.yaml",
+    "librechat-test.yaml",
+)
+
+CATALOG_FORMAT_VERSION = 1
+
+
+def config_paths(root: Optional[Path] = None) -> list[Path]:
+    """Return the absolute paths of the published configs under ``root``."""
+    root = Path(root) if root is not None else REPO_ROOT
+    return [root / name for name in CONFIG_FILES]
+
+
+def _iter_endpoints(document: Any) -> Iterator[Mapping]:
+    """Yield each ``endpoints.custom`` entry of a loaded config."""
+    if not isinstance(document, Mapping):
+        return
+    endpoints = document.get("endpoints")
+    if not isinstance(endpoints, Mapping):
+        return
+    custom = endpoints.get("custom")
+    if not isinstance(custom, list):
+        return
+    for entry in custom:
+        if isinstance(entry, Mapping):
+            yield entry
+
+
+def document_providers(document: Any) -> list[str]:
+    """Names of the providers with a non-empty ``models.default`` in a loaded config."""
+    names = []
+    for endpoint in _iter_endpoints(document):
+        name = endpoint.get("name")
+        models = endpoint.get("models")
+        if isinstance(name, str) and isinstance(models, Mapping) and models.get("default"):
+            names.append(name)
+    return names
+
+
+class ProviderCatalog:
+    """Provider name -> model ids, shared by every published config."""
+
+    def __init__(self, providers: Optional[Mapping[str, Iterable[str]]] = None):
+        self._providers: dict[str, FrozenModelList] = {}
+        self._store = ModelListStore()
+        self._formatted: dict[str, list[str]] = {}
+        for name, models in (providers or {}).items():
+            self.set_models(name, models)
+
+    @classmethod
+    def from_documents(cls, documents: Iterable[Any]) -> ProviderCatalog:
+        """Build a catalog from loaded configs.
+
+        The first document that lists a provider wins; the update pipeline
+        keeps the files in sync, so later documents only contribute
+        providers the earlier ones lack.
+        """
+        catalog = cls()
+        for document in documents:
+            catalog.add_document(document)
+        return catalog
+
+    @classmethod
+    def from_files(cls, paths: Iterable[Path]) -> ProviderCatalog:
+        """Build a catalog by parsing each existing config in ``paths``."""
+        yaml = YAML()
+        documents = []
+        for path in paths:
+            path = Path(path)
+            if not path.exists():
+                logger.warning("%s not found, skipping", path)
+                continue
+            documents.append(load_yaml_cached(path, yaml))
+        return cls.from_documents(documents)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> ProviderCatalog:
+        """Inverse of ``to_dict``."""
+        version = data.get("version")
+        if version != CATALOG_FORMAT_VERSION:
+            raise ValueError("Unsupported catalog version: %r" % (version,))
+        return cls(data.get("providers", {}))
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable form of the catalog."""
+        return {
+            "version": CATALOG_FORMAT_VERSION,
+            "providers": {name: list(models) for name, models in sorted(self._providers.items())},
+        }
+
+    def add_document(self, document: Any) -> None:
+        """Add the providers of one loaded config that are not listed yet."""
+        for endpoint in _iter_endpoints(document):
+            name = endpoint.get("name")
+            models = endpoint.get("models")
+            if not isinstance(name, str) or name in self:
+                continue
+            if not isinstance(models, Mapping):
+                continue
+            default = models.get("default")
+            if default:
+                self.set_models(name, default)
+
+    def set_models(self, provider: str, models: Iterable[str]) -> None:
+        """Replace the model list of ``provider``."""
+        self._providers[provider] = self._store.share(provider, models)
+        self._formatted.pop(provider, None)
+
+    def get(self, provider: str) -> Optional[FrozenModelList]:
+        return self._providers.get(provider)
+
+    def items(self):
+        return self._providers.items()
+
+    def __contains__(self, provider: object) -> bool:
+        return provider in self._providers
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._providers)
+
+    def __len__(self) -> int:
+        return len(self._providers)
+
+    def formatted_items(self, provider: str) -> list[str]:
+        """Return ``provider``'s block item lines (``- id``) without indentation.
+
+        Formatting is memoized, so rendering N files formats each list once.
+        """
+        lines = self._formatted.get(provider)
+        if lines is None:
+            lines = format_model_items(self._providers[provider])
+            self._formatted[provider] = lines
+        return lines
+
+
+def format_model_items(models: Iterable[str]) -> list[str]:
+    """Format model ids as block sequence items, exactly as ruamel dumps them.
+
+    Dumping the bare list with the writer's settings reuses ruamel's own
+    scalar analysis, so ids that need quoting (``'7'``, ``'---FREE---'``)
+    come out the same way a full-document dump would write them.
+    """
+    models = list(models)
+    if not models:
+        return []
+    yaml = YAML()
+    yaml.width = 4096
+    yaml.default_flow_style = False
+    yaml.indent(mapping=2, sequence=2, offset=0)
+    buf = io.StringIO()
+    yaml.dump(models, buf)
+    lines = buf.getvalue().splitlines()
+    if len(lines) != len(models):
+        raise ValueError("Model ids must be single-line scalars")
+    return lines
+
+
+@dataclass
+class RenderResult:
+    """Outcome of rendering one config from the catalog."""
+
+    path: Path
+    original: str
+    text: str
+    changed_providers: list[str] = field(default_factory=list)
+    skipped_providers: list[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return self.text != self.original
+
+
+def render_config(
+    text: str,
+    catalog: ProviderCatalog,
+    ranges: Mapping[str, tuple[int, int]],
+) -> tuple[str, list[str], list[str]]:
+    """Splice the catalog's model lists into one config's text.
+
+    Args:
+        text: Current file content; everything outside the blocks is kept.
+        catalog: Source of the model lists.
+        ranges: ``{provider: (start_line, end_line)}`` of each block's
+            items, 1-based inclusive, as ``find_provider_ranges`` returns.
+
+    Returns:
+        tuple: (new_text, changed_providers, skipped_providers)
+    """
+    lines = text.splitlines(keepends=True)
+    changed: list[str] = []
+    skipped: list[str] = []
+
+    # Splice bottom-up so earlier line numbers stay valid.
+    for name, (start, end) in sorted(ranges.items(), key=lambda kv: kv[1][0], reverse=True):
+        if name not in catalog:
+            continue
+        first = lines[start - 1]
+        stripped = first.lstrip(" ")
+        if not stripped.startswith("- "):
+            # Flow-style list (`default: [a, b]`); there is no line per item
+            # to replace. convert_yaml_style.py normalizes these.
+            logger.warning("models.default for %s is not block style, skipping", name)
+            skipped.append(name)
+            continue
+        indent = " " * (len(first) - len(stripped))
+        new_block = ["%s%s\n" % (indent, item) for item in catalog.formatted_items(name)]
+        if not new_block:
+            skipped.append(name)
+            continue
+        if lines[start - 1:end] != new_block:
+            lines[start - 1:end] = new_block
+            changed.append(name)
+
+    changed.reverse()
+    return "".join(lines), changed, skipped
+
+
+def render_file(path: Path, catalog: ProviderCatalog) -> RenderResult:
+    """Render a single config from the catalog without writing it."""
+    path = Path(path)
+    original = path.read_text(encoding="utf-8")
+    ranges = find_provider_ranges(path)
+    text, changed, skipped = render_config(original, catalog, ranges)
+    return RenderResult(path, original, text, changed, skipped)
+
+
+def render_all(
+    catalog: ProviderCatalog,
+    paths: Iterable[Path],
+    max_workers: Optional[int] = None,
+) -> dict[Path, RenderResult]:
+    """Render every existing config in ``paths`` from ``catalog``.
+
+    Item formatting happens once per provider up front; the per-file work
+    is independent and runs on a thread pool.
+    """
+    paths = [Path(p) for p in paths if Path(p).exists()]
+    for name in catalog:
+        catalog.formatted_items(name)
+
+    results: dict[Path, RenderResult] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for result in pool.map(lambda p: render_file(p, catalog), paths):
+            results[result.path] = result
+    return results
+
+
+def write_rendered(
+    results: Mapping[Path, RenderResult],
+    transaction: Optional[ConfigTransaction] = None,
+) -> list[Path]:
+    """Write every rendered config whose text changed, all or none.
+
+    With ``transaction`` the files are only staged in it, and the caller
+    commits them together with its other writes.
+    """
+    from update_models import save_yaml_text, validate_yaml_file
+
+    written = []
+    own = transaction is None
+    if own:
+        transaction = ConfigTransaction(validator=validate_yaml_file)
+    for path, result in results.items():
+        if not result.changed:
+            continue
+        save_yaml_text(path, result.text, transaction=transaction)
+        written.append(path)
+    if own:
+        transaction.commit()
+    return written
+
+
+def load_catalog(path: Path) -> ProviderCatalog:
+    with Path(path).open("r", encoding="utf-8") as f:
+        return ProviderCatalog.from_dict(json.load(f))
+
+
+def save_catalog(catalog: ProviderCatalog, path: Path) -> None:
+    with Path(path).open("w", encoding="utf-8") as f:
+        json.dump(catalog.to_dict(), f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export or render the provider catalog")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--export", metavar="PATH",
+                       help="Write the current model lists to a catalog JSON file")
+    group.add_argument("--render", metavar="PATH",
+                       help="Render all configs from a catalog JSON file")
+    parser.add_argument("--check", action="store_true",
+                        help="With --render, only report files that would change")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    paths = config_paths()
+
+    if args.export:
+        catalog = ProviderCatalog.from_files(paths)
+        save_catalog(catalog, Path(args.export))
+        logger.info("Exported %d providers to %s", len(catalog), args.export)
+        return 0
+
+    catalog = load_catalog(Path(args.render))
+    results = render_all(catalog, paths)
+    for path, result in results.items():
+        if result.changed:
+            logger.info("%s: %s", path.name, ", ".join(result.changed_providers))
+        for name in result.skipped_providers:
+            logger.warning("%s: %s not rendered", path.name, name)
+    if args.check:
+        return 1 if any(r.changed for r in results.values()) else 0
+    written = write_rendered(results)
+    logger.info("Rendered %d of %d configs", len(written), len(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""Machine-readable catalog artifact written next to the configs.
+
+Downstream tooling only wants provider -> model ids and should not have to
+round-trip parse 3,300 lines of YAML to get it. Each update run writes
+``models.catalog.json`` (sorted keys, one object per provider) and, when
+the optional ``msgpack`` package is installed, ``models.catalog.msgpack``
+with the same content:
+
+    {
+      "version": 1,
+      "sha256": "<hash of all provider hashes>",
+      "providers": {
+        "groq": {"count": 12, "sha256": "...", "fetched_at": "...", "models": [...]}
+      }
+    }
+
+``sha256`` only covers the model lists, never the timestamps. The files
+are rewritten (atomically) only when that hash changes, so a consumer can
+compare one string and skip reloading, and unchanged runs leave nothing to
+commit. ``fetched_at`` is the time of the fetch that produced the list as
+written; providers that were not fetched keep their previous value.
+
+Usage (rebuild from the configs without fetching):
+    python catalog_export.py
+
+Environment:
+    CATALOG_EXPORT_PATH  JSON artifact path (default ``models.catalog.json``
+                         in the repo root)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Optional
+
+from catalog import REPO_ROOT, ProviderCatalog, config_paths
+from log_config import setup_logging
+from transaction import write_atomic
+
+try:
+    import msgpack
+except ImportError:  # optional: JSON is always written
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_VERSION = 1
+DEFAULT_ARTIFACT_NAME = "models.catalog.json"
+
+
+def artifact_path() -> Path:
+    return Path(os.environ.get("CATALOG_EXPORT_PATH", REPO_ROOT / DEFAULT_ARTIFACT_NAME))
+
+
+def models_hash(models: Iterable[str]) -> str:
+    return hashlib.sha256("\n".join(models).encode("utf-8")).hexdigest()
+
+
+def _catalog_hash(provider_hashes: Mapping[str, str]) -> str:
+    digest = hashlib.sha256()
+    for name in sorted(provider_hashes):
+        digest.update(("%s\0%s\n" % (name, provider_hashes[name])).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _lookup(timestamps: Mapping[str, str], name: str) -> Optional[str]:
+    if name in timestamps:
+        return timestamps[name]
+    # Fetchers and configs do not always agree on case (groq vs Groq).
+    folded = name.casefold()
+    for key, value in timestamps.items():
+        if key.casefold() == folded:
+            return value
+    return None
+
+
+def build_artifact(
+    catalog: ProviderCatalog,
+    fetched_at: Optional[Mapping[str, str]] = None,
+    previous: Optional[Mapping[str, Any]] = None,
+) -> dict[str, Any]:
+    """The artifact for ``catalog``; see the module docstring."""
+    fetched_at = fetched_at or {}
+    previous_providers = (previous or {}).get("providers") or {}
+    providers = {}
+    for name in sorted(catalog):
+        models = catalog.get(name)
+        timestamp = _lookup(fetched_at, name)
+        if timestamp is None:
+            timestamp = (previous_providers.get(name) or {}).get("fetched_at")
+        providers[name] = {
+            "count": len(models),
+            "sha256": models_hash(models),
+            "fetched_at": timestamp,
+            "models": list(models),
+        }
+    return {
+        "version": ARTIFACT_VERSION,
+        "sha256": _catalog_hash({name: p["sha256"] for name, p in providers.items()}),
+        "providers": providers,
+    }
+
+
+def read_artifact(path: Optional[Path] = None) -> Optional[dict[str, Any]]:
+    """The current JSON artifact, or None if missing or unreadable."""
+    path = Path(path) if path is not None else artifact_path()
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != ARTIFACT_VERSION:
+        return None
+    return data
+
+
+def load_artifact_catalog(path: Optional[Path] = None) -> Optional[ProviderCatalog]:
+    data = read_artifact(path)
+    if data is None:
+        return None
+    return ProviderCatalog({name: p["models"] for name, p in data["providers"].items()})
+
+
+def write_artifact(
+    catalog: ProviderCatalog,
+    path: Optional[Path] = None,
+    fetched_at: Optional[Mapping[str, str]] = None,
+) -> bool:
+    """Write the artifact(s) if the model lists changed.
+
+    Returns:
+        bool: True if the files were (re)written.
+    """
+    path = Path(path) if path is not None else artifact_path()
+    previous = read_artifact(path)
+    data = build_artifact(catalog, fetched_at, previous)
+    packed_path = path.with_suffix(".msgpack")
+    packed_missing = msgpack is not None and not packed_path.exists()
+
+    if previous is not None and previous.get("sha256") == data["sha256"] and not packed_missing:
+        logger.info("Catalog unchanged (%s), not rewriting %s", data["sha256"][:12], path.name)
+        return False
+
+    encoded = json.dumps(data, indent=2, sort_keys=True, ensure_ascii=False) + "\n"
+    write_atomic(path, encoded)
+    if msgpack is not None:
+        write_atomic(packed_path, msgpack.packb(data, use_bin_type=True))
+    logger.info("Wrote catalog of %d providers to %s", len(data["providers"]), path)
+    return True
+
+
+def main() -> int:
+    setup_logging()
+    catalog = ProviderCatalog.from_files(config_paths())
+    write_artifact(catalog)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""Weekly model churn per provider, and providers whose churn collapsed.
+
+``report_staleness.py`` flags a provider once its list has not changed in
+N weeks. A provider that used to gain and drop a few models every week
+and now moves once a month never crosses that cutoff, yet it is the same
+failure (a cached page, a key stuck on a free tier) showing up earlier.
+This report compares each provider's recent churn rate with its own
+baseline instead.
+
+The input is the event list of ``model_index.py``. It is updated
+incrementally from git, so a run reads only the commits since the last
+one. Events are bucketed into UTC weeks starting on Monday. Every provider
+gets three arrays of the same length: ``added``, ``removed`` and
+``net``, with one entry per week from ``start``. The commit that first
+lists a provider seeds it and does not count as churn.
+
+A provider is flagged ``collapsed`` when it still lists models, its
+baseline rate (``--baseline`` weeks before the recent window) is at
+least ``--min-rate`` changes per week, and its recent rate (the last
+``--recent`` complete weeks) is at most ``--ratio`` of the baseline. The
+current, partial week is left out of both windows, and a provider is not
+judged until it has ``--recent`` weeks of baseline.
+
+Everything is O(events + providers x weeks), i.e. linear in the history.
+
+Usage:
+    python churn_report.py                      # flagged providers, recent totals
+    python churn_report.py --json --weeks 12    # arrays for the last 12 weeks
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional
+
+from log_config import setup_logging
+from model_index import DEFAULT_FILES, ModelIndex
+
+logger = logging.getLogger(__name__)
+
+WEEK = 7 * 86_400
+DEFAULT_RECENT_WEEKS = 4
+DEFAULT_BASELINE_WEEKS = 26
+DEFAULT_RATIO = 0.1
+DEFAULT_MIN_RATE = 0.5
+
+# 1970-01-01 was a Thursday; weeks start on the Monday after it.
+_EPOCH_MONDAY = 4 * 86_400
+
+
+def week_start(epoch: int) -> int:
+    """Epoch of the Monday 00:00 UTC starting the week of ``epoch``."""
+    return epoch - (epoch - _EPOCH_MONDAY) % WEEK
+
+
+@dataclass
+class ChurnSeries:
+    """Weekly additions and removals of one provider, from week ``start``."""
+
+    provider: str
+    start: int
+    added: list[int] = field(default_factory=list)
+    removed: list[int] = field(default_factory=list)
+
+    @property
+    def net(self) -> list[int]:
+        return [a - r for a, r in zip(self.added, self.removed)]
+
+    @property
+    def churn(self) -> list[int]:
+        return [a + r for a, r in zip(self.added, self.removed)]
+
+    def rates(self, recent_weeks: int, baseline_weeks: int) -> Optional[tuple[float, float]]:
+        """``(recent, baseline)`` changes per week over complete weeks only.
+
+        None while the history is too short to judge: the baseline needs
+        at least ``recent_weeks`` weeks before the recent window.
+        """
+        churn = self.churn[:-1]  # the current week is partial
+        split = len(churn) - recent_weeks
+        baseline = churn[max(0, split - baseline_weeks):max(0, split)]
+        if recent_weeks < 1 or len(baseline) < recent_weeks:
+            return None
+        return sum(churn[split:]) / recent_weeks, sum(baseline) / len(baseline)
+
+
+def weekly_series(events: Iterable[list[Any]], now: int) -> dict[str, ChurnSeries]:
+    """Bucket ``[time, provider, model, +1/-1]`` events into aligned weekly series.
+
+    Every series starts at the week of the first event and ends with the
+    week of ``now``.
+    """
+    events = list(events)
+    if not events:
+        return {}
+    first = week_start(min(event[0] for event in events))
+    weeks = max(1, (week_start(now) - first) // WEEK + 1)
+    seeded: dict[str, int] = {}
+    series: dict[str, ChurnSeries] = {}
+    for when, provider, _, change in events:
+        if seeded.setdefault(provider, when) == when:
+            continue
+        entry = series.get(provider)
+        if entry is None:
+            entry = series[provider] = ChurnSeries(provider, first, [0] * weeks, [0] * weeks)
+        week = (week_start(when) - first) // WEEK
+        if not 0 <= week < weeks:
+            continue
+        if change > 0:
+            entry.added[week] += 1
+        else:
+            entry.removed[week] += 1
+    for provider in seeded:
+        series.setdefault(provider, ChurnSeries(provider, first, [0] * weeks, [0] * weeks))
+    return dict(sorted(series.items()))
+
+
+def build_report(
+    index: ModelIndex,
+    now: Optional[datetime] = None,
+    weeks: Optional[int] = None,
+    recent_weeks: int = DEFAULT_RECENT_WEEKS,
+    baseline_weeks: int = DEFAULT_BASELINE_WEEKS,
+    ratio: float = DEFAULT_RATIO,
+    min_rate: float = DEFAULT_MIN_RATE,
+) -> dict[str, Any]:
+    """Weekly arrays (the last ``weeks`` weeks, all if None) and collapse flags."""
+    now = now or datetime.now(timezone.utc)
+    series = weekly_series(index.events, int(now.timestamp()))
+    providers = {}
+    start = None
+    for name, entry in series.items():
+        rates = entry.rates(recent_weeks, baseline_weeks)
+        recent, baseline = rates if rates is not None else (None, None)
+        listed = any(model["count"] for model in index.models.get(name, {}).values())
+        offset = max(0, len(entry.added) - weeks) if weeks else 0
+        start = entry.start + offset * WEEK
+        providers[name] = {
+            "added": entry.added[offset:],
+            "removed": entry.removed[offset:],
+            "net": entry.net[offset:],
+            "recent_rate": round(recent, 3) if rates else None,
+            "baseline_rate": round(baseline, 3) if rates else None,
+            "collapsed": bool(rates and listed and baseline >= min_rate and recent <= ratio * baseline),
+        }
+    return {
+        "start": datetime.fromtimestamp(start, tz=timezone.utc).date().isoformat() if start else None,
+        "generated_at": now.isoformat(),
+        "recent_weeks": recent_weeks,
+        "baseline_weeks": baseline_weeks,
+        "ratio": ratio,
+        "collapsed": [name for name, p in providers.items() if p["collapsed"]],
+        "providers": providers,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Weekly model churn per provider")
+    parser.add_argument("--weeks", type=int, default=None,
+                        help="Only output the last N weeks of each array (flags always use the full windows)")
+    parser.add_argument("--recent", type=int, default=DEFAULT_RECENT_WEEKS,
+                        help="Recent window in weeks (default %d)" % DEFAULT_RECENT_WEEKS)
+    parser.add_argument("--baseline", type=int, default=DEFAULT_BASELINE_WEEKS,
+                        help="Baseline window in weeks (default %d)" % DEFAULT_BASELINE_WEEKS)
+    parser.add_argument("--ratio", type=float, default=DEFAULT_RATIO,
+                        help="Collapsed when recent <= ratio x baseline (default %s)" % DEFAULT_RATIO)
+    parser.add_argument("--min-rate", type=float, default=DEFAULT_MIN_RATE,
+                        help="Minimum baseline changes per week to judge (default %s)" % DEFAULT_MIN_RATE)
+    parser.add_argument("--file", action="append",
+                        help="Config to track; repeatable (default %s)" % ", ".join(DEFAULT_FILES))
+    parser.add_argument("--json", action="store_true", help="Emit JSON")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    index = ModelIndex(files=args.file or DEFAULT_FILES)
+    try:
+        index.update()
+    except RuntimeError as e:
+        logger.error("%s", e)
+        return 1
+    report = build_report(index, weeks=args.weeks, recent_weeks=args.recent,
+                          baseline_weeks=args.baseline, ratio=args.ratio, min_rate=args.min_rate)
+
+    if args.json:
+        sys.stdout.write(json.dumps(report) + "\n")
+        return 0
+    for name, p in report["providers"].items():
+        added, removed = p["added"][-args.recent - 1:-1], p["removed"][-args.recent - 1:-1]
+        if p["recent_rate"] is None:
+            rates = "not enough history"
+        else:
+            rates = "%5.2f/week (baseline %5.2f)" % (p["recent_rate"], p["baseline_rate"])
+        sys.stdout.write("%-16s +%-4d -%-4d last %d weeks  %s%s\n" % (
+            name, sum(added), sum(removed), args.recent, rates,
+            "  COLLAPSED" if p["collapsed"] else ""))
+    if report["collapsed"]:
+        sys.stdout.write("\nChurn collapsed for: %s\n" % ", ".join(report["collapsed"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""Cross-file consistency check for the LibreChat configs.
+
+The five configs are variants of one another (the ``env`` and ``up``
+files differ in how API keys are supplied) and ``update_models`` writes the
+same model list into each of them. Every provider that appears in more than
+one file must therefore carry the same model list and endpoint settings. This module checks that in-process, from digests of
+each provider's fields, instead of spawning ``validate_config.mjs``:
+
+- ``models.default`` or ``baseURL`` differing between files is an error.
+- Any other endpoint field differing (titleModel, dropParams, ...) is a
+  warning. ``apiKey`` differs by design and is ignored.
+- Duplicate model ids inside one list are a warning.
+- A provider missing from some files is reported as info only; the files
+  do not all carry the same providers.
+
+The documents are loaded through the YAML cache with the settings
+``validate_yaml_file`` uses, so running right after validation costs no
+parse at all.
+
+Usage:
+    python consistency.py [--json] [FILE ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Optional
+
+from log_config import setup_logging
+from yaml_cache import load_yaml_cached
+
+logger = logging.getLogger(__name__)
+
+ERROR = "error"
+WARNING = "warning"
+INFO = "info"
+
+MODELS_FIELD = "models.default"
+# Fields that must agree across files; other differences are warnings.
+STRICT_FIELDS = (MODELS_FIELD, "baseURL")
+# Fields that are expected to differ between the files.
+IGNORED_FIELDS = frozenset({"name", "apiKey"})
+
+
+@dataclass
+class Finding:
+    severity: str
+    provider: str
+    message: str
+
+
+@dataclass
+class ConsistencyReport:
+    files: list[str]
+    findings: list[Finding] = field(default_factory=list)
+
+    def _by_severity(self, severity: str) -> list[Finding]:
+        return [f for f in self.findings if f.severity == severity]
+
+    @property
+    def errors(self) -> list[Finding]:
+        return self._by_severity(ERROR)
+
+    @property
+    def warnings(self) -> list[Finding]:
+        return self._by_severity(WARNING)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> dict:
+        return {
+            "files": self.files,
+            "ok": self.ok,
+            "findings": [asdict(f) for f in self.findings],
+        }
+
+
+def _digest(value: Any) -> str:
+    if isinstance(value, list) and all(isinstance(v, str) for v in value):
+        payload = "\n".join(value)
+    else:
+        payload = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def duplicate_ids(models: Iterable[str]) -> list[str]:
+    """Ids that occur more than once in ``models``, sorted."""
+    seen: set[str] = set()
+    duplicates: set[str] = set()
+    for model in models:
+        if model in seen:
+            duplicates.add(model)
+        else:
+            seen.add(model)
+    return sorted(duplicates)
+
+
+def endpoint_digests(doc: Any) -> dict[str, dict[str, str]]:
+    """Map provider name -> {field: digest} for one document.
+
+    ``models.default`` is digested on its own; the rest of ``models`` (for
+    example ``fetch``) is digested as ``models``.
+    """
+    result: dict[str, dict[str, str]] = {}
+    endpoints = (doc or {}).get("endpoints") or {}
+    for endpoint in endpoints.get("custom") or []:
+        if not isinstance(endpoint, Mapping) or "name" not in endpoint:
+            continue
+        name = str(endpoint["name"])
+        if name in result:
+            continue
+        digests = {}
+        for key, value in endpoint.items():
+            if key in IGNORED_FIELDS:
+                continue
+            if key == "models" and isinstance(value, Mapping):
+                rest = {k: v for k, v in value.items() if k != "default"}
+                digests[MODELS_FIELD] = _digest(list(value.get("default") or []))
+                if rest:
+                    digests["models"] = _digest(rest)
+                continue
+            digests[str(key)] = _digest(value)
+        result[name] = digests
+    return result
+
+
+def _models(doc: Any, provider: str) -> list[str]:
+    for endpoint in ((doc or {}).get("endpoints") or {}).get("custom") or []:
+        if isinstance(endpoint, Mapping) and endpoint.get("name") == provider:
+            return list((endpoint.get("models") or {}).get("default") or [])
+    return []
+
+
+def _describe_groups(groups: Mapping[str, list[str]]) -> str:
+    ordered = sorted(groups.values(), key=lambda files: (-len(files), files))
+    return " vs ".join(", ".join(files) for files in ordered)
+
+
+def check_documents(documents: Mapping[str, Any]) -> ConsistencyReport:
+    """Compare already-loaded documents, keyed by file name."""
+    report = ConsistencyReport(files=list(documents))
+    digests = {name: endpoint_digests(doc) for name, doc in documents.items()}
+    providers = sorted(set().union(*digests.values())) if digests else []
+
+    for provider in providers:
+        present = [f for f in documents if provider in digests[f]]
+        missing = [f for f in documents if provider not in digests[f]]
+        if missing:
+            report.findings.append(Finding(INFO, provider, "not in %s" % ", ".join(missing)))
+
+        fields = sorted(set().union(*(digests[f][provider] for f in present)))
+        for field_name in fields:
+            groups: dict[str, list[str]] = {}
+            for f in present:
+                groups.setdefault(digests[f][provider].get(field_name, ""), []).append(f)
+            if len(groups) < 2:
+                continue
+            severity = ERROR if field_name in STRICT_FIELDS else WARNING
+            report.findings.append(Finding(
+                severity, provider,
+                "%s differs: %s" % (field_name, _describe_groups(groups)),
+            ))
+
+        checked = set()
+        for f in present:
+            model_digest = digests[f][provider].get(MODELS_FIELD)
+            if model_digest in checked:
+                continue
+            checked.add(model_digest)
+            duplicates = duplicate_ids(_models(documents[f], provider))
+            if duplicates:
+                report.findings.append(Finding(
+                    WARNING, provider,
+                    "duplicate model ids in %s: %s" % (f, ", ".join(duplicates)),
+                ))
+
+    return report
+
+
+def check_files(paths: Optional[Iterable[Path]] = None) -> ConsistencyReport:
+    """Load ``paths`` (default: the five configs) and compare them."""
+    from catalog import config_paths
+    from update_models import validation_yaml
+
+    if paths is None:
+        paths = [p for p in config_paths() if p.exists()]
+    documents = {}
+    for path in paths:
+        path = Path(path)
+        documents[path.name] = load_yaml_cached(path, validation_yaml())
+    return check_documents(documents)
+
+
+def log_report(report: ConsistencyReport) -> None:
+    levels = {ERROR: logging.ERROR, WARNING: logging.WARNING, INFO: logging.INFO}
+    for finding in report.findings:
+        logger.log(levels[finding.severity], "%s: %s", finding.provider, finding.message)
+    logger.info(
+        "Consistency check of %d file(s): %d error(s), %d warning(s)",
+        len(report.files), len(report.errors), len(report.warnings),
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check the configs agree with each other")
+    parser.add_argument("files", nargs="*", type=Path, help="Config files (default: the five configs)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    report = check_files(args.files or None)
+    if args.json:
+        sys.stdout.write(json.dumps(report.to_dict(), indent=2) + "\n")
+    else:
+        log_report(report)
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
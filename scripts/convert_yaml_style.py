@@ -1,86 +1,225 @@
 from ruamel.yaml import YAML
+from ruamel.yaml.events import (
+    CollectionEndEvent,
+    CollectionStartEvent,
+    MappingStartEvent,
+    ScalarEvent,
+    SequenceStartEvent,
+)
+from ruamel.yaml.tokens import FlowSequenceStartToken
 from pathlib import Path
 import logging
-import shutil
 import os
 
+from backup_store import BackupStore
+from catalog import config_paths
 from log_config import setup_logging
+from transaction import ConfigTransaction
+from yaml_cache import load_yaml_cached
 
 logger = logging.getLogger(__name__)
 
 def create_backup(file_path):
-    """Create a backup of the original file."""
+    """Snapshot the original file into the rotating backup store."""
     try:
-        backup_path = file_path.with_suffix(f'.yaml.bak')
-        shutil.copy2(file_path, backup_path)  # Use copy2 to preserve metadata
-        logger.info("Created backup at %s", backup_path)
-        return backup_path
+        return BackupStore().backup(file_path)
     except Exception as e:
         logger.error("Backup creation failed: %s", e)
         raise
 
+def replace_file(filename, write):
+    """Write ``filename`` through a ConfigTransaction (temp file, fsync, rename).
+
+    Never write into the file itself: the newest backup may be a hard link
+    to it.
+    """
+    transaction = ConfigTransaction()
+    transaction.stage(filename, write)
+    transaction.commit()
+
+def has_flow_sequences(text):
+    """Cheap pre-scan: does the document contain any flow-style sequence?
+
+    A file without a single '[' cannot contain one, which is the common
+    case. Otherwise only the tokenizer runs -- no parse into nodes, no
+    construction of Python objects.
+    """
+    if '[' not in text:
+        return False
+    return any(isinstance(token, FlowSequenceStartToken) for token in YAML().scan(text))
+
+def find_flow_sequences(text):
+    """Locate non-empty flow sequences that can be converted in place.
+
+    Returns:
+        tuple: (regions, convertible) where ``regions`` is a list of
+        ``(line, key_column, seq_column, item_slices)`` and ``convertible``
+        is False if any flow sequence needs the full round-trip instead
+        (nested collections, multi-line sequences, sequences that are not
+        a block mapping value, or anything after the closing bracket).
+    """
+    regions = []
+    stack = []       # (event, is_value_position) for each open collection
+    last_key = None  # ScalarEvent of the most recent key in a block mapping
+    lines = text.splitlines()
+
+    events = iter(YAML().parse(text))
+    for event in events:
+        if isinstance(event, SequenceStartEvent) and event.flow_style:
+            parent = stack[-1] if stack else None
+            in_block_value = (
+                parent is not None
+                and isinstance(parent[0], MappingStartEvent)
+                and not parent[0].flow_style
+                and parent[1]
+                and last_key is not None
+                and last_key.start_mark.line == event.start_mark.line
+            )
+            items = []
+            end_event = None
+            for inner in events:
+                if isinstance(inner, ScalarEvent):
+                    items.append(inner)
+                    continue
+                if isinstance(inner, CollectionEndEvent):
+                    end_event = inner
+                break
+
+            if end_event is None:
+                # Nested collection inside the flow sequence.
+                return regions, False
+            if not items:
+                # `key: []` stays as is; an empty sequence has no block form.
+                if stack and isinstance(stack[-1][0], MappingStartEvent):
+                    stack[-1] = (stack[-1][0], not stack[-1][1])
+                continue
+
+            line = event.start_mark.line
+            tail = lines[line][end_event.end_mark.column:]
+            if (not in_block_value or event.anchor or event.tag
+                    or end_event.end_mark.line != line or tail.strip()):
+                return regions, False
+
+            slices = [
+                lines[line][item.start_mark.column:item.end_mark.column]
+                for item in items
+            ]
+            regions.append((line, last_key.start_mark.column, event.start_mark.column, slices))
+            stack[-1] = (stack[-1][0], False)
+            continue
+
+        if isinstance(event, CollectionStartEvent):
+            if stack and isinstance(stack[-1][0], MappingStartEvent):
+                stack[-1] = (stack[-1][0], not stack[-1][1])
+            stack.append((event, False))
+        elif isinstance(event, CollectionEndEvent):
+            stack.pop()
+        elif isinstance(event, ScalarEvent) and stack and isinstance(stack[-1][0], MappingStartEvent):
+            mapping, is_value = stack[-1]
+            if not is_value:
+                last_key = event
+            stack[-1] = (mapping, not is_value)
+
+    return regions, True
+
+def convert_regions(text, regions, dash_offset=2):
+    """Rewrite each located flow sequence as a block sequence.
+
+    Only the affected lines change; every other byte of ``text`` is kept.
+    """
+    lines = text.splitlines(keepends=True)
+    for line, key_column, seq_column, slices in sorted(regions, reverse=True):
+        head = lines[line][:seq_column].rstrip()
+        indent = ' ' * (key_column + dash_offset)
+        block = [head + '\n'] + ['%s- %s\n' % (indent, item) for item in slices]
+        lines[line:line + 1] = block
+    return ''.join(lines)
+
+def _full_conversion(filename):
+    """Round-trip the whole file, forcing every sequence to block style."""
+    # Initialize YAML parser with specific settings
+    yaml = YAML()
+    yaml.preserve_quotes = True
+    yaml.width = 4096
+    yaml.default_flow_style = False
+
+    # Configure indentation
+    yaml.indent(mapping=2, sequence=4, offset=2)
+    yaml.sequence_dash_offset = 2
+
+    # Read and parse YAML
+    data = load_yaml_cached(filename, yaml)
+
+    if data is None:
+        raise ValueError("No YAML content could be loaded")
+
+    # Function to recursively convert sequences to block style
+    def convert_to_block_style(node):
+        if isinstance(node, list):
+            # Force block style for sequences
+            if hasattr(node, 'fa'):
+                node.fa.set_block_style()
+            # Recursively process list items
+            for item in node:
+                convert_to_block_style(item)
+        elif isinstance(node, dict):
+            # Process dictionary values
+            for value in node.values():
+                convert_to_block_style(value)
+
+    # Convert all sequences to block style
+    convert_to_block_style(data)
+
+    # Create backup before modifying
+    create_backup(Path(filename))
+
+    # Save with corrected formatting
+    replace_file(filename, lambda f: yaml.dump(data, f))
+
+def convert_file(filename):
+    """Convert one file to block-style sequences.
+
+    Returns:
+        bool: True if the file was rewritten, False if it was already
+        block style (in which case it is neither backed up nor touched).
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    if not has_flow_sequences(text):
+        logger.info("%s is already block style, skipping", filename)
+        return False
+
+    regions, convertible = find_flow_sequences(text)
+    if not convertible:
+        logger.info("%s has complex flow sequences, converting whole file", filename)
+        _full_conversion(filename)
+        return True
+
+    if not regions:
+        logger.info("%s is already block style, skipping", filename)
+        return False
+
+    create_backup(Path(filename))
+    converted = convert_regions(text, regions)
+    replace_file(filename, lambda f: f.write(converted))
+    logger.info("Converted %d flow sequence(s) in %s", len(regions), filename)
+    return True
+
 def convert_yaml_style():
     """Convert YAML arrays from flow style to block style while preserving mapping indentation."""
-    # Get parent directory path
-    parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-
-    # Input files with parent directory
-    yaml_files = [
-        os.path.join(parent_dir, 'librechat-env-f.yaml'),
-        os.path.join(parent_dir, 'librechat-env-l.yaml'),
-        os.path.join(parent_dir, 'librechat-up-f.yaml'),
-        os.path.join(parent_dir, 'librechat-up-l.yaml'),
-        os.path.join(parent_dir, 'librechat-test.yaml'),
-    ]
+    yaml_files = [str(path) for path in config_paths()]
 
+    store = BackupStore()
     for filename in yaml_files:
         if not os.path.exists(filename):
             logger.warning("%s not found, skipping...", filename)
             continue
 
         try:
-            # Initialize YAML parser with specific settings
-            yaml = YAML()
-            yaml.preserve_quotes = True
-            yaml.width = 4096
-            yaml.default_flow_style = False
-
-            # Configure indentation
-            yaml.indent(mapping=2, sequence=4, offset=2)
-            yaml.sequence_dash_offset = 2
-
-            # Read and parse YAML
-            with open(filename, 'r', encoding='utf-8') as f:
-                data = yaml.load(f)
-
-            if data is None:
-                raise ValueError("No YAML content could be loaded")
-
-            # Function to recursively convert sequences to block style
-            def convert_to_block_style(node):
-                if isinstance(node, list):
-                    # Force block style for sequences
-                    if hasattr(node, 'fa'):
-                        node.fa.set_block_style()
-                    # Recursively process list items
-                    for item in node:
-                        convert_to_block_style(item)
-                elif isinstance(node, dict):
-                    # Process dictionary values
-                    for value in node.values():
-                        convert_to_block_style(value)
-
-            # Convert all sequences to block style
-            convert_to_block_style(data)
-
-            # Create backup before modifying
-            create_backup(Path(filename))
-
-            # Save with corrected formatting
-            with open(filename, 'w', encoding='utf-8') as f:
-                yaml.dump(data, f)
-
-            logger.info("Successfully converted %s", filename)
+            if convert_file(filename):
+                logger.info("Successfully converted %s", filename)
+                store.compact(filename)
 
         except Exception as e:
             logger.error("Error converting file %s: %s", filename, e)
@@ -0,0 +1,136 @@
+"""Unified diff of a dry run, built from the changed model blocks only.
+
+A dry run updates the loaded documents in memory but never dumps them.
+Dumping every file just to diff it against the original would cost a full
+serialization plus a whole-file diff per config. Instead, the dry run
+records where each changed ``models.default`` block sits in the file (the
+``.lc`` line info the round-trip loader attaches) together with the new
+ids. ``file_diff`` then reads the file's text, formats only those blocks
+(with ``catalog.format_model_items``, i.e. exactly as ``save_yaml_file``
+would write them) and diffs each block with a little surrounding context.
+The result is a regular ``git apply``-able patch whose hunks carry real
+file line numbers.
+
+Flow-style blocks (``default: [a, b]``) have no line per item and are
+left out of the preview, as ``catalog.render_config`` does.
+"""
+
+from __future__ import annotations
+
+import difflib
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from catalog import format_model_items
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONTEXT = 3
+
+
+@dataclass(frozen=True)
+class BlockChange:
+    """New ids for the block items on lines ``start``..``end`` (1-based, inclusive)."""
+
+    provider: str
+    start: int
+    end: int
+    models: tuple[str, ...]
+
+
+def block_range(models: Any) -> Optional[tuple[int, int]]:
+    """1-based inclusive line range of a loaded ``models.default`` sequence.
+
+    Returns None for sequences without line info or without items.
+    """
+    if not models or not hasattr(models, "lc"):
+        return None
+    try:
+        start = models.lc.item(0)[0]
+        end = models.lc.item(len(models) - 1)[0]
+    except (KeyError, IndexError, TypeError):
+        return None
+    return start + 1, end + 1
+
+
+def _range(start: int, length: int) -> str:
+    # Same convention as difflib.unified_diff: 1-based, empty ranges name
+    # the line before them.
+    if length == 1:
+        return "%d" % (start + 1)
+    if length == 0:
+        return "%d,0" % start
+    return "%d,%d" % (start + 1, length)
+
+
+def _line(prefix: str, line: str) -> str:
+    if line.endswith("\n"):
+        return prefix + line
+    return "%s%s\n\\ No newline at end of file\n" % (prefix, line)
+
+
+def _hunks(old: list[str], new: list[str], old_base: int, new_base: int, context: int) -> list[str]:
+    out = []
+    matcher = difflib.SequenceMatcher(None, old, new)
+    for group in matcher.get_grouped_opcodes(context):
+        first, last = group[0], group[-1]
+        out.append("@@ -%s +%s @@\n" % (
+            _range(old_base + first[1], last[2] - first[1]),
+            _range(new_base + first[3], last[4] - first[3]),
+        ))
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                out.extend(_line(" ", line) for line in old[i1:i2])
+                continue
+            out.extend(_line("-", line) for line in old[i1:i2])
+            out.extend(_line("+", line) for line in new[j1:j2])
+    return out
+
+
+def file_diff(
+    path: Path,
+    changes: Iterable[BlockChange],
+    text: Optional[str] = None,
+    context: int = DEFAULT_CONTEXT,
+) -> str:
+    """Unified diff of ``path`` with ``changes`` applied; "" if nothing changes.
+
+    Args:
+        text: The file content, if already in memory.
+    """
+    path = Path(path)
+    if text is None:
+        text = path.read_text(encoding="utf-8")
+    lines = text.splitlines(keepends=True)
+    changes = sorted(changes, key=lambda change: change.start)
+
+    out: list[str] = []
+    delta = 0  # new line number - old line number after the blocks so far
+    covered = 0  # old lines already shown by earlier hunks
+    for position, change in enumerate(changes):
+        old_block = lines[change.start - 1:change.end]
+        first = old_block[0] if old_block else ""
+        stripped = first.lstrip(" ")
+        if not stripped.startswith("- "):
+            logger.info("%s: models.default for %s is not block style, not previewed",
+                        path.name, change.provider)
+            continue
+        indent = " " * (len(first) - len(stripped))
+        new_block = ["%s%s\n" % (indent, item) for item in format_model_items(change.models)]
+
+        # Context never reaches lines an earlier hunk showed or the next
+        # block, so hunks do not overlap.
+        next_start = changes[position + 1].start - 1 if position + 1 < len(changes) else len(lines)
+        low = max(covered, change.start - 1 - context)
+        high = min(next_start, change.end + context)
+        old = lines[low:high]
+        new = lines[low:change.start - 1] + new_block + lines[change.end:high]
+        out.extend(_hunks(old, new, low, low + delta, context))
+        delta += len(new_block) - len(old_block)
+        covered = high
+
+    if not out:
+        return ""
+    return "--- a/%s\n+++ b/%s\n%s" % (path.name, path.name, "".join(out))
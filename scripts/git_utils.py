@@ -0,0 +1,45 @@
+"""Git helpers shared by the history tools.
+
+``blame_cache`` and ``model_index`` both run git in the repository they
+read and both parse ``-U0`` diffs; the subprocess call and the hunk
+header format live here so they cannot drift apart.
+"""
+
+from __future__ import annotations
+
+import re
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+def git(repo_root: Path, *args: str) -> Optional[str]:
+    """Stdout of ``git -C repo_root <args>``, or None if git failed or is missing."""
+    try:
+        result = subprocess.run(["git", "-C", str(repo_root), *args],
+                                capture_output=True, text=True, check=False)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+
+def hunk_header(line: str) -> Optional[tuple[int, int, int, int]]:
+    """``(old_start, old_count, new_start, new_count)`` if ``line`` is a hunk header.
+
+    An omitted count is 1, as in git's output.
+    """
+    match = HUNK_HEADER.match(line)
+    if match is None:
+        return None
+    old_start, old_count, new_start, new_count = match.groups()
+    return (int(old_start), 1 if old_count is None else int(old_count),
+            int(new_start), 1 if new_count is None else int(new_count))
+
+
+def parse_hunks(diff: str) -> list[tuple[int, int, int, int]]:
+    """``(old_start, old_count, new_start, new_count)`` of each ``-U0`` hunk."""
+    return [hunk for hunk in map(hunk_header, diff.splitlines()) if hunk is not None]
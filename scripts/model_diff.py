@@ -0,0 +1,135 @@
+"""Per-provider model list diffs: added, removed and renamed ids.
+
+``UpdateStats`` used to know only ``(old_count, new_count)``, so a provider
+that swapped 30 models for 30 others showed up as ``+0``. ``diff_models``
+compares the two lists with set operations in a single pass over each
+(fine for catalogs with tens of thousands of ids) and pairs removals with
+additions that look like the same model under a new name.
+
+A rename is a removed id and an added id with the same ``rename_key``
+(the part after the last ``/``, case-folded), e.g.
+``meta-llama/Llama-3-8B`` -> ``meta/llama-3-8b``. Only unambiguous 1:1
+matches count; anything else stays a plain add/remove.
+
+The diffs of one run are written as a small JSON artifact
+(``.model_diff.json`` next to ``.commit_msg``) for the commit message and
+downstream consumers.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Mapping
+
+from transaction import write_atomic
+
+DIFF_FORMAT_VERSION = 1
+
+
+def rename_key(model: str) -> str:
+    """Normalized id used to match a removed model with its new name."""
+    return model.rsplit("/", 1)[-1].casefold()
+
+
+@dataclass(frozen=True)
+class ModelDiff:
+    provider: str
+    old_count: int
+    new_count: int
+    added: tuple[str, ...] = ()
+    removed: tuple[str, ...] = ()
+    renamed: tuple[tuple[str, str], ...] = ()  # (old id, new id)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed or self.renamed)
+
+    def summary(self) -> str:
+        """Compact ``+a/-r`` form, with renames if there are any."""
+        text = "+%d/-%d" % (len(self.added), len(self.removed))
+        if self.renamed:
+            text += ", %d renamed" % len(self.renamed)
+        return text
+
+    def to_dict(self) -> dict:
+        return {
+            "old_count": self.old_count,
+            "new_count": self.new_count,
+            "added": list(self.added),
+            "removed": list(self.removed),
+            "renamed": [list(pair) for pair in self.renamed],
+        }
+
+
+def _unique_missing(models: Iterable[str], other: set[str]) -> list[str]:
+    """Ids of ``models`` not in ``other``, in order, without repeats."""
+    seen: set[str] = set()
+    result = []
+    for model in models:
+        if model not in other and model not in seen:
+            seen.add(model)
+            result.append(model)
+    return result
+
+
+def diff_models(provider: str, old: Iterable[str], new: Iterable[str]) -> ModelDiff:
+    """Diff two model lists of ``provider``; ids keep their list order."""
+    old = list(old)
+    new = list(new)
+    old_set = set(old)
+    new_set = set(new)
+    removed = _unique_missing(old, new_set)
+    added = _unique_missing(new, old_set)
+
+    renamed = []
+    if removed and added:
+        removed_by_key: dict[str, list[str]] = {}
+        for model in removed:
+            removed_by_key.setdefault(rename_key(model), []).append(model)
+        added_by_key: dict[str, list[str]] = {}
+        for model in added:
+            added_by_key.setdefault(rename_key(model), []).append(model)
+
+        for key in removed_by_key.keys() & added_by_key.keys():
+            if len(removed_by_key[key]) == 1 and len(added_by_key[key]) == 1:
+                renamed.append((removed_by_key[key][0], added_by_key[key][0]))
+        if renamed:
+            renamed.sort()
+            old_names = {pair[0] for pair in renamed}
+            new_names = {pair[1] for pair in renamed}
+            removed = [m for m in removed if m not in old_names]
+            added = [m for m in added if m not in new_names]
+
+    return ModelDiff(
+        provider=provider,
+        old_count=len(old),
+        new_count=len(new),
+        added=tuple(added),
+        removed=tuple(removed),
+        renamed=tuple(renamed),
+    )
+
+
+def diffs_to_dict(diffs: Mapping[str, ModelDiff]) -> dict:
+    providers = {name: diffs[name].to_dict() for name in sorted(diffs)}
+    return {
+        "version": DIFF_FORMAT_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "totals": {
+            "added": sum(len(d.added) for d in diffs.values()),
+            "removed": sum(len(d.removed) for d in diffs.values()),
+            "renamed": sum(len(d.renamed) for d in diffs.values()),
+            "changed_providers": sum(1 for d in diffs.values() if d.changed),
+        },
+        "providers": providers,
+    }
+
+
+def write_diff_artifact(diffs: Mapping[str, ModelDiff], path) -> Path:
+    """Atomically write the diffs of one run as JSON."""
+    path = Path(path)
+    text = json.dumps(diffs_to_dict(diffs), indent=2, sort_keys=True) + "\n"
+    return write_atomic(path, text)
@@ -0,0 +1,455 @@
+"""Per-model first-seen / last-seen index, built from the git history.
+
+"When did groq start listing this id?" and "when did it disappear?" are
+answered from ``git log -p`` over the configs. The history is read in a
+single stream, oldest commit first (``--first-parent``, so merges count
+once), with ``-U0`` diffs. Each file's lines are kept in memory and every
+hunk is applied to them; an added or removed line belongs to a provider
+when it is an item of that provider's ``models.default`` block. The
+owner is found by walking up from the hunk to ``default:``, ``models:``
+and the endpoint's ``name:``, so no YAML parse is needed.
+
+A model counts as listed while at least one tracked config lists it.
+Changes are netted per commit, so a reordered block or an id moving
+between files is not an event.
+
+The index is stored as JSON with the commit it was built at:
+
+    {
+      "version": 1,
+      "files": ["librechat-env-f.yaml"],
+      "head": "<commit>",
+      "models": {
+        "groq": {
+          "llama3-8b-8192": {"first_seen": 1712000000, "first_commit": "<sha12>",
+                             "last_seen": 1750000000, "last_commit": "<sha12>",
+                             "count": 0}
+        }
+      },
+      "events": [[1712000000, "groq", "llama3-8b-8192", 1], ...]
+    }
+
+``first_seen`` is the commit that first listed the model, ``last_seen``
+the commit that last removed it (null while it is listed). ``events``
+keeps every addition (1) and removal (-1) in commit order, for churn
+reports. Updating only reads ``<head>..HEAD``; the files are restored at
+``head`` with ``git show``. A head that is no longer an ancestor of HEAD
+(rewritten history) or a different file set rebuilds from scratch.
+
+The configs are kept in sync by ``update_models.py``, so by default only
+``librechat-env-f.yaml`` is tracked.
+
+Usage:
+    python model_index.py                         # update, one line per provider
+    python model_index.py --model llama3-8b-8192  # first/last seen per provider
+    python model_index.py --provider groq --json
+    python model_index.py --rebuild
+
+Environment:
+    MODEL_INDEX_PATH  index path (default ``scripts/.cache/model_index.json``)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from git_utils import git, hunk_header
+from log_config import setup_logging
+from transaction import write_atomic
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_INDEX_PATH = Path(__file__).resolve().parent / ".cache" / "model_index.json"
+DEFAULT_FILES = ("librechat-env-f.yaml",)
+INDEX_FORMAT_VERSION = 1
+
+# Marks the start of each commit in the log stream: "\x00<sha> <committer-time>"
+_COMMIT_FORMAT = "%x00%H %ct"
+
+# (provider, model) -> number of tracked files listing it
+Listing = Counter
+
+
+def index_path() -> Path:
+    return Path(os.environ.get("MODEL_INDEX_PATH", DEFAULT_INDEX_PATH))
+
+
+# -- block ownership -------------------------------------------------------
+
+def _indent(line: str) -> int:
+    return len(line) - len(line.lstrip(" "))
+
+
+def _significant(line: str) -> bool:
+    stripped = line.strip()
+    return bool(stripped) and not stripped.startswith("#")
+
+
+def scalar(text: str) -> str:
+    """The value of a plain or quoted one-line YAML scalar, without a trailing comment."""
+    text = text.strip()
+    if text[:1] == "'":
+        end = 1
+        while True:
+            end = text.find("'", end)
+            if end == -1 or text[end + 1:end + 2] != "'":
+                break
+            end += 2
+        return text[1:end if end != -1 else None].replace("''", "'")
+    if text[:1] == '"':
+        match = re.match(r'"((?:[^"\\]|\\.)*)"', text)
+        if match:
+            try:
+                return json.loads(match.group(0))
+            except ValueError:
+                return match.group(1)
+        return text[1:]
+    return re.split(r"\s#", text, maxsplit=1)[0].rstrip()
+
+
+def _item(line: str) -> Optional[str]:
+    stripped = line.lstrip(" ")
+    if stripped.startswith("- "):
+        return stripped[2:]
+    return None
+
+
+def _key(line: str, key: str) -> bool:
+    return scalar(line.strip().split(":", 1)[0]) == key and line.rstrip().endswith(":")
+
+
+def _endpoint_name(lines: list[str], models_line: int) -> Optional[str]:
+    """``name`` of the endpoint mapping whose ``models:`` key is on ``models_line``."""
+    key_indent = _indent(lines[models_line])
+    start = models_line
+    if _item(lines[start]) is None:
+        # Walk up over the endpoint's other keys to its "- " line.
+        start -= 1
+        while start >= 0 and (not _significant(lines[start]) or _indent(lines[start]) >= key_indent):
+            start -= 1
+        if start < 0 or _item(lines[start]) is None or _indent(lines[start]) + 2 != key_indent:
+            return None
+    else:
+        key_indent += 2
+    for number in range(start, len(lines)):
+        line = lines[number]
+        if number > start and _significant(line) and _indent(line) < key_indent:
+            break
+        text = _item(line) if number == start else line.strip()
+        if _indent(line) + (2 if number == start else 0) != key_indent:
+            continue
+        if text and text.startswith("name:"):
+            return scalar(text[len("name:"):])
+    return None
+
+
+def block_owner(lines: list[str], number: int) -> Optional[str]:
+    """Provider whose ``models.default`` block has line ``number`` (0-based) as an item."""
+    if _item(lines[number]) is None:
+        return None
+    indent = _indent(lines[number])
+    above = number - 1
+    while above >= 0 and (not _significant(lines[above])
+                          or (_indent(lines[above]) == indent and _item(lines[above]) is not None)):
+        above -= 1
+    if above < 0 or not _key(lines[above], "default") or _indent(lines[above]) > indent:
+        return None
+    default_indent = _indent(lines[above])
+    above -= 1
+    while above >= 0 and (not _significant(lines[above]) or _indent(lines[above]) >= default_indent):
+        above -= 1
+    if above < 0:
+        return None
+    models_line = lines[above]
+    text = _item(models_line) if _item(models_line) is not None else models_line
+    if not _key(text, "models"):
+        return None
+    return _endpoint_name(lines, above)
+
+
+def block_models(lines: list[str], start: int, end: int) -> Iterator[tuple[str, str]]:
+    """``(provider, model)`` for every block item among lines ``start``..``end - 1``.
+
+    Consecutive items at the same indent share an owner, so a hunk
+    resolves its provider once.
+    """
+    owner = None
+    previous_indent = None
+    for number in range(start, end):
+        value = _item(lines[number])
+        if value is None:
+            owner, previous_indent = None, None
+            continue
+        indent = _indent(lines[number])
+        if owner is None or indent != previous_indent:
+            owner = block_owner(lines, number)
+        previous_indent = indent
+        if owner is not None:
+            yield owner, scalar(value)
+
+
+def listing(lines: list[str]) -> Listing:
+    return Counter(block_models(lines, 0, len(lines)))
+
+
+# -- log stream ------------------------------------------------------------
+
+class _FileDiff:
+    """The ``-U0`` hunks of one file in one commit."""
+
+    def __init__(self, path: str):
+        self.path = path
+        # (old_start, old_count, new_start, new_count, removed, added)
+        self.hunks: list[tuple[int, int, int, int, list[str], list[str]]] = []
+
+    def apply(self, lines: list[str]) -> tuple[list[tuple[str, str]], list[tuple[str, str]]]:
+        """Patch ``lines`` in place; returns the removed and added block items."""
+        removed: list[tuple[str, str]] = []
+        for old_start, old_count, _, _, old, _ in self.hunks:
+            position = old_start - 1 if old_count else old_start
+            if lines[position:position + old_count] != old:
+                raise ValueError("%s does not match its diff at line %d" % (self.path, old_start))
+            removed.extend(block_models(lines, position, position + old_count))
+        for old_start, old_count, _, _, _, new in reversed(self.hunks):
+            position = old_start - 1 if old_count else old_start
+            lines[position:position + old_count] = new
+        added: list[tuple[str, str]] = []
+        for _, _, new_start, new_count, _, _ in self.hunks:
+            position = new_start - 1 if new_count else new_start
+            added.extend(block_models(lines, position, position + new_count))
+        return removed, added
+
+
+def parse_log(stream: Iterable[str], files: Iterable[str]) -> Iterator[tuple[str, int, list[_FileDiff]]]:
+    """``(commit, committer-time, file diffs)`` from ``git log -p -U0`` output."""
+    files = set(files)
+    commit, when, diffs = None, 0, []
+    diff: Optional[_FileDiff] = None
+    hunk = None
+    old_path = None
+    for raw in stream:
+        line = raw.rstrip("\n")
+        if line.startswith("\x00"):
+            if commit is not None:
+                yield commit, when, diffs
+            sha, _, time_text = line[1:].partition(" ")
+            commit, when, diffs, diff, hunk = sha, int(time_text), [], None, None
+            continue
+        if hunk is not None and line[:1] in ("-", "+", "\\"):
+            if line[:1] == "-":
+                hunk[4].append(line[1:])
+            elif line[:1] == "+":
+                hunk[5].append(line[1:])
+            continue
+        hunk = None
+        if line.startswith("diff --git "):
+            diff, old_path = None, None
+        elif line.startswith("--- "):
+            old_path = line[6:] if line.startswith("--- a/") else None
+        elif line.startswith("+++ "):
+            # A deleted file is only named on the "---" line.
+            path = line[6:] if line.startswith("+++ b/") else old_path
+            diff = _FileDiff(path) if path in files else None
+            if diff is not None:
+                diffs.append(diff)
+        elif diff is not None:
+            header = hunk_header(line)
+            if header is not None:
+                hunk = (*header, [], [])
+                diff.hunks.append(hunk)
+    if commit is not None:
+        yield commit, when, diffs
+
+
+# -- index -----------------------------------------------------------------
+
+class ModelIndex:
+    """First-seen / last-seen index of one repository; see the module docstring."""
+
+    def __init__(self, repo_root: Path = REPO_ROOT, files: Iterable[str] = DEFAULT_FILES,
+                 path: Optional[Path] = None):
+        self.repo_root = Path(repo_root)
+        self.files = sorted(files)
+        self.path = Path(path) if path is not None else index_path()
+        self.head: Optional[str] = None
+        self.models: dict[str, dict[str, dict[str, Any]]] = {}
+        self.events: list[list[Any]] = []
+
+    def load(self) -> bool:
+        """Read the stored index; False if missing, unreadable or for other files."""
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if (not isinstance(data, dict) or data.get("version") != INDEX_FORMAT_VERSION
+                or data.get("files") != self.files):
+            return False
+        self.head = data.get("head")
+        self.models = data.get("models") or {}
+        self.events = data.get("events") or []
+        return True
+
+    def save(self) -> None:
+        data = {
+            "version": INDEX_FORMAT_VERSION,
+            "files": self.files,
+            "head": self.head,
+            "models": self.models,
+            "events": self.events,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path, json.dumps(data, separators=(",", ":")))
+
+    def _file_lines(self, commit: Optional[str], rel_path: str) -> list[str]:
+        if commit is None:
+            return []
+        text = git(self.repo_root, "show", "%s:%s" % (commit, rel_path))
+        return text.splitlines() if text is not None else []
+
+    def _reset(self) -> None:
+        self.head, self.models, self.events = None, {}, []
+
+    def update(self, rebuild: bool = False) -> int:
+        """Bring the index up to HEAD; returns the number of commits read."""
+        head = (git(self.repo_root, "rev-parse", "HEAD") or "").strip()
+        if not head:
+            raise RuntimeError("%s is not a git repository with commits" % self.repo_root)
+        if rebuild or not self.load():
+            self._reset()
+        if (self.head is not None
+                and git(self.repo_root, "merge-base", "--is-ancestor", self.head, head) is None):
+            logger.info("%s is not an ancestor of HEAD, rebuilding the model index", self.head[:12])
+            self._reset()
+        if self.head == head:
+            return 0
+
+        contents = {rel: self._file_lines(self.head, rel) for rel in self.files}
+        revisions = "%s..%s" % (self.head, head) if self.head else head
+        command = ["git", "-C", str(self.repo_root), "log", "--reverse", "--first-parent",
+                   "--no-renames", "--no-color", "--no-ext-diff", "-p", "-U0",
+                   "--format=" + _COMMIT_FORMAT, revisions, "--", *self.files]
+        commits = 0
+        with subprocess.Popen(command, stdout=subprocess.PIPE, text=True,
+                              encoding="utf-8", errors="replace") as log:
+            for commit, when, diffs in parse_log(log.stdout, self.files):
+                self._apply_commit(commit, when, diffs, contents)
+                commits += 1
+        if log.returncode != 0:
+            raise RuntimeError("git log failed in %s" % self.repo_root)
+        self.head = head
+        self.save()
+        logger.info("Model index: read %d commit(s), %d event(s) in total", commits, len(self.events))
+        return commits
+
+    def _apply_commit(self, commit: str, when: int, diffs: list[_FileDiff],
+                      contents: dict[str, list[str]]) -> None:
+        delta: Listing = Counter()
+        for diff in diffs:
+            lines = contents[diff.path]
+            try:
+                removed, added = diff.apply(lines)
+            except (ValueError, IndexError) as e:
+                # Should not happen with --first-parent; re-read the file rather than drift.
+                logger.warning("%s; re-reading it at %s", e, commit[:12])
+                fresh = self._file_lines(commit, diff.path)
+                delta.subtract(listing(lines))
+                delta.update(listing(fresh))
+                contents[diff.path] = fresh
+                continue
+            delta.subtract(removed)
+            delta.update(added)
+        for (provider, model), change in sorted(delta.items()):
+            if change:
+                self._record(provider, model, change, commit, when)
+
+    def _record(self, provider: str, model: str, change: int, commit: str, when: int) -> None:
+        entry = self.models.setdefault(provider, {}).get(model)
+        before = entry["count"] if entry else 0
+        after = max(0, before + change)
+        if entry is None:
+            entry = self.models[provider][model] = {
+                "first_seen": when, "first_commit": commit[:12],
+                "last_seen": None, "last_commit": None, "count": 0,
+            }
+        entry["count"] = after
+        if before == 0 and after > 0:
+            if entry["last_seen"] is not None:
+                entry["last_seen"] = entry["last_commit"] = None
+            self.events.append([when, provider, model, 1])
+        elif before > 0 and after == 0:
+            entry["last_seen"], entry["last_commit"] = when, commit[:12]
+            self.events.append([when, provider, model, -1])
+
+    # -- queries -----------------------------------------------------------
+
+    def lookup(self, model: str) -> dict[str, dict[str, Any]]:
+        """``{provider: entry}`` for every provider that ever listed ``model``."""
+        return {provider: models[model] for provider, models in sorted(self.models.items())
+                if model in models}
+
+    def provider_models(self, provider: str) -> dict[str, dict[str, Any]]:
+        return dict(sorted((self.models.get(provider) or {}).items()))
+
+
+def _date(epoch: Optional[int]) -> str:
+    if epoch is None:
+        return "listed"
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="First-seen / last-seen dates of model ids")
+    parser.add_argument("--model", help="Show this model id")
+    parser.add_argument("--provider", help="Show every model of this provider")
+    parser.add_argument("--file", action="append",
+                        help="Config to track; repeatable (default %s)" % ", ".join(DEFAULT_FILES))
+    parser.add_argument("--rebuild", action="store_true", help="Read the whole history again")
+    parser.add_argument("--json", action="store_true", help="Emit JSON")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    index = ModelIndex(files=args.file or DEFAULT_FILES)
+    try:
+        index.update(rebuild=args.rebuild)
+    except RuntimeError as e:
+        logger.error("%s", e)
+        return 1
+
+    if args.model:
+        result: Any = index.lookup(args.model)
+    elif args.provider:
+        result = index.provider_models(args.provider)
+    else:
+        result = {
+            provider: {"listed": sum(1 for e in models.values() if e["count"]),
+                       "removed": sum(1 for e in models.values() if not e["count"])}
+            for provider, models in sorted(index.models.items())
+        }
+
+    if args.json:
+        sys.stdout.write(json.dumps(result, indent=2) + "\n")
+        return 0
+    if args.model or args.provider:
+        for name, entry in result.items():
+            sys.stdout.write("%-40s first seen %s  last seen %s\n" % (
+                name, _date(entry["first_seen"]), _date(entry["last_seen"])))
+        return 0
+    for provider, counts in result.items():
+        sys.stdout.write("%-16s %4d listed  %4d removed\n" % (provider, counts["listed"], counts["removed"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
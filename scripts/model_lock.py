@@ -0,0 +1,190 @@
+"""``models.lock.json``: per-provider hash, count and last-changed time.
+
+A small generated file next to the configs:
+
+    {
+      "version": 1,
+      "configs": {
+        "librechat-env-f.yaml": {"sha256": "<sha256 of the file>", "providers": ["groq", ...]}
+      },
+      "providers": {
+        "groq": {"sha256": "...", "count": 12, "last_changed": "2026-05-01T06:00:12+00:00"}
+      }
+    }
+
+``sha256`` is the same model-list hash the catalog artifact uses.
+``last_changed`` moves only when that hash does, so the lock answers "when
+did this provider's list last change" in O(providers), with no git
+history and no YAML parse. ``report_staleness.py`` reads it instead of
+running git blame, which also works on shallow clones.
+
+``configs`` records the config files the lock was written for and the
+providers each one lists. A config edited by other means (by hand,
+``catalog.py --render``) no longer matches its digest, and readers fall
+back to git for it (``lock_matches``).
+
+The update run refreshes the lock after every successful commit. The file
+is replaced atomically, and only when a provider's hash or the config set
+changed. When a provider first enters the lock, its ``last_changed`` is
+seeded from git blame so a new lock does not report everything as fresh.
+
+Usage (rebuild from the configs without fetching):
+    python model_lock.py
+
+Environment:
+    MODEL_LOCK_PATH  lock path (default ``models.lock.json`` in the repo root)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Optional
+
+from ruamel.yaml import YAML
+
+from catalog import REPO_ROOT, ProviderCatalog, config_paths, document_providers
+from catalog_export import models_hash
+from log_config import setup_logging
+from report_staleness import inspect_file
+from transaction import write_atomic
+from yaml_cache import load_yaml_cached
+
+logger = logging.getLogger(__name__)
+
+LOCK_VERSION = 1
+DEFAULT_LOCK_NAME = "models.lock.json"
+
+# config path -> names of the providers it lists
+ConfigProviders = Mapping[Path, Iterable[str]]
+
+
+def lock_path() -> Path:
+    return Path(os.environ.get("MODEL_LOCK_PATH", REPO_ROOT / DEFAULT_LOCK_NAME))
+
+
+def file_digest(path: Path) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def read_lock(path: Optional[Path] = None) -> Optional[dict[str, Any]]:
+    """The current lock, or None if missing or unreadable."""
+    path = Path(path) if path is not None else lock_path()
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != LOCK_VERSION:
+        return None
+    return data
+
+
+def lock_matches(lock: Mapping[str, Any], config_files: Iterable[Path]) -> bool:
+    """True if every file in ``config_files`` is recorded in ``lock`` unchanged."""
+    recorded = lock.get("configs") or {}
+    for path in config_files:
+        path = Path(path)
+        entry = recorded.get(path.name)
+        if entry is None or not path.exists() or file_digest(path) != entry.get("sha256"):
+            return False
+    return True
+
+
+def seed_last_changed(config_files: Iterable[Path], repo_root: Path = REPO_ROOT) -> dict[str, str]:
+    """Last commit time of each provider's block, from git blame (may be empty)."""
+    times: dict[str, int] = {}
+    for path in config_files:
+        try:
+            rel_path = str(Path(path).resolve().relative_to(Path(repo_root).resolve()))
+            result = inspect_file(Path(repo_root), rel_path)
+        except (ValueError, OSError) as e:
+            logger.info("Cannot blame %s: %s", path, e)
+            continue
+        for name, max_t in result["times"].items():
+            times[name] = max(times.get(name, 0), max_t)
+    return {
+        name: datetime.fromtimestamp(t, tz=timezone.utc).isoformat()
+        for name, t in times.items() if t
+    }
+
+
+def build_lock(
+    catalog: ProviderCatalog,
+    configs: ConfigProviders,
+    previous: Optional[Mapping[str, Any]] = None,
+    now: Optional[datetime] = None,
+    seed: Optional[Mapping[str, str]] = None,
+) -> dict[str, Any]:
+    """The lock for ``catalog`` as written to ``configs``.
+
+    A provider keeps its previous ``last_changed`` while its hash is
+    unchanged. A changed provider gets ``now``; a provider new to the lock
+    gets its ``seed`` time if there is one.
+    """
+    now_text = (now or datetime.now(timezone.utc)).isoformat(timespec="seconds")
+    previous_providers = (previous or {}).get("providers") or {}
+    seed = seed or {}
+    providers = {}
+    for name in sorted(catalog):
+        models = catalog.get(name)
+        digest = models_hash(models)
+        before = previous_providers.get(name)
+        if before is not None and before.get("sha256") == digest:
+            last_changed = before.get("last_changed")
+        elif before is None:
+            last_changed = seed.get(name, now_text)
+        else:
+            last_changed = now_text
+        providers[name] = {"sha256": digest, "count": len(models), "last_changed": last_changed}
+    return {
+        "version": LOCK_VERSION,
+        "configs": {
+            Path(path).name: {"sha256": file_digest(path), "providers": sorted(names)}
+            for path, names in sorted(configs.items()) if Path(path).exists()
+        },
+        "providers": providers,
+    }
+
+
+def write_lock(
+    catalog: ProviderCatalog,
+    configs: ConfigProviders,
+    path: Optional[Path] = None,
+    now: Optional[datetime] = None,
+    repo_root: Path = REPO_ROOT,
+) -> bool:
+    """Refresh the lock; returns True if the file was (re)written."""
+    path = Path(path) if path is not None else lock_path()
+    configs = {Path(p): list(names) for p, names in configs.items()}
+    previous = read_lock(path)
+    known = set((previous or {}).get("providers") or {})
+    seed = {}
+    if any(name not in known for name in catalog):
+        seed = seed_last_changed(configs, repo_root)
+    lock = build_lock(catalog, configs, previous, now, seed)
+    if lock == previous:
+        return False
+
+    text = json.dumps(lock, indent=2, sort_keys=True) + "\n"
+    write_atomic(path, text)
+    logger.info("Wrote %s (%d providers)", path.name, len(lock["providers"]))
+    return True
+
+
+def main() -> int:
+    setup_logging()
+    yaml = YAML()
+    documents = {path: load_yaml_cached(path, yaml) for path in config_paths() if path.exists()}
+    catalog = ProviderCatalog.from_documents(documents.values())
+    write_lock(catalog, {path: document_providers(doc) for path, doc in documents.items()})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
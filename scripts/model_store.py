@@ -0,0 +1,93 @@
+"""One shared, immutable model list per provider.
+
+During an update every config gets the same model list for a provider.
+``ModelListStore.share`` turns a fetched list into a ``FrozenModelList``:
+a read-only list of ``sys.intern``-ed ids, deduplicated by content, so every
+document (and the catalog) references the same object instead of holding
+its own ``CommentedSeq`` full of equal strings. Assigning it in
+``update_yaml_models`` is a reference store, and because it cannot be
+mutated no document can change another one's list by accident.
+
+Importing this module registers a round-trip representer for
+``FrozenModelList``, so it dumps exactly like a plain list (block style,
+same quoting) from any ``YAML()`` instance. Two providers with equal lists
+hold the same object, so the representer also never anchors it: each
+provider still gets its own block list instead of ``&id001`` / ``*id001``.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Iterable, Optional
+
+from ruamel.yaml.representer import RoundTripRepresenter
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError("FrozenModelList is shared between documents and cannot be modified")
+
+
+class FrozenModelList(list):
+    """Read-only model ids; equal to (and dumps like) an ordinary list.
+
+    A ``list`` rather than a ``tuple`` so that it compares equal to the
+    plain lists callers and tests use.
+    """
+
+    __slots__ = ()
+
+    append = extend = insert = remove = pop = clear = sort = reverse = _read_only
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+
+    def __reduce__(self):
+        return (FrozenModelList, (list(self),))
+
+
+def _represent_frozen_model_list(representer, data):
+    return representer.represent_sequence("tag:yaml.org,2002:seq", data)
+
+
+RoundTripRepresenter.add_representer(FrozenModelList, _represent_frozen_model_list)
+
+_ignore_aliases = RoundTripRepresenter.ignore_aliases
+
+
+def _ignore_model_list_aliases(representer, data):
+    return isinstance(data, FrozenModelList) or _ignore_aliases(representer, data)
+
+
+RoundTripRepresenter.ignore_aliases = _ignore_model_list_aliases
+
+
+def freeze_models(models: Iterable) -> FrozenModelList:
+    """Intern each id (as a plain ``str``) and freeze the list."""
+    if isinstance(models, FrozenModelList):
+        return models
+    return FrozenModelList([sys.intern(str(model)) for model in models])
+
+
+class ModelListStore:
+    """Provider name -> the single shared FrozenModelList for it."""
+
+    def __init__(self):
+        self._by_content: dict[tuple[str, ...], FrozenModelList] = {}
+        self._by_provider: dict[str, FrozenModelList] = {}
+
+    def share(self, provider: str, models: Iterable) -> FrozenModelList:
+        """Return the shared list for ``provider`` holding ``models``.
+
+        Equal lists, even of different providers, are the same object.
+        """
+        frozen = freeze_models(models)
+        shared = self._by_content.setdefault(tuple(frozen), frozen)
+        self._by_provider[provider] = shared
+        return shared
+
+    def get(self, provider: str) -> Optional[FrozenModelList]:
+        return self._by_provider.get(provider)
+
+    def __contains__(self, provider: str) -> bool:
+        return provider in self._by_provider
+
+    def __len__(self) -> int:
+        return len(self._by_provider)
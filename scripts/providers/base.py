@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
@@ -33,6 +34,8 @@ class FetchResult:
     error_message: Optional[str] = None
     model_count: int = 0
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    duration_s: float = 0.0     # wall time of fetch + post_process (set by run())
+    response_bytes: int = 0     # body bytes received through _http_get
 
     def __post_init__(self):
         self.model_count = len(self.models)
@@ -84,19 +87,23 @@ class BaseFetcher(ABC):
 
     def run(self) -> FetchResult:
         """Template method: orchestrates fetch + post_process with error handling."""
+        self._response_bytes = 0
+        started = time.perf_counter()
         try:
             result = self.fetch_models()
             if result.status == FetchStatus.SUCCESS and result.models:
                 result.models = self.post_process(result.models)
                 result.model_count = len(result.models)
-            return result
         except Exception as e:
-            return FetchResult(
+            result = FetchResult(
                 provider_name=self.provider_name,
                 models=[],
                 status=FetchStatus.NETWORK_ERROR,
                 error_message=str(e),
             )
+        result.duration_s = time.perf_counter() - started
+        result.response_bytes = self._response_bytes
+        return result
 
     def _http_get(
         self,
@@ -130,7 +137,9 @@ class BaseFetcher(ABC):
             response.raise_for_status()
             return response
 
-        return _do_get()
+        response = _do_get()
+        self._response_bytes = getattr(self, "_response_bytes", 0) + len(response.content)
+        return response
 
 
 def get_registry() -> dict[str, type[BaseFetcher]]:
@@ -18,33 +18,70 @@ In all three cases the model list is wrong but the daily pipeline is happy.
 This script surfaces those by reporting providers whose `models.default` block
 hasn't seen a commit in `--weeks` (default 4).
 
-It is a *report*, not a gate: exit code is always 0. The weekly workflow
-turns the JSON output into a tracking issue (see staleness-report.yml).
+It is a *report*, not a gate: exit code is 0 (only `--source lock`
+without a usable lockfile exits 1). The weekly workflow turns the JSON output into a tracking issue (see staleness-report.yml).
 
 ────────────────────────────────────────────────────────────────────────────────
 HOW IT WORKS
 ────────────────────────────────────────────────────────────────────────────────
-1. Round-trip-parse the YAML with ruamel.yaml. ruamel preserves source line
-   numbers on every node via `.lc.item(i)`, which PyYAML does not. We use
-   that to find the exact `(start_line, end_line)` range of each provider's
-   `endpoints.custom[*].models.default` list.
-2. For each range, run `git blame --porcelain -L start,end <file>` and take
-   the maximum `committer-time` epoch across the blamed lines. That's the
-   most recent commit that touched the model list.
+1. Find the exact `(start_line, end_line)` range of each provider's
+   `endpoints.custom[*].models.default` list with `yaml_scanner`, a line
+   scanner over the memory-mapped file. YAML it does not model (anchors,
+   tags, …) falls back to a ruamel.yaml round-trip parse, which keeps
+   source line numbers on every node via `.lc.item(i)`; that parse goes
+   through `yaml_cache`, so an unchanged file is not parsed again.
+2. Run a single `git blame --porcelain` with one `-L start,end` per range,
+   so the history is walked once for all providers, and map every blamed
+   line to its commit's `committer-time`. The maximum over a provider's
+   range is the most recent commit that touched its model list. Line
+   times are kept in `blame_cache` keyed by blob and HEAD, so an unchanged
+   file is not blamed again and after new commits only changed hunks are.
 3. Compare against the threshold `now - weeks` and bucket each provider as
    `stale`, `fresh`, or `blame_failed` (the last bucket exists so partial
-   reports look partial — see "blame failures" below).
+   reports look partial — see "blame failures" below). Without `--weeks`,
+   each provider tuned in `staleness_thresholds.json` is judged by its
+   own `weeks` (see staleness_thresholds.py); the report then lists them
+   under `provider_weeks` and every stale entry has its `threshold_weeks`.
 
 ────────────────────────────────────────────────────────────────────────────────
-SINGLE-FILE SCOPE
+FILE SCOPE
 ────────────────────────────────────────────────────────────────────────────────
 By default we only inspect `librechat-env-f.yaml`. The five YAML files in
 this repo are kept structurally equivalent by `update_models.py`, so the
-staleness signal for any one of them generalizes to all of them. Running
-across all five would just produce five copies of the same list.
+staleness signal for any one of them generalizes to all of them.
 
-If a future provider lands in only some of the files (intentionally), bump
-`--file` on the workflow or run the script multiple times locally.
+To check several files (e.g. a provider that intentionally lands in only
+some of them), repeat `--file` or pass a glob. Each file is parsed and
+blamed in its own worker process, so five files take about as long as one.
+The report then has a `files` object with each file's own buckets, and
+the top-level `stale` / `fresh` / `blame_failed` buckets aggregate them:
+a provider's last change is the latest across the files that list it,
+and it only counts as `blame_failed` if no file could be blamed.
+
+────────────────────────────────────────────────────────────────────────────────
+LOCKFILE
+────────────────────────────────────────────────────────────────────────────────
+`update_models.py` keeps `models.lock.json` next to the configs with each
+provider's model-list hash and the time that hash last changed (see
+model_lock.py). When the lock records every requested file with its
+current content, the report is answered from it: no YAML parse, no git,
+O(providers), and it works on shallow clones. A file edited since the
+lock was written (its digest no longer matches) makes the whole report
+fall back to git blame. `--source lock` / `--source git` force either
+path; a stderr note says when the lock answered. The report has the same
+shape either way. With `--repo-root`, the lock is that repository's own
+`models.lock.json`.
+
+────────────────────────────────────────────────────────────────────────────────
+SHARDS
+────────────────────────────────────────────────────────────────────────────────
+With the per-provider shards enabled (`models/`, see shards.py), a
+provider's last change is read from its shard instead: a blame of a
+file of a few hundred lines that only changes with that provider. Only
+commits after the shard was added count — before that the list lived in
+the configs alone — so a provider whose shard has not changed since it
+was added, or has no usable shard, is still blamed in the configs. A
+stderr note says how many providers the shards answered.
 
 ────────────────────────────────────────────────────────────────────────────────
 BLAME FAILURES
@@ -58,7 +95,8 @@ tell coverage was incomplete.
 ────────────────────────────────────────────────────────────────────────────────
 USAGE
 ────────────────────────────────────────────────────────────────────────────────
-    # default: human-readable, 4-week threshold, env-f file
+    # default: human-readable, tuned per-provider thresholds (4 weeks
+    # for untuned providers), env-f file
     python scripts/report_staleness.py
 
     # JSON output (workflow consumes this)
@@ -66,35 +104,64 @@ USAGE
 
     # different threshold / different file
     python scripts/report_staleness.py --weeks 6 --file librechat-env-l.yaml
+
+    # every config, one merged report
+    python scripts/report_staleness.py --file 'librechat-*.yaml' --json
+
+    # ignore the lockfile and blame the history
+    python scripts/report_staleness.py --source git
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import os
+import re
 import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 from ruamel.yaml import YAML
 
+from blame_cache import BlameCache, cache_enabled as blame_cache_enabled
+from git_utils import git
+from staleness_thresholds import Thresholds
+from yaml_cache import load_yaml_cached
+from yaml_scanner import scan_provider_ranges
+
 
+REPO_ROOT = Path(__file__).resolve().parent.parent
 DEFAULT_WEEKS = 4
 DEFAULT_FILE = "librechat-env-f.yaml"
+SOURCES = ("auto", "lock", "git")
+
+# "<sha> <orig-line> <final-line>[ <group-size>]" opens each porcelain record.
+_PORCELAIN_HEADER = re.compile(r"^([0-9a-f]{40}) \d+ (\d+)(?: \d+)?$")
 
 
 def find_provider_ranges(file_path: Path) -> dict[str, tuple[int, int]]:
     """Return {provider_name: (start_line, end_line)} for each
     endpoints.custom[*].models.default block, 1-based inclusive.
 
-    Uses ruamel's round-trip parser so that every loaded sequence node
-    carries `.lc.item(i)` line/column metadata. Without that we'd have no
-    way to ask git blame about the right line range.
+    Scans the lines with `yaml_scanner`; files it cannot model go through
+    `parse_provider_ranges` instead.
     """
-    yaml = YAML(typ="rt")
-    with file_path.open("r", encoding="utf-8") as f:
-        data = yaml.load(f)
+    ranges = scan_provider_ranges(file_path)
+    if ranges is None:
+        ranges = parse_provider_ranges(file_path)
+    return ranges
+
+
+def parse_provider_ranges(file_path: Path) -> dict[str, tuple[int, int]]:
+    """`find_provider_ranges` through ruamel's round-trip parser.
+
+    Every loaded sequence node carries `.lc.item(i)` line/column metadata,
+    which is what ties a list back to the lines git blame needs.
+    """
+    data = load_yaml_cached(file_path, YAML(typ="rt"))
 
     if not isinstance(data, dict):
         return {}
@@ -122,103 +189,363 @@ def find_provider_ranges(file_path: Path) -> dict[str, tuple[int, int]]:
     return ranges
 
 
-def blame_max_committer_time(repo_root: Path, rel_path: str, start: int, end: int) -> int:
-    """Run `git blame --porcelain -L start,end` and return the maximum
-    committer-time epoch seconds across the blamed lines.
+def parse_porcelain(output: str) -> dict[int, int]:
+    """Map each final line number in `git blame --porcelain` output to the
+    committer-time of the commit that last touched it.
 
-    Returns 0 on any failure (non-zero exit, missing git, parse error). The
-    caller treats 0 as "blame failed" rather than "epoch zero" — no commit
-    in this repo has a 1970 timestamp.
+    Porcelain prints a commit's headers (`committer-time` among them) only
+    the first time the commit appears, so times are looked up by SHA.
     """
-    result = subprocess.run(
-        ["git", "-C", str(repo_root), "blame", "--porcelain",
-         "-L", f"{start},{end}", rel_path],
-        capture_output=True, text=True, check=False,
-    )
-    if result.returncode != 0:
-        return 0
-    max_t = 0
-    for line in result.stdout.splitlines():
-        if line.startswith("committer-time "):
+    commit_times: dict[str, int] = {}
+    line_commits: dict[int, str] = {}
+    sha = None
+    for line in output.splitlines():
+        if line.startswith("\t"):
+            continue
+        header = _PORCELAIN_HEADER.match(line)
+        if header:
+            sha = header.group(1)
+            line_commits[int(header.group(2))] = sha
+        elif line.startswith("committer-time ") and sha is not None:
             try:
-                t = int(line.split(" ", 1)[1])
+                commit_times[sha] = int(line.split(" ", 1)[1])
             except (ValueError, IndexError):
                 continue
-            if t > max_t:
-                max_t = t
-    return max_t
+    return {
+        number: commit_times[sha]
+        for number, sha in line_commits.items()
+        if sha in commit_times
+    }
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument("--weeks", type=int, default=DEFAULT_WEEKS,
-                        help=f"Stale threshold in weeks (default {DEFAULT_WEEKS})")
-    parser.add_argument("--file", type=str, default=DEFAULT_FILE,
-                        help=f"YAML file to inspect (default {DEFAULT_FILE})")
-    parser.add_argument("--json", action="store_true",
-                        help="Emit machine-readable JSON instead of human text")
-    args = parser.parse_args()
+def blame_line_times(repo_root: Path, rel_path: str,
+                     ranges: list[tuple[int, int]]) -> dict[int, int]:
+    """Blame every line range of `rel_path` in one `git blame` run.
+
+    Returns {line_number: committer-time}; empty on any failure
+    (non-zero exit, missing git).
+    """
+    if not ranges:
+        return {}
+    args = ["git", "-C", str(repo_root), "blame", "--porcelain"]
+    for start, end in sorted(ranges):
+        args += ["-L", f"{start},{end}"]
+    try:
+        result = subprocess.run(args + ["--", rel_path],
+                                capture_output=True, text=True, check=False)
+    except OSError:
+        return {}
+    if result.returncode != 0:
+        return {}
+    return parse_porcelain(result.stdout)
+
+
+def cached_blame_line_times(repo_root: Path, rel_path: str,
+                            ranges: list[tuple[int, int]]) -> dict[int, int]:
+    """`blame_line_times` through the blame cache (unless BLAME_CACHE=0)."""
+    if not blame_cache_enabled():
+        return blame_line_times(repo_root, rel_path, ranges)
+    return BlameCache(repo_root, blame_line_times).line_times(rel_path, ranges)
+
+
+def range_max_times(line_times: dict[int, int],
+                    ranges: dict[str, tuple[int, int]]) -> dict[str, int]:
+    """Return {provider: max committer-time over its lines}; 0 when no
+    line of the range was blamed. The caller treats 0 as "blame failed"
+    rather than "epoch zero" — no commit in this repo has a 1970
+    timestamp.
+    """
+    return {
+        name: max((line_times.get(n, 0) for n in range(start, end + 1)), default=0)
+        for name, (start, end) in ranges.items()
+    }
 
-    repo_root = Path(__file__).resolve().parent.parent
-    yaml_path = repo_root / args.file
-    if not yaml_path.exists():
-        print(f"missing: {yaml_path}", file=sys.stderr)
-        return 0
 
+def blame_max_committer_time(repo_root: Path, rel_path: str, start: int, end: int) -> int:
+    """Maximum committer-time epoch across lines start..end, 0 on failure."""
+    line_times = blame_line_times(repo_root, rel_path, [(start, end)])
+    return range_max_times(line_times, {"": (start, end)})[""]
+
+
+def resolve_files(repo_root: Path, patterns: list[str]) -> list[str]:
+    """Expand `--file` values (names or globs relative to the repo root)
+    into sorted, de-duplicated relative paths. A name that matches nothing
+    is kept, so the caller can report it as missing."""
+    files: list[str] = []
+    for pattern in patterns:
+        matches = sorted(repo_root.glob(pattern)) if any(c in pattern for c in "*?[") else []
+        if matches:
+            files.extend(str(p.relative_to(repo_root)) for p in matches if p.is_file())
+        else:
+            files.append(pattern)
+    return list(dict.fromkeys(files))
+
+
+def inspect_file(repo_root: Path, rel_path: str,
+                 answered: dict[str, int] | None = None) -> dict:
+    """Range discovery plus blame for one file.
+
+    Providers in `answered` ({provider: committer-time}, from the shards)
+    take that time and are not blamed.
+
+    Returns {"ranges": {provider: (start, end)}, "times": {provider:
+    max committer-time}}; `ranges` is None when the file is missing.
+    Top-level so it can run in a worker process.
+    """
+    yaml_path = repo_root / rel_path
+    if not yaml_path.exists():
+        return {"ranges": None, "times": {}}
     ranges = find_provider_ranges(yaml_path)
     if not ranges:
-        print("no providers with models.default found", file=sys.stderr)
-        return 0
+        return {"ranges": {}, "times": {}}
+    answered = answered or {}
+    times = {name: answered[name] for name in ranges if name in answered}
+    blamed = {name: rng for name, rng in ranges.items() if name not in answered}
+    if blamed:
+        line_times = cached_blame_line_times(repo_root, rel_path, list(blamed.values()))
+        times.update(range_max_times(line_times, blamed))
+    return {"ranges": ranges, "times": times}
+
+
+def shard_times(repo_root: Path, directory: Path) -> dict[str, int]:
+    """{provider: max committer-time} answered by the shards in `directory`.
+
+    A provider is left out when its shard is not in the repository, not
+    laid out as shards.py writes it, or unchanged since the commit that
+    added it (its history before that is in the configs).
+    """
+    # shards imports catalog, which imports this module
+    from shards import SHARD_SUFFIX, shard_item_range
+
+    repo_root = Path(repo_root).resolve()
+    times: dict[str, int] = {}
+    for path in sorted(Path(directory).glob("*" + SHARD_SUFFIX)):
+        try:
+            rel = str(path.resolve().relative_to(repo_root))
+        except ValueError:
+            continue
+        item_range = shard_item_range(path)
+        if item_range is None:
+            continue
+        name, start, end = item_range
+        added = (git(repo_root, "log", "-1", "--diff-filter=A", "--format=%ct", "--", rel) or "").strip()
+        if not added:
+            continue
+        line_times = cached_blame_line_times(repo_root, rel, [(start, end)])
+        max_t = range_max_times(line_times, {name: (start, end)})[name]
+        if max_t > int(added):
+            times[name] = max_t
+    return times
+
 
-    now = datetime.now(timezone.utc)
-    threshold_epoch = int((now - timedelta(weeks=args.weeks)).timestamp())
-    rel = str(yaml_path.relative_to(repo_root))
+def classify(times: dict[str, int], now: datetime, weeks: int,
+             provider_weeks: dict[str, int] | None = None) -> dict:
+    """Bucket {provider: max committer-time} into stale / fresh / blame_failed.
 
+    `provider_weeks` overrides `weeks` for the providers it lists; stale
+    entries then carry the `threshold_weeks` they were judged by.
+    """
     stale: list[dict] = []
     fresh: list[str] = []
     blame_failed: list[str] = []
-
-    for name, (start, end) in sorted(ranges.items()):
-        max_t = blame_max_committer_time(repo_root, rel, start, end)
+    for name, max_t in sorted(times.items()):
         if max_t == 0:
             # Distinct from "old" — git blame returned no usable data.
             # Surface it instead of silently dropping the provider, so a
             # broken blame setup doesn't disguise itself as 100% fresh.
             blame_failed.append(name)
-            print(f"warning: git blame failed for provider {name!r} "
-                  f"(lines {start}-{end} of {rel})", file=sys.stderr)
             continue
         when = datetime.fromtimestamp(max_t, tz=timezone.utc)
-        days = (now - when).days
-        if max_t < threshold_epoch:
-            stale.append({
+        provider_threshold = (provider_weeks or {}).get(name, weeks)
+        if when < now - timedelta(weeks=provider_threshold):
+            entry = {
                 "provider": name,
                 "last_changed": when.isoformat(),
-                "days_stale": days,
-            })
+                "days_stale": (now - when).days,
+            }
+            if provider_weeks is not None:
+                entry["threshold_weeks"] = provider_threshold
+            stale.append(entry)
         else:
             fresh.append(name)
-
     stale.sort(key=lambda x: x["days_stale"], reverse=True)
+    return {"stale": stale, "fresh": fresh, "blame_failed": blame_failed}
+
+
+def build_report(repo_root: Path, files: list[str], weeks: int,
+                 now: datetime | None = None,
+                 max_workers: int | None = None,
+                 provider_weeks: dict[str, int] | None = None,
+                 answered: dict[str, int] | None = None) -> dict:
+    """Inspect `files` (in parallel when there are several) and merge them
+    into one report; see FILE SCOPE above for the shape. Providers in
+    `answered` (see `shard_times`) are not blamed."""
+    now = now or datetime.now(timezone.utc)
+    if len(files) > 1:
+        workers = max_workers or min(len(files), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(inspect_file, [repo_root] * len(files), files,
+                                    [answered] * len(files)))
+    else:
+        results = [inspect_file(repo_root, rel, answered) for rel in files]
+
+    merged: dict[str, int] = {}
+    per_file: dict[str, dict] = {}
+    for rel, result in zip(files, results):
+        ranges = result["ranges"]
+        if ranges is None:
+            print(f"missing: {repo_root / rel}", file=sys.stderr)
+            continue
+        if not ranges:
+            print(f"no providers with models.default found in {rel}", file=sys.stderr)
+        for name, max_t in result["times"].items():
+            if max_t == 0:
+                start, end = ranges[name]
+                print(f"warning: git blame failed for provider {name!r} "
+                      f"(lines {start}-{end} of {rel})", file=sys.stderr)
+            merged[name] = max(merged.get(name, 0), max_t)
+        per_file[rel] = classify(result["times"], now, weeks, provider_weeks)
+
+    return _report(files, weeks, now, merged, per_file, provider_weeks)
 
+
+def _report(files: list[str], weeks: int, now: datetime, merged: dict[str, int],
+            per_file: dict[str, dict], provider_weeks: dict[str, int] | None) -> dict:
     report = {
-        "file": args.file,
-        "threshold_weeks": args.weeks,
+        "file": ", ".join(files),
+        "threshold_weeks": weeks,
         "generated_at": now.isoformat(),
-        "stale": stale,
-        "fresh": fresh,
-        "blame_failed": blame_failed,
+        **classify(merged, now, weeks, provider_weeks),
     }
+    if provider_weeks is not None:
+        report["provider_weeks"] = provider_weeks
+    if len(files) > 1:
+        report["files"] = per_file
+    return report
+
+
+def lock_times(lock: dict, files: list[str]) -> dict[str, dict[str, int]]:
+    """{file: {provider: last-changed epoch}} from a models.lock.json.
+
+    A provider without a recorded time maps to 0, which `classify` puts
+    in `blame_failed` like a failed blame.
+    """
+    providers = lock.get("providers") or {}
+    times: dict[str, dict[str, int]] = {}
+    for rel in files:
+        entry = (lock.get("configs") or {}).get(Path(rel).name) or {}
+        file_times = {}
+        for name in entry.get("providers", []):
+            last_changed = (providers.get(name) or {}).get("last_changed")
+            try:
+                file_times[name] = int(datetime.fromisoformat(last_changed).timestamp())
+            except (TypeError, ValueError):
+                file_times[name] = 0
+        times[rel] = file_times
+    return times
+
+
+def build_lock_report(repo_root: Path, files: list[str], weeks: int, lock: dict,
+                      now: datetime | None = None,
+                      provider_weeks: dict[str, int] | None = None) -> dict:
+    """Same report as `build_report`, answered from the lockfile."""
+    now = now or datetime.now(timezone.utc)
+    merged: dict[str, int] = {}
+    per_file: dict[str, dict] = {}
+    for rel, times in lock_times(lock, files).items():
+        if not (repo_root / rel).exists():
+            print(f"missing: {repo_root / rel}", file=sys.stderr)
+            continue
+        for name, max_t in times.items():
+            merged[name] = max(merged.get(name, 0), max_t)
+        per_file[rel] = classify(times, now, weeks, provider_weeks)
+    return _report(files, weeks, now, merged, per_file, provider_weeks)
+
+
+def usable_lock(repo_root: Path, files: list[str]) -> dict | None:
+    """The lockfile of `repo_root`, if it records every file in `files` as it is now.
+
+    This repository's lock is wherever `MODEL_LOCK_PATH` puts it; any other
+    repository (`--repo-root`) is read from its own `models.lock.json`.
+    """
+    # model_lock imports this module
+    from model_lock import DEFAULT_LOCK_NAME, lock_matches, lock_path, read_lock
+
+    repo_root = Path(repo_root)
+    if repo_root.resolve() == REPO_ROOT:
+        path = lock_path()
+    else:
+        path = repo_root / DEFAULT_LOCK_NAME
+    lock = read_lock(path)
+    if lock is None or not lock_matches(lock, [repo_root / rel for rel in files]):
+        return None
+    return lock
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--weeks", type=int, default=None,
+                        help="Stale threshold in weeks for every provider (default: the tuned "
+                             f"per-provider thresholds, {DEFAULT_WEEKS} for the others)")
+    parser.add_argument("--file", type=str, action="append",
+                        help=f"YAML file or glob to inspect; repeatable (default {DEFAULT_FILE})")
+    parser.add_argument("--json", action="store_true",
+                        help="Emit machine-readable JSON instead of human text")
+    parser.add_argument("--source", choices=SOURCES, default="auto",
+                        help="Answer from models.lock.json, git blame, or the lock "
+                             "when it matches the files (default auto)")
+    parser.add_argument("--repo-root", type=Path, default=REPO_ROOT,
+                        help="Repository to inspect (default: this one), e.g. a "
+                             "synthetic_history.py repository")
+    args = parser.parse_args()
+
+    repo_root = args.repo_root.resolve()
+    files = resolve_files(repo_root, args.file or [DEFAULT_FILE])
+    lock = usable_lock(repo_root, files) if args.source != "git" else None
+    if args.source == "lock" and lock is None:
+        print("models.lock.json is missing or does not match the requested files",
+              file=sys.stderr)
+        return 1
+    weeks = args.weeks if args.weeks is not None else DEFAULT_WEEKS
+    provider_weeks = None
+    if args.weeks is None:
+        thresholds = Thresholds.load()
+        if thresholds:
+            provider_weeks = thresholds.tuned_weeks()
+    if lock is not None:
+        print("answered from models.lock.json", file=sys.stderr)
+        report = build_lock_report(repo_root, files, weeks, lock, provider_weeks=provider_weeks)
+    else:
+        from shards import shard_dir, shards_enabled  # see shard_times
+
+        directory = shard_dir() if repo_root == REPO_ROOT else repo_root / "models"
+        answered = shard_times(repo_root, directory) if shards_enabled(directory) else None
+        if answered:
+            print(f"answered {len(answered)} provider(s) from the shards in {directory}",
+                  file=sys.stderr)
+        report = build_report(repo_root, files, weeks, provider_weeks=provider_weeks,
+                              answered=answered)
+    stale, fresh, blame_failed = report["stale"], report["fresh"], report["blame_failed"]
+    if not (stale or fresh or blame_failed):
+        return 0
 
     if args.json:
         print(json.dumps(report, indent=2))
     else:
+        window = f"{weeks} weeks" if provider_weeks is None else \
+            f"their tuned threshold, {weeks} weeks for the others"
         if stale:
-            print(f"Stale providers (no model-list change in > {args.weeks} weeks) in {args.file}:")
+            print(f"Stale providers (no model-list change in > {window}) in {report['file']}:")
             for s in stale:
-                print(f"  - {s['provider']}: last changed {s['last_changed']} ({s['days_stale']} days ago)")
+                threshold = f", threshold {s['threshold_weeks']} weeks" if "threshold_weeks" in s else ""
+                print(f"  - {s['provider']}: last changed {s['last_changed']} "
+                      f"({s['days_stale']} days ago{threshold})")
         else:
-            print(f"All {len(fresh)} providers fresh (changed within {args.weeks} weeks).")
+            print(f"All {len(fresh)} providers fresh (changed within {window}).")
+        for rel, buckets in report.get("files", {}).items():
+            print(f"  {rel}: {len(buckets['stale'])} stale, {len(buckets['fresh'])} fresh, "
+                  f"{len(buckets['blame_failed'])} blame failed")
         if blame_failed:
             print(f"\nBlame failed for {len(blame_failed)} provider(s): "
                   f"{', '.join(blame_failed)}")
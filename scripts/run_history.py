@@ -0,0 +1,296 @@
+"""SQLite history of every fetch, for questions git cannot answer cheaply.
+
+Each ``update_models`` run records one row per provider: status, the
+model list (as the same SHA-256 the catalog artifact uses, with the ids
+stored once per distinct list), the fetch's wall time and response size.
+That is what the provider *returned*, including runs whose result was
+never committed (stale, failed validation, dry runs).
+
+Staleness, churn and failure streaks become indexed queries:
+
+    history = RunHistory()
+    history.last_change("groq")      # when the current list first appeared
+    history.failure_streak("groq")   # failed fetches since the last success
+    history.changes("groq")          # every point where the list changed
+
+Schema:
+
+    runs              id, started_at, finished_at, dry_run
+    model_lists       id, sha256 (unique), model_count, models (JSON)
+    provider_results  id, run_id, provider, fetched_at, status,
+                      model_list_id, model_count, duration_s,
+                      response_bytes, error
+                      indexes: (provider, fetched_at), (fetched_at), (run_id)
+
+Usage:
+    python run_history.py                 # one line per provider
+    python run_history.py --provider groq --json
+    python run_history.py --markdown      # table for a CI job summary
+
+The database is not committed. ``update-models.yml`` restores it from the
+Actions cache before the update, saves it again afterwards, and appends
+the ``--markdown`` table (fetch times, response sizes, failure streaks)
+to the job summary.
+
+Environment:
+    RUN_HISTORY_DB  database path (default ``scripts/.cache/run_history.sqlite3``)
+    RUN_HISTORY=0   do not record
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+from catalog_export import models_hash
+from log_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent / ".cache" / "run_history.sqlite3"
+SCHEMA_VERSION = 1
+SUCCESS = "success"
+FAILURE_STREAK_ALERT = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    dry_run INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS model_lists (
+    id INTEGER PRIMARY KEY,
+    sha256 TEXT NOT NULL UNIQUE,
+    model_count INTEGER NOT NULL,
+    models TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS provider_results (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    provider TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    status TEXT NOT NULL,
+    model_list_id INTEGER REFERENCES model_lists(id),
+    model_count INTEGER NOT NULL,
+    duration_s REAL,
+    response_bytes INTEGER,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS provider_results_provider_time
+    ON provider_results(provider, fetched_at);
+CREATE INDEX IF NOT EXISTS provider_results_time ON provider_results(fetched_at);
+CREATE INDEX IF NOT EXISTS provider_results_run ON provider_results(run_id);
+"""
+
+
+def history_path() -> Path:
+    return Path(os.environ.get("RUN_HISTORY_DB", DEFAULT_DB_PATH))
+
+
+def history_enabled() -> bool:
+    return os.environ.get("RUN_HISTORY", "1").lower() not in ("0", "false", "no")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class RunHistory:
+    """The run-history database; see the module docstring."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path is not None else history_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            self._conn.close()
+            raise ValueError("%s has schema version %d, newer than %d"
+                             % (self.path, version, SCHEMA_VERSION))
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+            self._conn.execute("PRAGMA user_version = %d" % SCHEMA_VERSION)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "RunHistory":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # -- recording ---------------------------------------------------------
+
+    def start_run(self, dry_run: bool = False) -> int:
+        with self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (started_at, dry_run) VALUES (?, ?)", (_now(), int(dry_run)))
+        return cursor.lastrowid
+
+    def finish_run(self, run_id: int) -> None:
+        with self._conn:
+            self._conn.execute("UPDATE runs SET finished_at = ? WHERE id = ?", (_now(), run_id))
+
+    def _model_list_id(self, models: list[str]) -> int:
+        digest = models_hash(models)
+        row = self._conn.execute("SELECT id FROM model_lists WHERE sha256 = ?", (digest,)).fetchone()
+        if row is not None:
+            return row[0]
+        cursor = self._conn.execute(
+            "INSERT INTO model_lists (sha256, model_count, models) VALUES (?, ?, ?)",
+            (digest, len(models), json.dumps(models)))
+        return cursor.lastrowid
+
+    def record(self, run_id: int, result: Any) -> None:
+        """Store one ``FetchResult``."""
+        models = [str(m) for m in result.models]
+        with self._conn:
+            list_id = self._model_list_id(models) if models else None
+            self._conn.execute(
+                "INSERT INTO provider_results (run_id, provider, fetched_at, status,"
+                " model_list_id, model_count, duration_s, response_bytes, error)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, result.provider_name, result.timestamp.isoformat(),
+                 result.status.value, list_id, len(models),
+                 getattr(result, "duration_s", None), getattr(result, "response_bytes", None),
+                 result.error_message))
+
+    # -- queries -----------------------------------------------------------
+
+    def providers(self) -> list[str]:
+        rows = self._conn.execute("SELECT DISTINCT provider FROM provider_results ORDER BY provider")
+        return [row[0] for row in rows]
+
+    def changes(self, provider: str) -> list[dict[str, Any]]:
+        """Every successful fetch whose list differs from the previous one."""
+        rows = self._conn.execute(
+            """
+            SELECT fetched_at, sha256, model_count FROM (
+                SELECT r.fetched_at, l.sha256, r.model_count, r.model_list_id,
+                       LAG(r.model_list_id) OVER (ORDER BY r.fetched_at, r.id) AS previous
+                FROM provider_results r JOIN model_lists l ON l.id = r.model_list_id
+                WHERE r.provider = ? AND r.status = ?
+            )
+            WHERE previous IS NULL OR previous != model_list_id
+            ORDER BY fetched_at
+            """, (provider, SUCCESS))
+        return [{"fetched_at": t, "sha256": h, "model_count": n} for t, h, n in rows]
+
+    def last_change(self, provider: str) -> Optional[str]:
+        """When the provider's current list was first returned, or None."""
+        changes = self.changes(provider)
+        return changes[-1]["fetched_at"] if changes else None
+
+    def failure_streak(self, provider: str) -> int:
+        """Number of failed fetches since the provider's last success."""
+        row = self._conn.execute(
+            """
+            SELECT COUNT(*) FROM provider_results
+            WHERE provider = ? AND status != ? AND fetched_at > COALESCE(
+                (SELECT MAX(fetched_at) FROM provider_results
+                 WHERE provider = ? AND status = ?), '')
+            """, (provider, SUCCESS, provider, SUCCESS)).fetchone()
+        return row[0]
+
+    def summary(self, provider: str) -> dict[str, Any]:
+        latest = self._conn.execute(
+            "SELECT fetched_at, status, model_count, duration_s, response_bytes"
+            " FROM provider_results WHERE provider = ? ORDER BY fetched_at DESC, id DESC LIMIT 1",
+            (provider,)).fetchone()
+        fetched_at, status, count, duration, size = latest or (None,) * 5
+        return {
+            "provider": provider,
+            "last_fetch": fetched_at,
+            "last_status": status,
+            "model_count": count,
+            "duration_s": duration,
+            "response_bytes": size,
+            "last_change": self.last_change(provider),
+            "failure_streak": self.failure_streak(provider),
+        }
+
+
+def open_history(dry_run: bool = False) -> Optional[tuple[RunHistory, int]]:
+    """Open the database and start a run; None if disabled or unavailable."""
+    if not history_enabled():
+        return None
+    try:
+        history = RunHistory()
+        return history, history.start_run(dry_run)
+    except (OSError, sqlite3.Error, ValueError) as e:
+        logger.warning("Run history unavailable: %s", e)
+        return None
+
+
+def _size(response_bytes: Optional[int]) -> str:
+    if response_bytes is None:
+        return "-"
+    if response_bytes < 1024:
+        return "%d B" % response_bytes
+    return "%.1f KiB" % (response_bytes / 1024)
+
+
+def _seconds(duration_s: Optional[float]) -> str:
+    return "-" if duration_s is None else "%.2fs" % duration_s
+
+
+def render_markdown(summaries: list[dict[str, Any]]) -> str:
+    """A Markdown table of ``summaries``, slowest fetch first."""
+    lines = [
+        "### Provider fetches",
+        "",
+        "| Provider | Status | Models | Fetch time | Response | Failures in a row | Last change |",
+        "|---|---|--:|--:|--:|--:|---|",
+    ]
+    for s in sorted(summaries, key=lambda s: -(s["duration_s"] or 0)):
+        lines.append("| %s | %s | %s | %s | %s | %d | %s |" % (
+            s["provider"], s["last_status"] or "-", s["model_count"],
+            _seconds(s["duration_s"]), _size(s["response_bytes"]),
+            s["failure_streak"], (s["last_change"] or "-")[:10]))
+    failing = [s["provider"] for s in summaries if s["failure_streak"] >= FAILURE_STREAK_ALERT]
+    if failing:
+        lines += ["", "Failing for %d+ runs in a row: %s" % (FAILURE_STREAK_ALERT, ", ".join(failing))]
+    return "\n".join(lines) + "\n"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Query the fetch run history")
+    parser.add_argument("--provider", help="Only this provider")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--json", action="store_true", help="Emit JSON")
+    output.add_argument("--markdown", action="store_true", help="Emit a Markdown table")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    if not history_path().exists():
+        logger.error("No run history at %s", history_path())
+        return 1
+    with RunHistory() as history:
+        providers = [args.provider] if args.provider else history.providers()
+        summaries = [history.summary(name) for name in providers]
+
+    if args.json:
+        sys.stdout.write(json.dumps(summaries, indent=2) + "\n")
+        return 0
+    if args.markdown:
+        sys.stdout.write(render_markdown(summaries))
+        return 0
+    for s in summaries:
+        sys.stdout.write("%-16s %-14s %5s models  %7s %10s  changed %s  failures in a row: %d\n" % (
+            s["provider"], s["last_status"], s["model_count"], _seconds(s["duration_s"]),
+            _size(s["response_bytes"]), s["last_change"] or "-", s["failure_streak"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""Per-provider model list shards and the assembler that publishes them.
+
+Optional layout: each provider's ``models.default`` lives in its own small
+generated file under ``models/`` in the repo root:
+
+    models/groq.yaml
+    models/openrouter.yaml
+    ...
+
+A daily update then only rewrites the shards of providers that actually
+changed, so a shard's diffs and blame scale with that provider's changes
+rather than with five 3,300-line configs. ``report_staleness.py`` blames
+the shards when they are enabled (``shard_item_range`` finds the model
+lines). The published configs are assembled from the shards with the
+catalog splice renderer, byte for byte as ``update_models`` would write
+them.
+
+The layout is active when the shard directory exists, and the shards are
+then the source of truth: ``update_models`` stages the accepted lists into
+the shards that changed and assembles the configs from every shard
+(``source_catalog``) in the same transaction, so a hand-edited shard is
+published by the next run as well. The configs are still committed: they
+are what LibreChat and the deploy hook read, and git stores an update to
+them as a delta of the changed items.
+
+Usage:
+    python shards.py --split       # create/refresh shards from the configs
+    python shards.py --assemble    # write shard lists into the configs
+    python shards.py --check       # exit 1 if the configs are out of date
+
+Environment:
+    MODEL_SHARDS_DIR  shard directory (default ``models/`` in the repo root)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Iterable, Optional
+
+from ruamel.yaml import YAML
+
+from catalog import REPO_ROOT, ProviderCatalog, config_paths, render_all, write_rendered
+from log_config import setup_logging
+from transaction import ConfigTransaction
+
+logger = logging.getLogger(__name__)
+
+SHARD_SUFFIX = ".yaml"
+SHARD_HEADER = (
+    "# Generated by scripts/shards.py -- one provider's models.default.\n"
+    "# After editing, run `python shards.py --assemble` to update the configs.\n"
+)
+
+
+def shard_dir() -> Path:
+    return Path(os.environ.get("MODEL_SHARDS_DIR", REPO_ROOT / "models"))
+
+
+def shards_enabled(directory: Optional[Path] = None) -> bool:
+    directory = Path(directory) if directory is not None else shard_dir()
+    return directory.is_dir()
+
+
+def shard_name(provider: str) -> str:
+    """File name for ``provider``: lower case, runs of other characters -> '-'."""
+    slug = re.sub(r"[^a-z0-9]+", "-", provider.casefold()).strip("-")
+    return (slug or "provider") + SHARD_SUFFIX
+
+
+def render_shard(catalog: ProviderCatalog, provider: str) -> str:
+    items = "".join("  %s\n" % item for item in catalog.formatted_items(provider))
+    return "%sname: %s\nmodels:\n%s" % (SHARD_HEADER, json.dumps(provider), items)
+
+
+def shard_item_range(path: Path) -> Optional[tuple[str, int, int]]:
+    """``(provider, first line, last line)`` of a shard's model items, 1-based.
+
+    None if ``path`` is not laid out as ``render_shard`` writes it (a hand
+    edit, say) or lists no models.
+    """
+    try:
+        lines = Path(path).read_text(encoding="utf-8").splitlines()
+    except (OSError, UnicodeDecodeError):
+        return None
+    header = SHARD_HEADER.count("\n")
+    if len(lines) <= header + 2 or not lines[header].startswith("name: ") \
+            or lines[header + 1] != "models:":
+        return None
+    try:
+        provider = json.loads(lines[header][len("name: "):])
+    except ValueError:
+        return None
+    items = lines[header + 2:]
+    if not isinstance(provider, str) or not all(line.startswith("  - ") for line in items):
+        return None
+    return provider, header + 3, header + 2 + len(items)
+
+
+def _shard_paths(catalog: ProviderCatalog, directory: Path) -> dict[str, Path]:
+    paths: dict[str, Path] = {}
+    owners: dict[str, str] = {}
+    for provider in sorted(catalog):
+        name = shard_name(provider)
+        if name in owners:
+            raise ValueError(
+                "Providers %r and %r map to the same shard %s" % (owners[name], provider, name)
+            )
+        owners[name] = provider
+        paths[provider] = directory / name
+    return paths
+
+
+def write_shards(
+    catalog: ProviderCatalog,
+    directory: Optional[Path] = None,
+    prune: bool = True,
+    transaction: Optional[ConfigTransaction] = None,
+) -> list[Path]:
+    """Write the shards whose content changed, all in one transaction.
+
+    With ``transaction`` the shards are only staged in it, for the caller
+    to commit together with the configs, and nothing is pruned.
+
+    Args:
+        prune: Delete shard files of providers no longer in ``catalog``.
+
+    Returns:
+        list: shard files written (or staged) or deleted.
+    """
+    directory = Path(directory) if directory is not None else shard_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = _shard_paths(catalog, directory)
+
+    own = transaction is None
+    if own:
+        transaction = ConfigTransaction()
+    written = []
+    for provider, path in paths.items():
+        text = render_shard(catalog, provider)
+        try:
+            if path.read_text(encoding="utf-8") == text:
+                continue
+        except FileNotFoundError:
+            pass
+        transaction.stage(path, lambda f, text=text: f.write(text), validate=False)
+        written.append(path)
+    if not own:
+        return written
+    transaction.commit()
+
+    if prune:
+        keep = set(paths.values())
+        for path in sorted(directory.glob("*" + SHARD_SUFFIX)):
+            if path not in keep:
+                path.unlink()
+                written.append(path)
+    if written:
+        logger.info("Updated %d shard(s) in %s", len(written), directory)
+    return written
+
+
+def load_shards(directory: Optional[Path] = None) -> ProviderCatalog:
+    """Read every shard into a catalog."""
+    directory = Path(directory) if directory is not None else shard_dir()
+    yaml = YAML(typ="safe", pure=True)
+    catalog = ProviderCatalog()
+    for path in sorted(directory.glob("*" + SHARD_SUFFIX)):
+        with path.open("r", encoding="utf-8") as f:
+            data = yaml.load(f)
+        if not isinstance(data, dict) or not isinstance(data.get("name"), str):
+            raise ValueError("%s is not a model shard" % path)
+        models = data.get("models") or []
+        if not isinstance(models, list):
+            raise ValueError("%s: models must be a list" % path)
+        catalog.set_models(data["name"], [str(m) for m in models])
+    return catalog
+
+
+def source_catalog(updates: ProviderCatalog, directory: Optional[Path] = None) -> ProviderCatalog:
+    """Every shard's list, with the lists in ``updates`` taking precedence."""
+    catalog = load_shards(directory)
+    for provider, models in updates.items():
+        catalog.set_models(provider, models)
+    return catalog
+
+
+def assemble(
+    directory: Optional[Path] = None,
+    paths: Optional[Iterable[Path]] = None,
+    check: bool = False,
+) -> list[Path]:
+    """Splice the shard lists into the configs.
+
+    Returns:
+        list: configs that were (or, with ``check``, would be) rewritten.
+    """
+    catalog = load_shards(directory)
+    results = render_all(catalog, paths if paths is not None else config_paths())
+    for path, result in results.items():
+        for name in result.skipped_providers:
+            logger.warning("%s: %s not assembled", path.name, name)
+    if check:
+        return [path for path, result in results.items() if result.changed]
+    return write_rendered(results)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Split model lists into shards or assemble them")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--split", action="store_true", help="Write shards from the configs")
+    group.add_argument("--assemble", action="store_true", help="Write shard lists into the configs")
+    group.add_argument("--check", action="store_true", help="Exit 1 if the configs differ from the shards")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    if args.split:
+        write_shards(ProviderCatalog.from_files(config_paths()))
+        return 0
+
+    changed = assemble(check=args.check)
+    for path in changed:
+        logger.info("%s %s", "Out of date:" if args.check else "Assembled", path.name)
+    return 1 if args.check and changed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""Per-provider staleness thresholds, tuned from each provider's history.
+
+Two gates watch for broken fetchers, and each used one number for every
+provider:
+
+- ``update_models.check_staleness`` rejects a fetch returning fewer than
+  ``STALENESS_THRESHOLD`` (0.5) of the models currently listed.
+- ``report_staleness.py`` reports a provider whose list has not changed in
+  ``--weeks`` (4).
+
+Providers differ too much for one number. OpenRouter changes daily and
+its count moves by a few percent, so losing half its models before the
+gate fires is a long way to fall. Perplexity's hand-kept list changes a
+few times a year, so four weeks without a change is normal.
+
+``--tune`` derives both thresholds per provider from the change history
+in ``model_index.py`` (git):
+
+- ``weeks``: 1.5x the 90th percentile of the gaps between changes,
+  rounded up to whole weeks and clamped to 1..26.
+- ``count_ratio``: ``exp(-3 * sigma)`` of the log count ratios between
+  consecutive changes, lowered below the deepest legitimate drop seen
+  (with 10% margin), capped so that losing one or two models from a
+  small list never trips it, and clamped to 0.2..0.8.
+
+Providers with fewer than ``MIN_CHANGES`` changes keep the global
+defaults; they are still listed, with null thresholds and the history
+seen so far. The result is written to ``staleness_thresholds.json``,
+which both gates read automatically. The file is checked in; the weekly
+staleness-report workflow re-tunes it and opens a pull request when it
+changed. An explicit ``STALENESS_THRESHOLD`` or ``--weeks`` still applies
+to every provider.
+
+Usage:
+    python staleness_thresholds.py           # show the stored thresholds
+    python staleness_thresholds.py --tune    # re-derive them from git history
+
+Environment:
+    STALENESS_THRESHOLDS_PATH  thresholds file (default ``scripts/staleness_thresholds.json``)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
+import os
+import statistics
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from log_config import setup_logging
+from model_index import DEFAULT_FILES, ModelIndex
+from transaction import write_atomic
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = Path(__file__).resolve().parent / "staleness_thresholds.json"
+FORMAT_VERSION = 1
+DEFAULT_WEEKS = 4
+DEFAULT_COUNT_RATIO = 0.5
+MIN_CHANGES = 5
+MIN_WEEKS, MAX_WEEKS = 1, 26
+MIN_RATIO, MAX_RATIO = 0.2, 0.8
+DAY = 86_400
+
+
+def thresholds_path() -> Path:
+    return Path(os.environ.get("STALENESS_THRESHOLDS_PATH", DEFAULT_PATH))
+
+
+@dataclass(frozen=True)
+class ProviderThreshold:
+    weeks: Optional[int]  # None: too little history, use the default
+    count_ratio: Optional[float]
+    changes: int
+    median_count: int
+
+    @property
+    def tuned(self) -> bool:
+        return self.weeks is not None and self.count_ratio is not None
+
+
+class Thresholds:
+    """Tuned thresholds by provider; providers without one use the defaults."""
+
+    def __init__(self, providers: Optional[dict[str, ProviderThreshold]] = None):
+        self.providers = dict(sorted((providers or {}).items()))
+
+    def __bool__(self) -> bool:
+        return any(entry.tuned for entry in self.providers.values())
+
+    def tuned_weeks(self) -> dict[str, int]:
+        """``{provider: weeks}`` of the tuned providers."""
+        return {name: entry.weeks for name, entry in self.providers.items() if entry.tuned}
+
+    def weeks(self, provider: str, default: int = DEFAULT_WEEKS) -> int:
+        entry = self.providers.get(provider)
+        return entry.weeks if entry and entry.tuned else default
+
+    def count_ratio(self, provider: str, default: float = DEFAULT_COUNT_RATIO) -> float:
+        entry = self.providers.get(provider)
+        return entry.count_ratio if entry and entry.tuned else default
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": FORMAT_VERSION,
+            "providers": {name: asdict(entry) for name, entry in self.providers.items()},
+        }
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "Thresholds":
+        """The stored thresholds; empty if the file is missing or unreadable."""
+        path = Path(path) if path is not None else thresholds_path()
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != FORMAT_VERSION:
+                raise ValueError("unsupported version %r" % data.get("version"))
+            return cls({name: ProviderThreshold(**entry)
+                        for name, entry in data.get("providers", {}).items()})
+        except FileNotFoundError:
+            return cls()
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning("Ignoring staleness thresholds in %s: %s", path, e)
+            return cls()
+
+    def save(self, path: Optional[Path] = None) -> None:
+        path = Path(path) if path is not None else thresholds_path()
+        text = json.dumps(self.to_dict(), indent=2, sort_keys=True) + "\n"
+        write_atomic(path, text)
+
+
+def change_points(events: Iterable[list[Any]]) -> dict[str, list[tuple[int, int]]]:
+    """``{provider: [(time, model count after the change), ...]}`` from model index events."""
+    counts: dict[str, int] = {}
+    points: dict[str, list[tuple[int, int]]] = {}
+    for when, provider, _, change in events:
+        counts[provider] = counts.get(provider, 0) + change
+        series = points.setdefault(provider, [])
+        if series and series[-1][0] == when:
+            series[-1] = (when, counts[provider])
+        else:
+            series.append((when, counts[provider]))
+    return points
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def tune_provider(points: list[tuple[int, int]]) -> Optional[ProviderThreshold]:
+    """Thresholds for one provider's change points; None with too little history."""
+    changes = len(points) - 1
+    if changes < MIN_CHANGES:
+        return None
+    gaps = [(b[0] - a[0]) / DAY for a, b in zip(points, points[1:])]
+    weeks = math.ceil(_percentile(gaps, 0.9) * 1.5 / 7)
+
+    ratios = [b[1] / a[1] for a, b in zip(points, points[1:]) if a[1] > 0 and b[1] > 0]
+    sigma = statistics.pstdev([math.log(r) for r in ratios]) if len(ratios) > 1 else 0.0
+    ratio = math.exp(-3 * sigma)
+    deepest = min(ratios, default=1.0)
+    if deepest < 1.0:
+        ratio = min(ratio, 0.9 * deepest)
+    median_count = int(statistics.median(count for _, count in points))
+    if median_count:
+        ratio = min(ratio, 1 - 1.5 / median_count)
+
+    return ProviderThreshold(
+        weeks=min(MAX_WEEKS, max(MIN_WEEKS, weeks)),
+        count_ratio=round(min(MAX_RATIO, max(MIN_RATIO, ratio)), 2),
+        changes=changes,
+        median_count=median_count,
+    )
+
+
+def tune(events: Iterable[list[Any]]) -> Thresholds:
+    tuned = {}
+    for provider, points in change_points(events).items():
+        threshold = tune_provider(points)
+        if threshold is None:
+            threshold = ProviderThreshold(
+                weeks=None, count_ratio=None, changes=len(points) - 1,
+                median_count=int(statistics.median(count for _, count in points)))
+        tuned[provider] = threshold
+    return Thresholds(tuned)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Per-provider staleness thresholds")
+    parser.add_argument("--tune", action="store_true",
+                        help="Derive the thresholds from the git history and store them")
+    parser.add_argument("--file", action="append",
+                        help="Config whose history to read; repeatable (default %s)"
+                        % ", ".join(DEFAULT_FILES))
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    if args.tune:
+        index = ModelIndex(files=args.file or DEFAULT_FILES)
+        try:
+            index.update()
+        except RuntimeError as e:
+            logger.error("%s", e)
+            return 1
+        thresholds = tune(index.events)
+        thresholds.save()
+        logger.info("Tuned %d of %d provider(s) into %s", len(thresholds.tuned_weeks()),
+                    len(thresholds.providers), thresholds_path())
+    else:
+        thresholds = Thresholds.load()
+
+    for name, entry in thresholds.providers.items():
+        if not entry.tuned:
+            sys.stdout.write("%-16s defaults, %d change(s) so far  (~%d models)\n" % (
+                name, entry.changes, entry.median_count))
+            continue
+        sys.stdout.write("%-16s stale after %2d weeks  count gate %.2f  (%d changes, ~%d models)\n" % (
+            name, entry.weeks, entry.count_ratio, entry.changes, entry.median_count))
+    sys.stdout.write("Other providers: stale after %d weeks, count gate %.2f\n"
+                     % (DEFAULT_WEEKS, DEFAULT_COUNT_RATIO))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
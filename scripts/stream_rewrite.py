@@ -0,0 +1,240 @@
+"""Constant-memory rewriter for ``endpoints.custom[name=X].models.default``.
+
+Round-tripping a config into ``CommentedMap``/``CommentedSeq`` objects costs
+many times the size of the text, which starts to matter for derived
+configs carrying full OpenRouter + HuggingFace + Unify catalogs (tens of
+thousands of ids). This module never builds a document. It walks the YAML
+*event* stream to find the model blocks and, in lockstep, copies the source
+text line by line to the output, swapping in the new items when it reaches
+a block that has a replacement.
+
+Both the event parser and the line copier read the input incrementally, and
+the replacement ids are consumed from iterables and formatted in bounded
+chunks, so peak memory does not grow with the file or the lists.
+
+Items are formatted with ``catalog.format_model_items``, i.e. exactly as
+``update_models.save_yaml_file`` would dump them; everything outside the
+replaced blocks is copied byte for byte.
+
+Limitations: only block-style, non-empty ``models.default`` lists are
+replaced, and ``name`` must come before ``models`` in the endpoint (true
+for every config in this repo). Other blocks are copied unchanged and
+reported as skipped.
+
+Usage:
+    from stream_rewrite import rewrite_models
+    rewrite_models("big.yaml", "big.out.yaml", {"OpenRouter": iter_ids()})
+"""
+
+from __future__ import annotations
+
+import logging
+from itertools import islice
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Mapping, Optional
+
+from ruamel.yaml import YAML
+from ruamel.yaml.events import (
+    CollectionEndEvent,
+    CollectionStartEvent,
+    MappingStartEvent,
+    ScalarEvent,
+    SequenceStartEvent,
+)
+
+from catalog import format_model_items
+
+logger = logging.getLogger(__name__)
+
+FORMAT_CHUNK_SIZE = 1000
+
+# Path from the document root to a provider's model list, one entry per
+# nesting level: None = sequence item, str = mapping key.
+_MODELS_PATH = ("endpoints", "custom", None, "models", "default")
+
+
+def iter_formatted_items(models: Iterable[str], chunk_size: int = FORMAT_CHUNK_SIZE) -> Iterator[str]:
+    """Yield block item lines (``- id``) for ``models``, ``chunk_size`` at a time."""
+    models = iter(models)
+    while True:
+        chunk = list(islice(models, chunk_size))
+        if not chunk:
+            return
+        yield from format_model_items(chunk)
+
+
+class _LineCopier:
+    """Copies source lines to the output up to a given line number."""
+
+    def __init__(self, src: IO[str], dst: IO[str]):
+        self._src = src
+        self._dst = dst
+        self.line = 0  # 0-based number of the next unread source line
+
+    def copy_until(self, line: int) -> None:
+        while self.line < line:
+            self._dst.write(self._src.readline())
+            self.line += 1
+
+    def skip_through(self, line: int) -> str:
+        """Discard source lines up to and including ``line``; return the first."""
+        first = ""
+        while self.line <= line:
+            text = self._src.readline()
+            if not first:
+                first = text
+            self.line += 1
+        return first
+
+    def copy_rest(self) -> None:
+        for text in self._src:
+            self._dst.write(text)
+
+
+class _Frame:
+    __slots__ = ("is_mapping", "key", "expect_key", "name")
+
+    def __init__(self, is_mapping: bool):
+        self.is_mapping = is_mapping
+        self.key: Optional[str] = None
+        self.expect_key = True
+        self.name: Optional[str] = None
+
+
+def _rewrite_stream(
+    events: Iterator,
+    copier: _LineCopier,
+    dst: IO[str],
+    replacements: Mapping[str, Iterable[str]],
+) -> tuple[list[str], list[str]]:
+    rewritten: list[str] = []
+    skipped: list[str] = []
+    stack: list[_Frame] = []
+
+    def path() -> tuple:
+        # The key each open collection was reached through, root excluded.
+        keys = []
+        for parent in stack[:-1]:
+            keys.append(parent.key if parent.is_mapping else None)
+        return tuple(keys)
+
+    def endpoint_name() -> Optional[str]:
+        # stack: root, endpoints, custom, <endpoint>, models, default
+        return stack[3].name if len(stack) > 3 else None
+
+    for event in events:
+        if isinstance(event, CollectionStartEvent):
+            parent = stack[-1] if stack else None
+            stack.append(_Frame(isinstance(event, MappingStartEvent)))
+            if parent is not None and parent.is_mapping:
+                parent.expect_key = True
+
+            if not isinstance(event, SequenceStartEvent) or path() != _MODELS_PATH:
+                continue
+            name = endpoint_name()
+            if name is None or name not in replacements:
+                continue
+
+            # Target block: collect the line span of its items.
+            first_line = last_line = None
+            simple = not event.flow_style
+            for inner in events:
+                if isinstance(inner, ScalarEvent):
+                    if first_line is None:
+                        first_line = inner.start_mark.line
+                    last_line = inner.end_mark.line
+                    continue
+                if not isinstance(inner, CollectionEndEvent):
+                    # Nested collections are not model ids; leave the block.
+                    simple = False
+                    depth = 1
+                    for nested in events:
+                        if isinstance(nested, CollectionStartEvent):
+                            depth += 1
+                        elif isinstance(nested, CollectionEndEvent):
+                            depth -= 1
+                            if depth == 0:
+                                break
+                    continue
+                break
+            stack.pop()
+
+            if not simple or first_line is None:
+                logger.warning("models.default for %s is not a non-empty block list, copied as is", name)
+                skipped.append(name)
+                continue
+
+            copier.copy_until(first_line)
+            first = copier.skip_through(last_line)
+            indent = first[:len(first) - len(first.lstrip(" "))]
+            for item in iter_formatted_items(replacements[name]):
+                dst.write("%s%s\n" % (indent, item))
+            rewritten.append(name)
+            continue
+
+        if isinstance(event, CollectionEndEvent):
+            stack.pop()
+            continue
+
+        if isinstance(event, ScalarEvent) and stack and stack[-1].is_mapping:
+            frame = stack[-1]
+            if frame.expect_key:
+                frame.key = event.value
+                frame.expect_key = False
+            else:
+                if frame.key == "name" and len(stack) == 4 and path() == _MODELS_PATH[:3]:
+                    frame.name = event.value
+                frame.expect_key = True
+
+    return rewritten, skipped
+
+
+def rewrite_models_stream(
+    src: IO[str],
+    dst: IO[str],
+    replacements: Mapping[str, Iterable[str]],
+    events_src: IO[str],
+) -> tuple[list[str], list[str]]:
+    """Rewrite model blocks from ``src`` to ``dst``.
+
+    ``events_src`` is a second, independent handle on the same input that
+    feeds the event parser while ``src`` feeds the line copier.
+
+    Returns:
+        tuple: (rewritten_providers, skipped_providers)
+    """
+    copier = _LineCopier(src, dst)
+    events = iter(YAML(typ="safe", pure=True).parse(events_src))
+    rewritten, skipped = _rewrite_stream(events, copier, dst, replacements)
+    copier.copy_rest()
+    return rewritten, skipped
+
+
+def rewrite_models(
+    src_path,
+    dst_path,
+    replacements: Mapping[str, Iterable[str]],
+) -> tuple[list[str], list[str]]:
+    """Stream ``src_path`` to ``dst_path`` with the given model lists replaced.
+
+    ``dst_path`` must differ from ``src_path``; callers that want an
+    in-place update write to a temp file and rename it.
+
+    Returns:
+        tuple: (rewritten_providers, skipped_providers)
+    """
+    src_path = Path(src_path)
+    dst_path = Path(dst_path)
+    if src_path.resolve() == dst_path.resolve():
+        raise ValueError("rewrite_models needs a separate output file")
+
+    with src_path.open("r", encoding="utf-8", newline="") as src, \
+            src_path.open("r", encoding="utf-8") as events_src, \
+            dst_path.open("w", encoding="utf-8", newline="") as dst:
+        rewritten, skipped = rewrite_models_stream(src, dst, replacements, events_src)
+
+    missing = sorted(set(replacements) - set(rewritten) - set(skipped))
+    if missing:
+        logger.warning("No models.default block found for: %s", ", ".join(missing))
+    logger.info("Rewrote %d model list(s) from %s into %s", len(rewritten), src_path, dst_path)
+    return rewritten, skipped
@@ -0,0 +1,224 @@
+"""Build a throwaway git repository with years of synthetic daily updates.
+
+The staleness tooling (``report_staleness.py``, ``blame_cache``,
+``model_index.py`` and the reports built on it) reads the git history of
+the configs, so its cost grows with the history. This repository is
+young. To see how the tooling behaves after years of daily updates
+without touching it, this script writes a repository with the same
+shape:
+
+- one commit per day at 00:00 UTC plus a few minutes (the workflow's
+  cron), by ``github-actions[bot]`` with the workflow's
+  ``chore: update AI models (<date>)`` message;
+- configs laid out like ``librechat-env-f.yaml``: a header, then one
+  ``endpoints.custom`` entry per provider with a sorted block
+  ``models.default`` list, identical in every tracked file;
+- providers with their own cadence, from daily to every couple of
+  months. Each change adds and drops a few ids and keeps the list near
+  ``--models`` long. A ``--dormant`` fraction of providers stops
+  changing part-way through (the failure ``report_staleness.py`` is
+  there to catch), and every commit changes at least one provider,
+  because the workflow commits nothing otherwise.
+
+The same ``--seed`` gives the same history. Commits are streamed into
+``git fast-import``, so thousands of them take seconds rather than one
+``git commit`` each.
+
+Usage:
+    python synthetic_history.py /tmp/history                   # a year, 20 providers
+    python synthetic_history.py /tmp/history --commits 1825 --providers 40 --models 300
+    python report_staleness.py --repo-root /tmp/history --source git
+
+``benchmark_history.py`` builds these histories and times the tooling on them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import math
+import random
+import subprocess
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Optional
+
+from log_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+DAY = 86_400
+BRANCH = "main"
+AUTHOR = "github-actions[bot] <github-actions[bot]@users.noreply.github.com>"
+CONFIG_NAMES = (
+    "librechat-env-f.yaml",
+    "librechat-env-l.yaml",
+    "librechat-up-f.yaml",
+    "librechat-up-l.yaml",
+    "librechat-test.yaml",
+)
+HEADER = """\
+version: 1.3.11
+
+cache: true
+fileStrategy: "firebase"
+
+endpoints:
+  custom:
+"""
+
+
+@dataclass(frozen=True)
+class HistorySpec:
+    """Shape of a synthetic history; see the module docstring."""
+
+    commits: int = 365
+    providers: int = 20
+    models: int = 100
+    files: int = 1
+    dormant: float = 0.2
+    seed: int = 0
+    end: Optional[int] = None  # time of the last commit (default: today's run)
+
+    @property
+    def file_names(self) -> tuple[str, ...]:
+        return CONFIG_NAMES[:max(1, min(self.files, len(CONFIG_NAMES)))]
+
+
+def _provider_block(name: str, models: list[str]) -> str:
+    lines = [
+        "    # %s" % name,
+        '    - name: "%s"' % name,
+        '      apiKey: "${%s_API_KEY}"' % name.upper(),
+        '      baseURL: "https://api.%s.example/v1"' % name,
+        "      models:",
+        "        default:",
+    ]
+    lines += ["          - %s" % model for model in models]
+    lines += [
+        "        fetch: false",
+        "      titleConvo: true",
+        '      titleModel: "current_model"',
+        '      modelDisplayLabel: "%s"' % name,
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def config_text(blocks: dict[str, str]) -> str:
+    return HEADER + "".join(blocks.values())
+
+
+def _end_time(spec: HistorySpec) -> int:
+    if spec.end is not None:
+        return spec.end
+    now = int(datetime.now(timezone.utc).timestamp())
+    return now - now % DAY
+
+
+def iter_commits(spec: HistorySpec) -> Iterator[tuple[int, dict[str, list[str]]]]:
+    """``(commit time, {provider: models})`` for every commit, oldest first.
+
+    The first commit lists every provider; each later one differs from
+    the one before in at least one provider's list.
+    """
+    rng = random.Random(spec.seed)
+    names = ["provider%02d" % i for i in range(spec.providers)]
+    serial = {name: spec.models for name in names}
+    lists = {name: ["%s/model-%06d" % (name, i) for i in range(spec.models)] for name in names}
+    # Chance of changing on a given day, log-uniform between daily and every 60 days.
+    rates = {name: math.exp(rng.uniform(math.log(1 / 60), 0)) for name in names}
+    stops = {name: rng.randrange(1, max(2, int(spec.commits * 0.8)))
+             for name in rng.sample(names, round(spec.dormant * len(names)))}
+
+    start = _end_time(spec) - (spec.commits - 1) * DAY
+    for number in range(spec.commits):
+        when = start + number * DAY + rng.randrange(60, 900)
+        if number:
+            active = [name for name in names if number < stops.get(name, spec.commits)]
+            changed = [name for name in active if rng.random() < rates[name]]
+            if not changed:
+                changed = [max(active or names, key=rates.__getitem__)]
+            for name in changed:
+                models = lists[name]
+                drift = len(models) - spec.models
+                removed = min(len(models) - 1, max(0, rng.randint(0, 2) + (drift > 0)))
+                added = max(0 if removed else 1, rng.randint(0, 2) + (drift < 0))
+                for _ in range(removed):
+                    models.pop(rng.randrange(len(models)))
+                for _ in range(added):
+                    models.append("%s/model-%06d" % (name, serial[name]))
+                    serial[name] += 1
+                models.sort()
+        yield when, lists
+
+
+def build_history(root: Path, spec: HistorySpec = HistorySpec()) -> Path:
+    """Write a new git repository at ``root`` (which must not exist yet)."""
+    root = Path(root)
+    root.mkdir(parents=True)
+    subprocess.run(["git", "init", "-q", str(root)], check=True)
+    process = subprocess.Popen(["git", "-C", str(root), "fast-import", "--quiet"],
+                               stdin=subprocess.PIPE)
+    blocks: dict[str, str] = {}
+    previous: dict[str, list[str]] = {}
+    try:
+        for mark, (when, lists) in enumerate(iter_commits(spec), start=1):
+            for name, models in lists.items():
+                if previous.get(name) != models:
+                    blocks[name] = _provider_block(name, models)
+                    previous[name] = list(models)
+            text = config_text(blocks).encode("utf-8")
+            date = datetime.fromtimestamp(when, tz=timezone.utc).strftime("%Y-%m-%d")
+            message = ("chore: update AI models (%s)\n" % date).encode("utf-8")
+            chunks = [b"blob\nmark :%d\ndata %d\n" % (mark, len(text)), text, b"\n",
+                      b"commit refs/heads/%s\n" % BRANCH.encode()]
+            for role in (b"author", b"committer"):
+                chunks.append(b"%s %s %d +0000\n" % (role, AUTHOR.encode(), when))
+            chunks += [b"data %d\n" % len(message), message]
+            chunks += [b"M 100644 :%d %s\n" % (mark, name.encode()) for name in spec.file_names]
+            chunks.append(b"\n")
+            process.stdin.write(b"".join(chunks))
+    finally:
+        process.stdin.close()
+        if process.wait() != 0:
+            raise RuntimeError("git fast-import failed in %s" % root)
+    subprocess.run(["git", "-C", str(root), "symbolic-ref", "HEAD", "refs/heads/" + BRANCH], check=True)
+    subprocess.run(["git", "-C", str(root), "reset", "-q", "--hard"], check=True)
+    return root
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    defaults = HistorySpec()
+    parser = argparse.ArgumentParser(description="Build a synthetic config history for benchmarks")
+    parser.add_argument("root", type=Path, help="Directory to create the repository in")
+    parser.add_argument("--commits", type=int, default=defaults.commits,
+                        help="Daily update commits (default %d)" % defaults.commits)
+    parser.add_argument("--providers", type=int, default=defaults.providers,
+                        help="Providers per config (default %d)" % defaults.providers)
+    parser.add_argument("--models", type=int, default=defaults.models,
+                        help="Models per provider (default %d)" % defaults.models)
+    parser.add_argument("--files", type=int, default=defaults.files,
+                        help="Identical configs per commit, up to %d (default %d)"
+                        % (len(CONFIG_NAMES), defaults.files))
+    parser.add_argument("--dormant", type=float, default=defaults.dormant,
+                        help="Fraction of providers that stop changing (default %s)" % defaults.dormant)
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Random seed")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    if args.root.exists():
+        logger.error("%s already exists", args.root)
+        return 1
+    spec = HistorySpec(commits=max(1, args.commits), providers=max(1, args.providers),
+                       models=max(1, args.models), files=args.files,
+                       dormant=args.dormant, seed=args.seed)
+    build_history(args.root, spec)
+    logger.info("Wrote %d commits of %s to %s", spec.commits, ", ".join(spec.file_names), args.root)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
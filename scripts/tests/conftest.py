@@ -5,6 +5,48 @@ import pytest
 from providers.base import BaseFetcher, FetchResult, FetchStatus, _registry
 
 
+@pytest.fixture(autouse=True)
+def isolated_yaml_cache(tmp_path_factory, monkeypatch):
+    """Keep parsed-YAML cache entries out of scripts/.cache during tests."""
+    monkeypatch.setenv("YAML_CACHE_DIR", str(tmp_path_factory.mktemp("yaml-cache")))
+
+
+@pytest.fixture(autouse=True)
+def isolated_blame_cache(tmp_path_factory, monkeypatch):
+    """Keep blame cache entries out of scripts/.cache during tests."""
+    monkeypatch.setenv("BLAME_CACHE_DIR", str(tmp_path_factory.mktemp("blame-cache")))
+
+
+@pytest.fixture(autouse=True)
+def isolated_run_history(tmp_path_factory, monkeypatch):
+    """Record fetch results in a throwaway run-history database."""
+    path = tmp_path_factory.mktemp("run-history") / "run_history.sqlite3"
+    monkeypatch.setenv("RUN_HISTORY_DB", str(path))
+
+
+@pytest.fixture(autouse=True)
+def isolated_staleness_thresholds(tmp_path_factory, monkeypatch):
+    """Use the global staleness defaults unless a test stores tuned thresholds."""
+    path = tmp_path_factory.mktemp("thresholds") / "staleness_thresholds.json"
+    monkeypatch.setenv("STALENESS_THRESHOLDS_PATH", str(path))
+
+
+@pytest.fixture(autouse=True)
+def isolated_backups(tmp_path_factory, monkeypatch):
+    """Keep backup generations out of the repo's .backups during tests."""
+    monkeypatch.setenv("BACKUP_DIR", str(tmp_path_factory.mktemp("backups")))
+
+
+@pytest.fixture(autouse=True)
+def isolated_catalog_export(tmp_path_factory, monkeypatch):
+    """Keep the catalog artifact, lockfile and shards written by update runs out of the repo root."""
+    path = tmp_path_factory.mktemp("catalog") / "models.catalog.json"
+    monkeypatch.setenv("CATALOG_EXPORT_PATH", str(path))
+    monkeypatch.setenv("MODEL_LOCK_PATH", str(path.parent / "models.lock.json"))
+    # Not created: the shard layout stays off unless a test enables it.
+    monkeypatch.setenv("MODEL_SHARDS_DIR", str(path.parent / "models"))
+
+
 @pytest.fixture(autouse=True)
 def clean_registry():
     """Save and restore registry state around each test to prevent leaking."""
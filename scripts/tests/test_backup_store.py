@@ -0,0 +1,95 @@
+"""Tests for the rotating backup store."""
+from __future__ import annotations
+
+import gzip
+import os
+from unittest.mock import patch
+
+import pytest
+
+import backup_store
+from backup_store import BackupStore
+
+
+@pytest.fixture
+def config(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("version: 1\n", encoding="utf-8")
+    return path
+
+
+def _replace(path, text):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class TestBackup:
+
+    def test_default_location_is_next_to_file(self, config, monkeypatch):
+        monkeypatch.delenv("BACKUP_DIR", raising=False)
+        backup = BackupStore().backup(config)
+        assert backup == config.parent / ".backups" / "config.yaml" / "config.yaml.1"
+        assert backup.read_text(encoding="utf-8") == "version: 1\n"
+
+    def test_hardlink_survives_atomic_replace(self, config, tmp_path):
+        store = BackupStore(root=tmp_path / "b")
+        with patch.object(backup_store, "_reflink", side_effect=OSError):
+            backup = store.backup(config)
+        assert os.path.samefile(backup, config)
+        _replace(config, "version: 2\n")
+        assert backup.read_text(encoding="utf-8") == "version: 1\n"
+
+    def test_falls_back_to_copy(self, config, tmp_path):
+        store = BackupStore(root=tmp_path / "b")
+        with patch.object(backup_store, "_reflink", side_effect=OSError), \
+             patch.object(backup_store.os, "link", side_effect=OSError):
+            backup = store.backup(config)
+        assert not os.path.samefile(backup, config)
+        assert backup.read_text(encoding="utf-8") == "version: 1\n"
+
+    def test_unchanged_file_does_not_rotate(self, config, tmp_path):
+        store = BackupStore(root=tmp_path / "b")
+        with patch.object(backup_store, "_reflink", side_effect=OSError):
+            store.backup(config)
+            store.backup(config)
+        assert len(store.list_generations(config)) == 1
+
+
+class TestRotation:
+
+    def test_keeps_n_generations_and_compacts_older(self, config, tmp_path):
+        store = BackupStore(root=tmp_path / "b", generations=3)
+        for version in range(2, 7):
+            store.backup(config)
+            _replace(config, "version: %d\n" % version)
+            store.compact()
+
+        generations = store.list_generations(config)
+        assert [p.name for p in generations] == [
+            "config.yaml.1", "config.yaml.2.gz", "config.yaml.3.gz",
+        ]
+        assert generations[0].read_text(encoding="utf-8") == "version: 5\n"
+        with gzip.open(generations[2], "rt", encoding="utf-8") as f:
+            assert f.read() == "version: 3\n"
+
+    def test_restore_from_compressed_generation(self, config, tmp_path):
+        store = BackupStore(root=tmp_path / "b")
+        store.backup(config)
+        _replace(config, "version: 2\n")
+        store.backup(config)
+        _replace(config, "version: 3\n")
+        store.compact(config)
+
+        store.restore(config, generation=2)
+        assert config.read_text(encoding="utf-8") == "version: 1\n"
+
+    def test_restore_missing_generation(self, config, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            BackupStore(root=tmp_path / "b").restore(config, generation=2)
+
+    def test_generations_from_environment(self, monkeypatch):
+        monkeypatch.setenv("BACKUP_GENERATIONS", "2")
+        assert BackupStore().generations == 2
+        with pytest.raises(ValueError):
+            BackupStore(generations=0)
@@ -2,7 +2,9 @@
 from __future__ import annotations
 
 from typing import Optional
+from unittest.mock import patch
 
+import httpx
 import pytest
 
 from providers.base import BaseFetcher, FetchResult, FetchStatus
@@ -49,6 +51,23 @@ class TestABCEnforcement:
         assert result.status == FetchStatus.SUCCESS
         assert result.models == ["model-a", "model-b"]
         assert result.model_count == 2
+        assert result.duration_s > 0
+        assert result.response_bytes == 0
+
+    def test_run_counts_response_bytes(self, concrete_fetcher_class):
+        """run() reports the body bytes received through _http_get()."""
+
+        class HttpFetcher(concrete_fetcher_class):
+            def fetch_models(self) -> FetchResult:
+                self._http_get("https://example.com/a")
+                self._http_get("https://example.com/b")
+                return super().fetch_models()
+
+        response = httpx.Response(200, content=b"0123456789",
+                                  request=httpx.Request("GET", "https://example.com"))
+        with patch("providers.base.httpx.get", return_value=response):
+            result = HttpFetcher().run()
+        assert result.response_bytes == 20
 
     def test_run_catches_exceptions(self):
         """run() returns FetchResult with NETWORK_ERROR status when fetch_models() raises."""
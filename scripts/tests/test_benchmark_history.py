@@ -0,0 +1,30 @@
+"""Tests for the staleness tooling benchmark."""
+from __future__ import annotations
+
+import os
+
+from benchmark_history import OPERATIONS, compare, format_comparison, format_table, run_benchmarks
+
+
+class TestRun:
+
+    def test_run_benchmarks_measures_every_operation(self):
+        before = {key: os.environ.get(key) for key in ("BLAME_CACHE_DIR", "MODEL_INDEX_PATH", "YAML_CACHE")}
+        results = run_benchmarks(commits=[10, 20], providers=3, models=5, repeat=1, memory=False)
+
+        assert {key: os.environ.get(key) for key in before} == before
+        rows = results["results"]
+        assert [r["operation"] for r in rows] == list(OPERATIONS) * 2
+        assert [r["commits"] for r in rows] == [10] * len(OPERATIONS) + [20] * len(OPERATIONS)
+        assert all(r["min_s"] > 0 and r["events"] > 0 for r in rows)
+        assert "report_staleness[incremental]" in format_table(results)
+
+    def test_compare_ratios(self):
+        row = {"operation": "model_index", "commits": 365, "providers": 20, "models": 100, "files": 1}
+        old = {"results": [dict(row, median_s=2.0, peak_kib=100.0)]}
+        new = {"results": [dict(row, median_s=1.0, peak_kib=150.0),
+                           dict(row, commits=1825, median_s=5.0, peak_kib=None)]}
+        rows = compare(old, new)
+        assert rows == [{"operation": "model_index", "commits": 365,
+                         "time_ratio": 0.5, "memory_ratio": 1.5}]
+        assert "0.50x" in format_comparison(rows)
@@ -0,0 +1,112 @@
+"""Tests for the YAML I/O benchmark suite."""
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from benchmark_yaml import (
+    OPERATIONS,
+    compare,
+    environment,
+    flow_text,
+    format_comparison,
+    format_table,
+    measure,
+    run_benchmarks,
+    scale_text,
+)
+from catalog import ProviderCatalog
+from convert_yaml_style import convert_file
+
+
+CONFIG = """\
+version: 1.3.11
+endpoints:
+  custom:
+    - name: "groq"
+      models:
+        default:
+          - a
+          - '7'
+        fetch: false
+    - name: "xai"
+      models:
+        default:
+          - grok/b
+"""
+
+
+@pytest.fixture
+def config(tmp_path):
+    path = tmp_path / "librechat-env-f.yaml"
+    path.write_text(CONFIG, encoding="utf-8")
+    return path
+
+
+class TestInputs:
+
+    def test_scale_text_multiplies_every_list(self, config, tmp_path):
+        scaled = tmp_path / "scaled.yaml"
+        scaled.write_text(scale_text(config, 3), encoding="utf-8")
+        catalog = ProviderCatalog.from_files([scaled])
+        assert catalog.get("groq") == ["a", "a-x1", "a-x2", "7", "7-x1", "7-x2"]
+        assert len(catalog.get("xai")) == 3
+
+    def test_scale_one_is_the_original(self, config):
+        assert scale_text(config, 1) == CONFIG
+
+    def test_flow_text_converts_back(self, config, tmp_path):
+        flow = tmp_path / "flow.yaml"
+        flow.write_text(flow_text(config), encoding="utf-8")
+        assert 'default: ["a", "7"]' in flow.read_text(encoding="utf-8")
+
+        assert convert_file(str(flow)) is True
+        assert ProviderCatalog.from_files([flow]).get("groq") == ["a", "7"]
+
+
+class TestRun:
+
+    def test_measure_runs_setup_and_reports(self):
+        calls = []
+        result = measure(lambda: calls.append("run"), lambda: calls.append("setup"),
+                         repeat=2, budget=10)
+        assert calls == ["setup", "run"] * 3
+        assert result["runs"] == 2
+        assert result["peak_kib"] is not None
+
+    def test_budget_stops_repeating(self):
+        result = measure(lambda: None, repeat=5, budget=0, memory=False)
+        assert result["runs"] == 1
+        assert result["peak_kib"] is None
+
+    def test_environment_restores_overrides(self, monkeypatch):
+        monkeypatch.setenv("BENCH_KEPT", "before")
+        monkeypatch.delenv("BENCH_ADDED", raising=False)
+        with pytest.raises(RuntimeError):
+            with environment({"BENCH_KEPT": "during", "BENCH_ADDED": "1"}):
+                assert os.environ["BENCH_KEPT"] == "during"
+                raise RuntimeError
+        assert os.environ["BENCH_KEPT"] == "before"
+        assert "BENCH_ADDED" not in os.environ
+
+    def test_run_benchmarks_leaves_configs_alone(self, config, monkeypatch):
+        monkeypatch.delenv("YAML_CACHE", raising=False)
+        results = run_benchmarks(scales=[1, 2], paths=[config], repeat=1)
+
+        assert config.read_text(encoding="utf-8") == CONFIG
+        assert "YAML_CACHE" not in os.environ
+        rows = results["results"]
+        assert [r["operation"] for r in rows] == list(OPERATIONS) * 2
+        assert {r["scale"] for r in rows} == {1, 2}
+        assert all(r["min_s"] > 0 and r["peak_kib"] > 0 for r in rows)
+        assert "find_provider_ranges[parser]" in format_table(results)
+
+    def test_compare_ratios(self):
+        row = {"operation": "load_yaml_file", "file": "a.yaml", "scale": 1}
+        old = {"results": [dict(row, median_s=2.0, peak_kib=100.0)]}
+        new = {"results": [dict(row, median_s=1.0, peak_kib=150.0),
+                           dict(row, scale=10, median_s=5.0, peak_kib=None)]}
+        rows = compare(old, new)
+        assert rows == [dict(row, time_ratio=0.5, memory_ratio=1.5)]
+        assert "0.50x" in format_comparison(rows)
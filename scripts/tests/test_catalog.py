@@ -0,0 +1,243 @@
+"""Tests for the canonical provider catalog and its renderer."""
+from __future__ import annotations
+
+import io
+import json
+import shutil
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from ruamel.yaml import YAML
+
+import update_models
+
+from catalog import (
+    ProviderCatalog,
+    config_paths,
+    format_model_items,
+    load_catalog,
+    render_all,
+    render_config,
+    save_catalog,
+    write_rendered,
+)
+from providers.base import FetchResult, FetchStatus
+
+
+CONFIG = """\
+version: 1.3.11
+
+fileStrategy: "firebase"
+
+endpoints:
+  custom:
+    # Alpha
+    - name: "Alpha"
+      apiKey: "${ALPHA_API_KEY}"
+      models:
+        default:
+          - a-1
+          - a-2
+        fetch: false
+    - name: "Beta"
+      apiKey: "user_provided"
+      models:
+        default:
+          - b-1
+        fetch: false
+"""
+
+
+def _round_trip(text, catalog):
+    """Reference implementation: full parse, assign, dump."""
+    yaml = YAML()
+    yaml.preserve_quotes = True
+    yaml.width = 4096
+    yaml.default_flow_style = False
+    yaml.indent(mapping=2, sequence=4, offset=2)
+    data = yaml.load(text)
+    for endpoint in data["endpoints"]["custom"]:
+        if endpoint["name"] in catalog:
+            endpoint["models"]["default"] = list(catalog.get(endpoint["name"]))
+    buf = io.StringIO()
+    yaml.dump(data, buf)
+    return buf.getvalue()
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    (tmp_path / "one.yaml").write_text(CONFIG, encoding="utf-8")
+    (tmp_path / "two.yaml").write_text(
+        CONFIG.replace('fileStrategy: "firebase"', "fileStrategy: 's3'"), encoding="utf-8"
+    )
+    return tmp_path
+
+
+class TestProviderCatalog:
+
+    def test_from_documents_first_document_wins(self):
+        docs = [
+            {"endpoints": {"custom": [{"name": "A", "models": {"default": ["x"]}}]}},
+            {"endpoints": {"custom": [
+                {"name": "A", "models": {"default": ["y"]}},
+                {"name": "B", "models": {"default": ["z"]}},
+            ]}},
+        ]
+        catalog = ProviderCatalog.from_documents(docs)
+        assert catalog.get("A") == ["x"]
+        assert catalog.get("B") == ["z"]
+
+    def test_from_documents_skips_empty_and_malformed(self):
+        docs = [None, {"endpoints": {"custom": [
+            {"name": "A", "models": {"default": []}},
+            {"models": {"default": ["x"]}},
+            "not-a-mapping",
+        ]}}]
+        assert len(ProviderCatalog.from_documents(docs)) == 0
+
+    def test_dict_round_trip(self, tmp_path):
+        catalog = ProviderCatalog({"b": ["2"], "a": ["1", "0"]})
+        path = tmp_path / "catalog.json"
+        save_catalog(catalog, path)
+        assert json.loads(path.read_text())["providers"] == {"a": ["1", "0"], "b": ["2"]}
+        assert dict(load_catalog(path).items()) == dict(catalog.items())
+
+    def test_from_dict_rejects_unknown_version(self):
+        with pytest.raises(ValueError, match="Unsupported catalog version"):
+            ProviderCatalog.from_dict({"version": 99, "providers": {}})
+
+
+class TestFormatModelItems:
+
+    def test_quotes_like_ruamel(self):
+        assert format_model_items(["plain/id", "7", "---FREE---", "true"]) == [
+            "- plain/id", "- '7'", "- '---FREE---'", "- 'true'",
+        ]
+
+    def test_formatting_is_memoized_per_provider(self):
+        catalog = ProviderCatalog({"A": ["x"]})
+        assert catalog.formatted_items("A") is catalog.formatted_items("A")
+        catalog.set_models("A", ["y"])
+        assert catalog.formatted_items("A") == ["- y"]
+
+
+class TestRenderConfig:
+
+    def test_matches_full_round_trip(self):
+        catalog = ProviderCatalog({"Alpha": ["a-3", "7"], "Beta": ["b-1", "b-2", "b-3"]})
+        ranges = {"Alpha": (12, 13), "Beta": (19, 19)}
+        text, changed, skipped = render_config(CONFIG, catalog, ranges)
+        assert text == _round_trip(CONFIG, catalog)
+        assert changed == ["Alpha", "Beta"]
+        assert skipped == []
+
+    def test_unchanged_catalog_is_identity(self):
+        catalog = ProviderCatalog({"Alpha": ["a-1", "a-2"], "Beta": ["b-1"]})
+        text, changed, _ = render_config(CONFIG, catalog, {"Alpha": (12, 13), "Beta": (19, 19)})
+        assert text == CONFIG
+        assert changed == []
+
+    def test_flow_style_block_is_skipped(self):
+        flow = CONFIG.replace("default:\n          - b-1", "default: [b-1]")
+        catalog = ProviderCatalog({"Beta": ["b-9"]})
+        text, changed, skipped = render_config(flow, catalog, {"Beta": (18, 18)})
+        assert text == flow
+        assert skipped == ["Beta"]
+
+
+class TestRenderAll:
+
+    def test_renders_every_file_and_keeps_overlays(self, config_dir):
+        paths = [config_dir / "one.yaml", config_dir / "two.yaml", config_dir / "missing.yaml"]
+        catalog = ProviderCatalog({"Alpha": ["a-9"]})
+        results = render_all(catalog, paths)
+        assert set(results) == {config_dir / "one.yaml", config_dir / "two.yaml"}
+        assert all(r.changed_providers == ["Alpha"] for r in results.values())
+
+        written = write_rendered(results)
+        assert len(written) == 2
+        assert "fileStrategy: 's3'" in (config_dir / "two.yaml").read_text()
+        assert "- a-9" in (config_dir / "one.yaml").read_text()
+
+    def test_real_configs_round_trip_unchanged(self, tmp_path):
+        paths = []
+        for src in config_paths():
+            dst = tmp_path / src.name
+            shutil.copy(src, dst)
+            paths.append(dst)
+        catalog = ProviderCatalog.from_files(paths)
+        results = render_all(catalog, paths)
+        assert len(results) == 5
+        assert not any(r.changed for r in results.values())
+        assert write_rendered(results) == []
+
+
+class TestUpdatePath:
+
+    def _update(self, directory, fetched):
+        registry = {}
+        for name, models in fetched.items():
+            fetcher = MagicMock()
+            fetcher.return_value.run.return_value = FetchResult(
+                provider_name=name, models=models, status=FetchStatus.SUCCESS)
+            registry[name] = fetcher
+        with patch("update_models.os.path.dirname", return_value=str(directory)), \
+             patch("update_models.discover_providers", return_value=registry), \
+             patch("update_models.cleanup_temp_files"), \
+             patch("update_models.save_yaml_file", wraps=update_models.save_yaml_file) as save:
+            stats = update_models.main()
+        return stats, {call.args[0].name for call in save.call_args_list}
+
+    @pytest.fixture
+    def configs(self, tmp_path):
+        directory = tmp_path / "configs"
+        directory.mkdir()
+        for src in config_paths():
+            shutil.copy(src, directory / src.name)
+        return directory
+
+    def test_update_renders_every_config_from_one_catalog(self, configs):
+        originals = {path.name: path.read_text(encoding="utf-8") for path in config_paths(configs)}
+        models = list(ProviderCatalog.from_files([configs / "librechat-env-f.yaml"]).get("xai"))
+        models = models[1:] + ["grok-new"]
+
+        stats, dumped = self._update(configs, {"xai": models})
+
+        assert dumped == set()
+        assert sorted(stats.updated_files) == sorted(originals)
+        expected = ProviderCatalog({"xai": models})
+        for name, text in originals.items():
+            assert (configs / name).read_text(encoding="utf-8") == _round_trip(text, expected)
+
+    def test_blocks_the_splice_cannot_express_are_dumped(self, configs):
+        stats, dumped = self._update(configs, {"FastAPI|NAI": ["deepseek-r1", "deepseek-v3", "new"]})
+
+        assert dumped == {"librechat-test.yaml"}
+        assert stats.updated_files == ["librechat-test.yaml"]
+        endpoint = [e for e in YAML().load(configs / "librechat-test.yaml")["endpoints"]["custom"]
+                    if e["name"] == "FastAPI|NAI"][0]
+        assert endpoint["models"]["fetch"] is False
+        assert list(endpoint["models"]["default"]) == ["deepseek-r1", "deepseek-v3", "new"]
+
+    def test_with_shards_the_configs_are_assembled_from_them(self, configs):
+        from shards import load_shards, shard_dir, write_shards
+
+        write_shards(ProviderCatalog.from_files(config_paths(configs)), shard_dir())
+        groq = shard_dir() / "groq.yaml"
+        groq.write_text(groq.read_text(encoding="utf-8") + "  - groq-hand-added\n", encoding="utf-8")
+        before = {path.name: path.read_text(encoding="utf-8") for path in shard_dir().iterdir()}
+        models = list(load_shards().get("xai"))[1:] + ["grok-new"]
+
+        stats, dumped = self._update(configs, {"xai": models})
+
+        after = {path.name: path.read_text(encoding="utf-8") for path in shard_dir().iterdir()}
+        assert [name for name in after if after[name] != before[name]] == ["xai.yaml"]
+        assert load_shards().get("xai") == models
+        for path in config_paths(configs):
+            catalog = ProviderCatalog.from_files([path])
+            if "groq" in catalog:
+                assert catalog.get("groq")[-1] == "groq-hand-added"
+                assert path.name in stats.updated_files
+            if "xai" in catalog:
+                assert catalog.get("xai") == models
@@ -0,0 +1,86 @@
+"""Tests for the machine-readable catalog artifact."""
+from __future__ import annotations
+
+import json
+from unittest.mock import patch
+
+import catalog_export
+from catalog import ProviderCatalog
+from catalog_export import (
+    artifact_path,
+    build_artifact,
+    load_artifact_catalog,
+    models_hash,
+    write_artifact,
+)
+
+
+def _catalog(**providers):
+    return ProviderCatalog(providers)
+
+
+class TestBuildArtifact:
+
+    def test_hashes_and_counts(self):
+        data = build_artifact(_catalog(groq=["a", "b"]), {"groq": "2026-01-01T00:00:00+00:00"})
+        entry = data["providers"]["groq"]
+        assert entry == {
+            "count": 2,
+            "sha256": models_hash(["a", "b"]),
+            "fetched_at": "2026-01-01T00:00:00+00:00",
+            "models": ["a", "b"],
+        }
+
+    def test_top_level_hash_ignores_timestamps(self):
+        catalog = _catalog(groq=["a"], xai=["g"])
+        first = build_artifact(catalog, {"groq": "t1"})
+        second = build_artifact(catalog, {"groq": "t2"})
+        assert first["sha256"] == second["sha256"]
+        assert build_artifact(_catalog(groq=["a"], xai=["h"]))["sha256"] != first["sha256"]
+
+    def test_timestamps_match_case_insensitively_and_carry_over(self):
+        previous = {"providers": {"xai": {"fetched_at": "old"}}}
+        data = build_artifact(_catalog(groq=["a"], xai=["g"]), {"Groq": "new"}, previous)
+        assert data["providers"]["groq"]["fetched_at"] == "new"
+        assert data["providers"]["xai"]["fetched_at"] == "old"
+
+
+class TestWriteArtifact:
+
+    def test_writes_sorted_json(self, tmp_path):
+        path = tmp_path / "models.catalog.json"
+        assert write_artifact(_catalog(xai=["g"], groq=["a"]), path)
+        text = path.read_text(encoding="utf-8")
+        assert list(json.loads(text)["providers"]) == ["groq", "xai"]
+        assert load_artifact_catalog(path).get("xai") == ["g"]
+
+    def test_unchanged_catalog_is_not_rewritten(self, tmp_path):
+        path = tmp_path / "models.catalog.json"
+        write_artifact(_catalog(groq=["a"]), path, {"groq": "t1"})
+        mtime = path.stat().st_mtime_ns
+        assert write_artifact(_catalog(groq=["a"]), path, {"groq": "t2"}) is False
+        assert path.stat().st_mtime_ns == mtime
+        assert write_artifact(_catalog(groq=["b"]), path, {"groq": "t3"}) is True
+        assert json.loads(path.read_text())["providers"]["groq"]["fetched_at"] == "t3"
+
+    def test_msgpack_written_when_available(self, tmp_path):
+        class FakeMsgpack:
+            @staticmethod
+            def packb(data, use_bin_type):
+                return json.dumps(data).encode("utf-8")
+
+        path = tmp_path / "models.catalog.json"
+        with patch.object(catalog_export, "msgpack", FakeMsgpack):
+            write_artifact(_catalog(groq=["a"]), path)
+        assert json.loads(path.with_suffix(".msgpack").read_bytes())["providers"]["groq"]["count"] == 1
+
+    def test_path_from_environment(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("CATALOG_EXPORT_PATH", str(tmp_path / "x.json"))
+        assert artifact_path() == tmp_path / "x.json"
+
+    def test_unreadable_artifact_is_replaced(self, tmp_path):
+        path = tmp_path / "models.catalog.json"
+        path.write_text("{not json", encoding="utf-8")
+        assert load_artifact_catalog(path) is None
+        assert write_artifact(_catalog(groq=["a"]), path)
+        assert load_artifact_catalog(path).get("groq") == ["a"]
@@ -0,0 +1,83 @@
+"""Tests for the weekly churn report."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from churn_report import WEEK, ChurnSeries, build_report, week_start, weekly_series
+from model_index import ModelIndex
+
+
+MONDAY = 1_704_067_200  # 2024-01-01 00:00 UTC
+
+
+def _index(tmp_path, events, listed=("groq", "xai")):
+    index = ModelIndex(tmp_path, ["c.yaml"], tmp_path / "index.json")
+    index.events = events
+    index.models = {name: {"m": {"count": 1 if name in listed else 0}} for name in ("groq", "xai")}
+    return index
+
+
+def _steady_then_quiet(weeks_active, weeks_quiet):
+    """groq: seeded, then two changes a week for a while, then nothing."""
+    events = [[MONDAY, "groq", "seed", 1], [MONDAY, "xai", "seed", 1]]
+    for week in range(1, weeks_active + 1):
+        when = MONDAY + week * WEEK + 3600
+        events += [[when, "groq", "a%d" % week, 1], [when, "groq", "b%d" % week, -1],
+                   [when, "xai", "x%d" % week, 1]]
+    for week in range(weeks_active + 1, weeks_active + weeks_quiet + 1):
+        events.append([MONDAY + week * WEEK + 3600, "xai", "x%d" % week, 1])
+    now = MONDAY + (weeks_active + weeks_quiet + 1) * WEEK + 7200
+    return events, datetime.fromtimestamp(now, tz=timezone.utc)
+
+
+class TestSeries:
+
+    def test_week_start_is_monday_utc(self):
+        assert week_start(MONDAY) == MONDAY
+        assert week_start(MONDAY + WEEK - 1) == MONDAY
+        assert week_start(MONDAY - 1) == MONDAY - WEEK
+
+    def test_first_listing_is_not_churn(self):
+        events = [[MONDAY, "groq", "a", 1], [MONDAY, "groq", "b", 1],
+                  [MONDAY + WEEK, "groq", "c", 1], [MONDAY + 2 * WEEK, "groq", "a", -1]]
+        series = weekly_series(events, MONDAY + 2 * WEEK)["groq"]
+        assert (series.added, series.removed, series.net) == ([0, 1, 0], [0, 0, 1], [0, 1, -1])
+
+    def test_series_are_aligned(self):
+        events = [[MONDAY, "groq", "a", 1], [MONDAY + 2 * WEEK, "xai", "x", 1]]
+        series = weekly_series(events, MONDAY + 3 * WEEK)
+        assert {name: (s.start, len(s.added)) for name, s in series.items()} == {
+            "groq": (MONDAY, 4), "xai": (MONDAY, 4)}
+
+    def test_rates_skip_the_partial_week(self):
+        series = ChurnSeries("groq", MONDAY, [2, 2, 2, 0, 0, 9], [0] * 6)
+        assert series.rates(recent_weeks=2, baseline_weeks=3) == (0.0, 2.0)
+        assert series.rates(recent_weeks=3, baseline_weeks=3) is None
+
+
+class TestReport:
+
+    def test_collapse_is_flagged(self, tmp_path):
+        events, now = _steady_then_quiet(weeks_active=10, weeks_quiet=4)
+        report = build_report(_index(tmp_path, events), now=now, recent_weeks=4, baseline_weeks=8)
+        assert report["collapsed"] == ["groq"]
+        assert report["providers"]["groq"]["recent_rate"] == 0.0
+        assert report["providers"]["groq"]["baseline_rate"] == 2.0
+        assert not report["providers"]["xai"]["collapsed"]
+
+    def test_removed_provider_is_not_flagged(self, tmp_path):
+        events, now = _steady_then_quiet(weeks_active=10, weeks_quiet=4)
+        report = build_report(_index(tmp_path, events, listed=("xai",)), now=now,
+                              recent_weeks=4, baseline_weeks=8)
+        assert report["collapsed"] == []
+
+    def test_weeks_trims_the_arrays(self, tmp_path):
+        events, now = _steady_then_quiet(weeks_active=10, weeks_quiet=4)
+        report = build_report(_index(tmp_path, events), now=now, weeks=3)
+        assert report["providers"]["xai"]["added"] == [1, 1, 0]
+        assert report["start"] == datetime.fromtimestamp(
+            MONDAY + 13 * WEEK, tz=timezone.utc).date().isoformat()
+
+    def test_no_history(self, tmp_path):
+        report = build_report(_index(tmp_path, []))
+        assert (report["providers"], report["start"]) == ({}, None)
@@ -0,0 +1,93 @@
+"""Tests for the cross-file consistency checker."""
+from __future__ import annotations
+
+from pathlib import Path
+
+from consistency import (
+    ERROR,
+    INFO,
+    WARNING,
+    check_documents,
+    check_files,
+    duplicate_ids,
+)
+
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+
+
+def _doc(*endpoints):
+    return {"version": "1.3.11", "endpoints": {"custom": list(endpoints)}}
+
+
+def _endpoint(name, models, **fields):
+    endpoint = {"name": name, "apiKey": "${%s_KEY}" % name.upper(), "baseURL": "https://%s" % name}
+    endpoint.update(fields)
+    endpoint["models"] = {"default": models, "fetch": False}
+    return endpoint
+
+
+def _severities(report):
+    return sorted((f.severity, f.provider, f.message.split(" ")[0]) for f in report.findings)
+
+
+class TestCheckDocuments:
+
+    def test_identical_documents_are_consistent(self):
+        doc = _doc(_endpoint("groq", ["a", "b"]))
+        report = check_documents({"a.yaml": doc, "b.yaml": doc})
+        assert report.ok
+        assert report.findings == []
+
+    def test_api_key_differences_are_ignored(self):
+        user = _endpoint("groq", ["a"])
+        user["apiKey"] = "user_provided"
+        report = check_documents({
+            "env.yaml": _doc(_endpoint("groq", ["a"])),
+            "up.yaml": _doc(user),
+        })
+        assert report.findings == []
+
+    def test_model_drift_is_an_error(self):
+        report = check_documents({
+            "a.yaml": _doc(_endpoint("groq", ["a", "b"])),
+            "b.yaml": _doc(_endpoint("groq", ["a", "b"])),
+            "c.yaml": _doc(_endpoint("groq", ["a"])),
+        })
+        assert not report.ok
+        (finding,) = report.errors
+        assert finding.message == "models.default differs: a.yaml, b.yaml vs c.yaml"
+
+    def test_field_drift_is_a_warning(self):
+        report = check_documents({
+            "a.yaml": _doc(_endpoint("groq", ["a"], titleModel="x")),
+            "b.yaml": _doc(_endpoint("groq", ["a"], titleModel="y")),
+        })
+        assert report.ok
+        assert _severities(report) == [(WARNING, "groq", "titleModel")]
+
+    def test_missing_provider_is_info(self):
+        report = check_documents({
+            "a.yaml": _doc(_endpoint("groq", ["a"]), _endpoint("xai", ["g"])),
+            "b.yaml": _doc(_endpoint("groq", ["a"])),
+        })
+        assert report.ok
+        assert _severities(report) == [(INFO, "xai", "not")]
+
+    def test_duplicates_reported_once_per_distinct_list(self):
+        doc = _doc(_endpoint("groq", ["a", "b", "a"]))
+        report = check_documents({"a.yaml": doc, "b.yaml": doc})
+        assert [f.message for f in report.warnings] == ["duplicate model ids in a.yaml: a"]
+
+    def test_duplicate_ids(self):
+        assert duplicate_ids(["b", "a", "b", "c", "a", "b"]) == ["a", "b"]
+
+
+class TestRealConfigs:
+
+    def test_repo_configs_have_no_errors(self):
+        paths = sorted(REPO_ROOT.glob("librechat-*.yaml"))
+        report = check_files(paths)
+        assert len(report.files) == 5
+        assert report.errors == []
+        assert report.to_dict()["ok"] is True
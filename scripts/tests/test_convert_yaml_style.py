@@ -0,0 +1,126 @@
+"""Tests for the incremental flow -> block conversion in convert_yaml_style.py."""
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import convert_yaml_style
+from convert_yaml_style import (
+    _full_conversion,
+    convert_file,
+    convert_regions,
+    find_flow_sequences,
+    has_flow_sequences,
+)
+
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+
+FLOW = """\
+version: 1.3.11
+endpoints:
+  custom:
+    - name: "A"
+      dropParams: ["stop", 'user', top_p]
+      models:
+        default: [m1, m2]
+        fetch: false
+      empty: []
+"""
+
+
+class TestPreScan:
+
+    def test_no_bracket_short_circuits(self):
+        with patch.object(convert_yaml_style, "YAML") as mock_yaml:
+            assert has_flow_sequences("a:\n  - b\n") is False
+            mock_yaml.assert_not_called()
+
+    def test_bracket_inside_string_is_not_flow(self):
+        assert has_flow_sequences("a: 'see [docs]'\n") is False
+
+    def test_detects_flow_sequence(self):
+        assert has_flow_sequences(FLOW) is True
+
+    @pytest.mark.parametrize("name", [
+        "librechat-env-f.yaml",
+        "librechat-env-l.yaml",
+        "librechat-up-f.yaml",
+        "librechat-up-l.yaml",
+        "librechat-test.yaml",
+    ])
+    def test_real_configs_are_block_style(self, name):
+        assert has_flow_sequences((REPO_ROOT / name).read_text(encoding="utf-8")) is False
+
+
+class TestRegionalConversion:
+
+    def test_matches_full_round_trip(self, tmp_path):
+        regions, convertible = find_flow_sequences(FLOW)
+        assert convertible
+        assert len(regions) == 2
+
+        path = tmp_path / "flow.yaml"
+        path.write_text(FLOW, encoding="utf-8")
+        with patch.object(convert_yaml_style, "create_backup"):
+            _full_conversion(str(path))
+        assert convert_regions(FLOW, regions) == path.read_text(encoding="utf-8")
+
+    def test_keeps_quote_style(self):
+        regions, _ = find_flow_sequences(FLOW)
+        out = convert_regions(FLOW, regions)
+        assert '        - "stop"\n        - \'user\'\n        - top_p\n' in out
+        assert "empty: []" in out
+
+    @pytest.mark.parametrize("text", [
+        "a: [b, [c]]\n",
+        "a: {b: [c]}\n",
+        "list:\n  - [p, q]\n",
+        "a: [b,\n    c]\n",
+        "a: [b]  # note\n",
+        "a: &x [b]\n",
+    ])
+    def test_complex_cases_need_full_conversion(self, text):
+        _, convertible = find_flow_sequences(text)
+        assert convertible is False
+
+
+class TestConvertFile:
+
+    def test_block_style_file_is_untouched(self, tmp_path):
+        path = tmp_path / "block.yaml"
+        shutil.copy(REPO_ROOT / "librechat-env-f.yaml", path)
+        mtime = path.stat().st_mtime_ns
+        with patch.object(convert_yaml_style, "create_backup") as mock_backup, \
+             patch.object(convert_yaml_style, "_full_conversion") as mock_full:
+            assert convert_file(str(path)) is False
+        mock_backup.assert_not_called()
+        mock_full.assert_not_called()
+        assert path.stat().st_mtime_ns == mtime
+
+    def test_empty_flow_sequences_only_is_untouched(self, tmp_path):
+        path = tmp_path / "empty.yaml"
+        path.write_text("a: []\n", encoding="utf-8")
+        with patch.object(convert_yaml_style, "create_backup") as mock_backup:
+            assert convert_file(str(path)) is False
+        mock_backup.assert_not_called()
+
+    def test_flow_file_is_backed_up_and_converted(self, tmp_path):
+        path = tmp_path / "flow.yaml"
+        path.write_text(FLOW, encoding="utf-8")
+        with patch.object(convert_yaml_style, "create_backup") as mock_backup, \
+             patch.object(convert_yaml_style, "_full_conversion") as mock_full:
+            assert convert_file(str(path)) is True
+        mock_backup.assert_called_once()
+        mock_full.assert_not_called()
+        assert find_flow_sequences(path.read_text(encoding="utf-8")) == ([], True)
+
+    def test_complex_file_falls_back_to_full_conversion(self, tmp_path):
+        path = tmp_path / "nested.yaml"
+        path.write_text("a: [b, [c]]\n", encoding="utf-8")
+        with patch.object(convert_yaml_style, "_full_conversion") as mock_full:
+            assert convert_file(str(path)) is True
+        mock_full.assert_called_once_with(str(path))
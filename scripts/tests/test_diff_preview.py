@@ -0,0 +1,144 @@
+"""Tests for the dry-run diff preview."""
+from __future__ import annotations
+
+import shutil
+import subprocess
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from catalog import ProviderCatalog, config_paths
+from diff_preview import BlockChange, block_range, file_diff
+from providers.base import FetchResult, FetchStatus
+from update_models import load_yaml_file, main as update_main
+
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+
+CONFIG = """\
+endpoints:
+  custom:
+    - name: "a"
+      models:
+        default:
+          - one
+          - two
+        fetch: false
+    - name: "b"
+      models:
+        default:
+          - three
+"""
+
+
+def _copy_configs(directory):
+    directory.mkdir()
+    for path in config_paths(REPO_ROOT):
+        shutil.copy(path, directory / path.name)
+    return directory
+
+
+def _git_apply(patch_text, directory):
+    subprocess.run(["git", "apply", "-"], input=patch_text.encode("utf-8"),
+                   cwd=directory, check=True)
+
+
+class TestFileDiff:
+
+    def test_block_range_from_loaded_document(self, tmp_path):
+        path = tmp_path / "c.yaml"
+        path.write_text(CONFIG, encoding="utf-8")
+        custom = load_yaml_file(path)["endpoints"]["custom"]
+        assert block_range(custom[0]["models"]["default"]) == (6, 7)
+        assert block_range(custom[1]["models"]["default"]) == (12, 12)
+
+    def test_block_range_without_line_info(self):
+        assert block_range(["x"]) is None
+        assert block_range(None) is None
+
+    def test_hunks_use_file_line_numbers(self, tmp_path):
+        path = tmp_path / "c.yaml"
+        path.write_text(CONFIG, encoding="utf-8")
+        diff = file_diff(path, [
+            BlockChange("b", 12, 12, ("three", "four")),
+            BlockChange("a", 6, 7, ("one",)),
+        ])
+        assert diff.splitlines() == [
+            "--- a/c.yaml",
+            "+++ b/c.yaml",
+            "@@ -4,7 +4,6 @@",
+            "       models:",
+            "         default:",
+            "           - one",
+            "-          - two",
+            "         fetch: false",
+            '     - name: "b"',
+            "       models:",
+            "@@ -11,2 +10,3 @@",
+            "         default:",
+            "           - three",
+            "+          - four",
+        ]
+        patched = tmp_path / "patched"
+        patched.mkdir()
+        shutil.copy(path, patched / "c.yaml")
+        _git_apply(diff, patched)
+        assert (patched / "c.yaml").read_text(encoding="utf-8") == CONFIG.replace(
+            "          - two\n", "").replace("- three\n", "- three\n          - four\n")
+
+    def test_unchanged_blocks_produce_no_diff(self, tmp_path):
+        path = tmp_path / "c.yaml"
+        path.write_text(CONFIG, encoding="utf-8")
+        assert file_diff(path, [BlockChange("a", 6, 7, ("one", "two"))]) == ""
+
+    def test_flow_style_block_is_not_previewed(self, tmp_path):
+        path = tmp_path / "c.yaml"
+        path.write_text("default: [a, b]\n", encoding="utf-8")
+        assert file_diff(path, [BlockChange("a", 1, 1, ("c",))]) == ""
+
+
+class TestDryRunDiff:
+
+    def _registry(self, provider, models):
+        fetcher = MagicMock()
+        fetcher.return_value.run.return_value = FetchResult(
+            provider_name=provider, models=models, status=FetchStatus.SUCCESS)
+        return {provider: fetcher}
+
+    def _run(self, directory, registry, dry_run):
+        with patch("update_models.os.path.dirname", return_value=str(directory)), \
+             patch("update_models.discover_providers", return_value=registry), \
+             patch("update_models.cleanup_temp_files"):
+            return update_main(dry_run=dry_run)
+
+    def test_diff_matches_a_real_update(self, tmp_path):
+        preview = _copy_configs(tmp_path / "preview")
+        written = _copy_configs(tmp_path / "written")
+        catalog = ProviderCatalog.from_files(config_paths(preview))
+        provider = "xai"
+        models = list(catalog.get(provider))[1:] + ["grok-preview"]
+        registry = self._registry(provider, models)
+
+        stats = self._run(preview, registry, dry_run=True)
+        self._run(written, registry, dry_run=False)
+
+        assert stats.file_diffs
+        assert "+          - grok-preview\n" in stats.combined_diff()
+        _git_apply(stats.combined_diff(), preview)
+        for path in config_paths(written):
+            assert (preview / path.name).read_text(encoding="utf-8") == path.read_text(encoding="utf-8")
+
+    def test_emit_diff_prints_or_saves(self, tmp_path, capsys):
+        from automated_update import emit_diff
+        from update_models import UpdateStats
+
+        stats = UpdateStats()
+        stats.add_file_diff("a.yaml", "--- a/a.yaml\n+++ b/a.yaml\n")
+        emit_diff(stats)
+        assert capsys.readouterr().out == "--- a/a.yaml\n+++ b/a.yaml\n"
+
+        target = tmp_path / "preview.diff"
+        emit_diff(stats, str(target))
+        assert target.read_text(encoding="utf-8") == "--- a/a.yaml\n+++ b/a.yaml\n"
+        assert capsys.readouterr().out == ""
@@ -0,0 +1,89 @@
+"""Tests for EndpointIndex and its use by check_staleness / update_yaml_models."""
+from __future__ import annotations
+
+import pytest
+
+from update_models import EndpointIndex, check_staleness, update_yaml_models
+
+
+class CountingEndpoint(dict):
+    """Endpoint mapping that counts how often its name is read."""
+
+    name_reads = 0
+
+    def get(self, key, default=None):
+        if key == "name":
+            CountingEndpoint.name_reads += 1
+        return super().get(key, default)
+
+
+def _yaml_data(names, endpoint_cls=dict):
+    return {
+        "version": "1.0",
+        "endpoints": {
+            "custom": [
+                endpoint_cls(name=name, models={"default": ["m0", "m1"], "fetch": False})
+                for name in names
+            ]
+        },
+    }
+
+
+class TestEndpointIndex:
+
+    def test_exact_match_by_default(self):
+        index = EndpointIndex(_yaml_data(["groq", "Fireworks"]))
+        assert index.get("groq")["name"] == "groq"
+        assert index.get("Groq") is None
+        assert "Fireworks" in index
+        assert len(index) == 2
+
+    def test_ignore_case(self):
+        index = EndpointIndex(_yaml_data(["groq", "Fireworks"]), ignore_case=True)
+        assert index.get("GROQ")["name"] == "groq"
+        assert index.get("fireworks")["name"] == "Fireworks"
+
+    def test_first_duplicate_wins(self):
+        data = _yaml_data(["dup", "dup"])
+        data["endpoints"]["custom"][1]["models"]["default"] = ["other"]
+        assert EndpointIndex(data).get("dup") is data["endpoints"]["custom"][0]
+
+    @pytest.mark.parametrize("yaml_data", [None, {}, {"version": "1.0"}])
+    def test_empty_documents(self, yaml_data):
+        assert len(EndpointIndex(yaml_data)) == 0
+
+    def test_skips_unnamed_endpoints(self):
+        data = {"endpoints": {"custom": [{"models": {}}, {"name": None}]}}
+        assert len(EndpointIndex(data)) == 0
+
+
+class TestIndexedLookups:
+
+    def test_update_uses_index(self):
+        data = _yaml_data(["A", "B"])
+        index = EndpointIndex(data)
+        assert update_yaml_models(data, "B", ["x"], index=index) is True
+        assert data["endpoints"]["custom"][1]["models"]["default"] == ["x"]
+        assert update_yaml_models(data, "C", ["x"], index=index) is False
+
+    def test_staleness_uses_index(self):
+        data = _yaml_data(["A"])
+        index = EndpointIndex(data)
+        assert check_staleness("A", ["m0"], data, index=index) == (False, 2, 1)
+        assert check_staleness("Z", ["m0"], data, index=index) == (False, 0, 1)
+
+    @pytest.mark.parametrize("count", [200, 800])
+    def test_full_pass_reads_each_endpoint_name_once(self, count):
+        """Staleness + update for every provider scales with endpoint count,
+        not endpoints x providers."""
+        names = ["provider-%d" % i for i in range(count)]
+        data = _yaml_data(names, endpoint_cls=CountingEndpoint)
+        CountingEndpoint.name_reads = 0
+
+        index = EndpointIndex(data)
+        for name in names:
+            is_stale, _, _ = check_staleness(name, ["m0", "m1", "m2"], data, index=index)
+            assert not is_stale
+            assert update_yaml_models(data, name, ["m0", "m1", "m2"], index=index)
+
+        assert CountingEndpoint.name_reads == count
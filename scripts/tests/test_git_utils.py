@@ -0,0 +1,28 @@
+"""Tests for the shared git helpers."""
+from __future__ import annotations
+
+import subprocess
+
+from git_utils import git, hunk_header, parse_hunks
+
+
+class TestHunks:
+
+    def test_hunk_header(self):
+        assert hunk_header("@@ -3,0 +4,2 @@ models:") == (3, 0, 4, 2)
+        assert hunk_header("@@ -7 +7 @@") == (7, 1, 7, 1)
+        assert hunk_header("-@@ -7 +7 @@") is None
+        assert hunk_header("+ default:") is None
+
+    def test_parse_hunks_skips_other_lines(self):
+        diff = "diff --git a/c b/c\n--- a/c\n+++ b/c\n@@ -1 +1 @@\n-a\n+b\n@@ -4,2 +3,0 @@\n-c\n-d\n"
+        assert parse_hunks(diff) == [(1, 1, 1, 1), (4, 2, 3, 0)]
+
+
+class TestGit:
+
+    def test_output_and_failures(self, tmp_path):
+        subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+        assert git(tmp_path, "rev-parse", "--is-inside-work-tree") == "true\n"
+        assert git(tmp_path, "rev-parse", "HEAD") is None
+        assert git(tmp_path / "missing", "status") is None
@@ -0,0 +1,88 @@
+"""Tests for the per-provider model diff engine."""
+from __future__ import annotations
+
+import json
+import time
+
+from model_diff import diff_models, rename_key, write_diff_artifact
+from update_models import UpdateStats
+
+
+class TestDiffModels:
+
+    def test_added_and_removed_keep_list_order(self):
+        diff = diff_models("groq", ["a", "b", "c"], ["c", "e", "d", "a"])
+        assert diff.added == ("e", "d")
+        assert diff.removed == ("b",)
+        assert (diff.old_count, diff.new_count) == (3, 4)
+
+    def test_same_count_swap_is_visible(self):
+        diff = diff_models("groq", ["a", "b"], ["c", "d"])
+        assert diff.changed
+        assert diff.summary() == "+2/-2"
+
+    def test_unchanged(self):
+        diff = diff_models("groq", ["a", "b"], ["b", "a"])
+        assert not diff.changed
+
+    def test_rename_by_basename(self):
+        diff = diff_models(
+            "hf",
+            ["meta-llama/Llama-3-8B", "x/keep"],
+            ["meta/llama-3-8b", "x/keep"],
+        )
+        assert diff.renamed == (("meta-llama/Llama-3-8B", "meta/llama-3-8b"),)
+        assert diff.added == () and diff.removed == ()
+        assert diff.summary() == "+0/-0, 1 renamed"
+
+    def test_ambiguous_rename_stays_add_remove(self):
+        diff = diff_models("hf", ["a/m"], ["b/m", "c/m"])
+        assert diff.renamed == ()
+        assert diff.removed == ("a/m",)
+        assert diff.added == ("b/m", "c/m")
+
+    def test_duplicates_counted_once(self):
+        diff = diff_models("groq", ["a"], ["b", "b"])
+        assert diff.added == ("b",)
+
+    def test_rename_key(self):
+        assert rename_key("Org/Sub/Model-X") == "model-x"
+
+    def test_large_catalog(self):
+        old = ["org/model-%d" % i for i in range(20000)]
+        new = old[500:] + ["org/new-%d" % i for i in range(500)]
+        start = time.perf_counter()
+        diff = diff_models("big", old, new)
+        assert time.perf_counter() - start < 1.0
+        assert len(diff.added) == 500 and len(diff.removed) == 500
+
+
+class TestArtifact:
+
+    def test_write_diff_artifact(self, tmp_path):
+        diffs = {"groq": diff_models("groq", ["a"], ["b"]), "xai": diff_models("xai", ["g"], ["g"])}
+        path = write_diff_artifact(diffs, tmp_path / ".model_diff.json")
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert data["totals"] == {"added": 1, "removed": 1, "renamed": 0, "changed_providers": 1}
+        assert data["providers"]["groq"]["added"] == ["b"]
+        assert list(tmp_path.iterdir()) == [path]
+        assert path.stat().st_mode & 0o777 == 0o644
+
+
+class TestCommitMessageWithDiffs:
+
+    def test_swap_shows_in_subject_and_body(self):
+        stats = UpdateStats()
+        old = ["m%d" % i for i in range(30)]
+        new = ["n%d" % i for i in range(30)]
+        stats.add_provider_result("Nvidia", 30, 30, diff=diff_models("Nvidia", old, new))
+        subject, body = stats.generate_commit_message().split("\n\n", 1)
+        assert "Nvidia +30/-30" in subject
+        assert "Nvidia: 30 -> 30 (+0) [+30/-30]" in body
+
+    def test_count_change_keeps_delta_subject(self):
+        stats = UpdateStats()
+        stats.add_provider_result("OpenRouter", 2, 3, diff=diff_models("OpenRouter", ["a", "b"], ["a", "c", "d"]))
+        msg = stats.generate_commit_message()
+        assert "OpenRouter +1" in msg.split("\n")[0]
+        assert "OpenRouter: 2 -> 3 (+1) [+2/-1]" in msg
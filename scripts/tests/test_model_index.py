@@ -0,0 +1,163 @@
+"""Tests for the first-seen / last-seen model index."""
+from __future__ import annotations
+
+import os
+import subprocess
+
+import pytest
+
+from model_index import ModelIndex, block_owner, listing, parse_log, scalar
+
+
+T0 = 1_700_000_000
+DAY = 86_400
+
+
+def config(**providers):
+    lines = ["version: 1.0.0", "endpoints:", "  custom:"]
+    for name, models in providers.items():
+        lines += ['    - name: "%s"' % name, "      apiKey: x", "      models:", "        default:"]
+        lines += ["          - %s" % model for model in models]
+        lines += ["        fetch: false", "      titleConvo: true"]
+    return "\n".join(lines) + "\n"
+
+
+def _git(repo, *args, when=None):
+    env = dict(os.environ, GIT_AUTHOR_NAME="t", GIT_AUTHOR_EMAIL="t@example.com",
+               GIT_COMMITTER_NAME="t", GIT_COMMITTER_EMAIL="t@example.com")
+    if when is not None:
+        env["GIT_AUTHOR_DATE"] = env["GIT_COMMITTER_DATE"] = "@%d +0000" % when
+    return subprocess.run(["git", "-C", str(repo), *args], check=True, env=env,
+                          capture_output=True, text=True).stdout
+
+
+def commit(repo, when, **files):
+    for name, text in files.items():
+        path = repo / name
+        if text is None:
+            path.unlink()
+        else:
+            path.write_text(text, encoding="utf-8")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", "update", when=when)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = tmp_path / "repo"
+    root.mkdir()
+    _git(root, "init", "-q")
+    commit(root, T0, **{"c.yaml": config(groq=["a", "b"], xai=["x"])})
+    commit(root, T0 + DAY, **{"c.yaml": config(groq=["a", "b", "c"], xai=["x"])})
+    commit(root, T0 + 2 * DAY, **{"c.yaml": config(groq=["c", "a"], xai=["x", "y"])})
+    return root
+
+
+def _index(repo, tmp_path, files=("c.yaml",)):
+    return ModelIndex(repo, files, tmp_path / "index.json")
+
+
+class TestBlockOwner:
+
+    def test_items_of_models_default_only(self):
+        lines = config(groq=["a"]).splitlines()
+        owners = {lines[n].strip(): block_owner(lines, n) for n in range(len(lines))}
+        assert owners['- name: "groq"'] is None
+        assert owners["- a"] == "groq"
+
+    def test_name_after_models_and_zero_offset_items(self):
+        lines = [
+            "endpoints:",
+            "  custom:",
+            "  - models:",
+            "      default:",
+            "      - '7'",
+            "      - \"x/y\"  # comment",
+            "    name: Nvidia",
+        ]
+        assert listing(lines) == {("Nvidia", "7"): 1, ("Nvidia", "x/y"): 1}
+
+    @pytest.mark.parametrize("text,value", [
+        ("plain", "plain"),
+        ("'it''s'", "it's"),
+        ('"a\\"b"', 'a"b'),
+        ("x # note", "x"),
+        ("---FREE---", "---FREE---"),
+    ])
+    def test_scalar(self, text, value):
+        assert scalar(text) == value
+
+
+class TestParseLog:
+
+    def test_deleted_file_is_named_by_its_old_path(self):
+        stream = [
+            "\x00" + "1" * 40 + " 10\n",
+            "diff --git a/c.yaml b/c.yaml\n",
+            "deleted file mode 100644\n",
+            "--- a/c.yaml\n",
+            "+++ /dev/null\n",
+            "@@ -1,2 +0,0 @@\n",
+            "--- x\n",
+            "-b\n",
+        ]
+        [(sha, when, diffs)] = parse_log(stream, ["c.yaml"])
+        assert (when, diffs[0].path, diffs[0].hunks[0][4]) == (10, "c.yaml", ["-- x", "b"])
+
+
+class TestModelIndex:
+
+    def test_first_and_last_seen(self, repo, tmp_path):
+        index = _index(repo, tmp_path)
+        assert index.update() == 3
+        groq = index.provider_models("groq")
+        assert groq["a"]["first_seen"] == T0 and groq["a"]["last_seen"] is None
+        assert groq["c"]["first_seen"] == T0 + DAY
+        assert groq["b"]["last_seen"] == T0 + 2 * DAY and groq["b"]["count"] == 0
+        assert index.lookup("x") == {"xai": index.models["xai"]["x"]}
+
+    def test_reordering_is_not_an_event(self, repo, tmp_path):
+        index = _index(repo, tmp_path)
+        index.update()
+        day2 = [event for event in index.events if event[0] == T0 + 2 * DAY]
+        assert day2 == [[T0 + 2 * DAY, "groq", "b", -1], [T0 + 2 * DAY, "xai", "y", 1]]
+
+    def test_update_reads_only_new_commits(self, repo, tmp_path):
+        _index(repo, tmp_path).update()
+        commit(repo, T0 + 3 * DAY, **{"c.yaml": config(groq=["c", "a", "b"], xai=["y"])})
+        index = _index(repo, tmp_path)
+        assert index.update() == 1
+        assert index.update() == 0
+
+        rebuilt = ModelIndex(repo, ["c.yaml"], tmp_path / "rebuilt.json")
+        rebuilt.update()
+        assert (index.models, index.events) == (rebuilt.models, rebuilt.events)
+        assert index.models["groq"]["b"]["last_seen"] is None
+        assert index.models["groq"]["b"]["first_seen"] == T0
+
+    def test_model_listed_in_any_file_counts(self, repo, tmp_path):
+        commit(repo, T0 + 3 * DAY, **{"d.yaml": config(groq=["c", "a"])})
+        commit(repo, T0 + 4 * DAY, **{"c.yaml": config(groq=["c"], xai=["x", "y"])})
+        index = _index(repo, tmp_path, files=("c.yaml", "d.yaml"))
+        index.update()
+        assert index.models["groq"]["a"]["last_seen"] is None
+        commit(repo, T0 + 5 * DAY, **{"d.yaml": None})
+        index.update()
+        assert index.models["groq"]["a"]["last_seen"] == T0 + 5 * DAY
+        assert index.models["groq"]["c"]["count"] == 1
+
+    def test_rewritten_history_rebuilds(self, repo, tmp_path):
+        index = _index(repo, tmp_path)
+        index.update()
+        _git(repo, "reset", "-q", "--hard", "HEAD~1")
+        commit(repo, T0 + 5 * DAY, **{"c.yaml": config(groq=["a"], xai=["x"])})
+        index = _index(repo, tmp_path)
+        index.update()
+        assert index.models["groq"]["c"]["last_seen"] == T0 + 5 * DAY
+        assert "y" not in index.models["xai"]
+
+    def test_other_files_are_ignored(self, repo, tmp_path):
+        commit(repo, T0 + 3 * DAY, **{"other.yaml": config(groq=["z"])})
+        index = _index(repo, tmp_path)
+        index.update()
+        assert "z" not in index.models["groq"]
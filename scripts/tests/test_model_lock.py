@@ -0,0 +1,168 @@
+"""Tests for models.lock.json and the lock-backed staleness report."""
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from catalog import ProviderCatalog
+from catalog_export import models_hash
+from model_lock import build_lock, lock_matches, lock_path, read_lock, write_lock
+import report_staleness
+from report_staleness import build_lock_report, build_report, usable_lock
+
+
+CONFIG = """\
+endpoints:
+  custom:
+    - name: "a"
+      models:
+        default:
+          - one
+          - two
+    - name: "b"
+      models:
+        default:
+          - three
+"""
+
+T1 = 1_700_000_000
+T2 = T1 + 86_400
+NOW = datetime(2026, 5, 1, 6, 0, tzinfo=timezone.utc)
+
+
+def _git(repo, *args, when=None):
+    env = dict(os.environ, GIT_AUTHOR_NAME="t", GIT_AUTHOR_EMAIL="t@example.com",
+               GIT_COMMITTER_NAME="t", GIT_COMMITTER_EMAIL="t@example.com")
+    if when is not None:
+        env["GIT_AUTHOR_DATE"] = env["GIT_COMMITTER_DATE"] = "@%d +0000" % when
+    subprocess.run(["git", "-C", str(repo), *args], check=True, env=env,
+                   capture_output=True)
+
+
+@pytest.fixture
+def config(tmp_path):
+    path = tmp_path / "c.yaml"
+    path.write_text(CONFIG, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A repo where provider "a" changed at T2 and "b" last changed at T1."""
+    _git(tmp_path, "init", "-q")
+    config = tmp_path / "c.yaml"
+    config.write_text(CONFIG, encoding="utf-8")
+    _git(tmp_path, "add", "c.yaml")
+    _git(tmp_path, "commit", "-q", "-m", "initial", when=T1)
+    config.write_text(CONFIG.replace("- two", "- two-v2"), encoding="utf-8")
+    _git(tmp_path, "commit", "-q", "-am", "update a", when=T2)
+    return tmp_path
+
+
+class TestBuildLock:
+
+    def test_records_hash_count_and_configs(self, config):
+        lock = build_lock(ProviderCatalog({"a": ["one", "two"]}), {config: ["a"]}, now=NOW)
+        assert lock["providers"]["a"] == {
+            "sha256": models_hash(["one", "two"]),
+            "count": 2,
+            "last_changed": NOW.isoformat(),
+        }
+        assert lock["configs"]["c.yaml"]["providers"] == ["a"]
+
+    def test_last_changed_moves_only_with_the_hash(self, config):
+        first = build_lock(ProviderCatalog({"a": ["1"], "b": ["2"]}), {config: ["a", "b"]}, now=NOW)
+        later = NOW + timedelta(days=3)
+        second = build_lock(ProviderCatalog({"a": ["1"], "b": ["3"]}), {config: ["a", "b"]},
+                            previous=first, now=later)
+        assert second["providers"]["a"]["last_changed"] == NOW.isoformat()
+        assert second["providers"]["b"]["last_changed"] == later.isoformat()
+
+    def test_new_providers_take_their_seed(self, config):
+        lock = build_lock(ProviderCatalog({"a": ["1"], "b": ["2"]}), {config: ["a", "b"]},
+                          now=NOW, seed={"a": "2026-01-01T00:00:00+00:00"})
+        assert lock["providers"]["a"]["last_changed"] == "2026-01-01T00:00:00+00:00"
+        assert lock["providers"]["b"]["last_changed"] == NOW.isoformat()
+
+
+class TestWriteLock:
+
+    def test_default_path_is_isolated(self, tmp_path_factory):
+        assert str(lock_path()).startswith(str(tmp_path_factory.getbasetemp()))
+
+    def test_unchanged_lock_is_not_rewritten(self, tmp_path, config):
+        path = tmp_path / "models.lock.json"
+        catalog = ProviderCatalog({"a": ["one", "two"], "b": ["three"]})
+        assert write_lock(catalog, {config: ["a", "b"]}, path, now=NOW)
+        mtime = path.stat().st_mtime_ns
+        assert not write_lock(catalog, {config: ["a", "b"]}, path, now=NOW + timedelta(days=1))
+        assert path.stat().st_mtime_ns == mtime
+        assert read_lock(path)["providers"]["a"]["last_changed"] == NOW.isoformat()
+
+    def test_new_lock_is_seeded_from_git_blame(self, repo):
+        path = repo / "models.lock.json"
+        catalog = ProviderCatalog({"a": ["one", "two-v2"], "b": ["three"]})
+        write_lock(catalog, {repo / "c.yaml": ["a", "b"]}, path, now=NOW, repo_root=repo)
+        providers = read_lock(path)["providers"]
+        assert providers["a"]["last_changed"] == datetime.fromtimestamp(T2, timezone.utc).isoformat()
+        assert providers["b"]["last_changed"] == datetime.fromtimestamp(T1, timezone.utc).isoformat()
+
+    def test_output_is_stable_json(self, tmp_path, config):
+        path = tmp_path / "models.lock.json"
+        write_lock(ProviderCatalog({"b": ["2"], "a": ["1"]}), {config: ["a", "b"]}, path, now=NOW)
+        text = path.read_text(encoding="utf-8")
+        assert text == json.dumps(json.loads(text), indent=2, sort_keys=True) + "\n"
+
+    def test_unreadable_lock_is_ignored(self, tmp_path):
+        path = tmp_path / "models.lock.json"
+        path.write_text("{not json", encoding="utf-8")
+        assert read_lock(path) is None
+
+
+class TestLockReport:
+
+    def _lock(self, repo):
+        path = repo / "models.lock.json"
+        catalog = ProviderCatalog({"a": ["one", "two-v2"], "b": ["three"]})
+        write_lock(catalog, {repo / "c.yaml": ["a", "b"]}, path, now=NOW, repo_root=repo)
+        return read_lock(path)
+
+    def test_matches_the_git_report(self, repo):
+        now = datetime.fromtimestamp(T2, timezone.utc) + timedelta(days=6)
+        from_git = build_report(repo, ["c.yaml"], weeks=1, now=now)
+        from_lock = build_lock_report(repo, ["c.yaml"], weeks=1, lock=self._lock(repo), now=now)
+        assert from_lock == from_git
+
+    def test_edited_config_no_longer_matches(self, repo):
+        lock = self._lock(repo)
+        assert lock_matches(lock, [repo / "c.yaml"])
+        (repo / "c.yaml").write_text(CONFIG, encoding="utf-8")
+        assert not lock_matches(lock, [repo / "c.yaml"])
+
+    def test_unlisted_config_does_not_match(self, repo):
+        assert not lock_matches(self._lock(repo), [repo / "c.yaml", repo / "d.yaml"])
+
+    def test_usable_lock_reads_the_configured_path(self, repo, monkeypatch):
+        monkeypatch.setenv("MODEL_LOCK_PATH", str(repo / "models.lock.json"))
+        assert usable_lock(repo, ["c.yaml"]) is None
+        self._lock(repo)
+        assert usable_lock(repo, ["c.yaml"])["version"] == 1
+
+    def test_repo_root_is_answered_from_its_own_lock(self, repo, monkeypatch, capsys):
+        # MODEL_LOCK_PATH (isolated by conftest) has no lock; the repo does.
+        self._lock(repo)
+        monkeypatch.setattr("sys.argv", ["report_staleness.py", "--repo-root", str(repo),
+                                         "--file", "c.yaml", "--source", "lock", "--json"])
+        assert report_staleness.main() == 0
+        assert "answered from models.lock.json" in capsys.readouterr().err
+        assert usable_lock(repo, ["c.yaml"])["version"] == 1
+
+    def test_provider_without_time_counts_as_failed(self, repo):
+        lock = self._lock(repo)
+        lock["providers"]["b"]["last_changed"] = None
+        report = build_lock_report(repo, ["c.yaml"], weeks=1, lock=lock, now=NOW)
+        assert report["blame_failed"] == ["b"]
@@ -0,0 +1,98 @@
+"""Tests for shared, interned model lists."""
+from __future__ import annotations
+
+import io
+import pickle
+import sys
+
+import pytest
+from ruamel.yaml import YAML
+
+from catalog import ProviderCatalog
+from model_store import FrozenModelList, ModelListStore, freeze_models
+from update_models import EndpointIndex, update_yaml_models
+
+
+def _doc():
+    return {"endpoints": {"custom": [{"name": "groq", "models": {"default": ["old"]}}]}}
+
+
+class TestFrozenModelList:
+
+    def test_is_read_only(self):
+        frozen = freeze_models(["a", "b"])
+        for mutate in (
+            lambda: frozen.append("c"),
+            lambda: frozen.extend(["c"]),
+            lambda: frozen.__setitem__(0, "c"),
+            lambda: frozen.sort(),
+        ):
+            with pytest.raises(TypeError):
+                mutate()
+        assert frozen == ["a", "b"]
+
+    def test_dumps_like_a_plain_list(self):
+        yaml = YAML()
+        yaml.indent(mapping=2, sequence=4, offset=2)
+        models = ["a/b", "7", "---FREE---", "x: y"]
+
+        def dump(value):
+            buf = io.StringIO()
+            yaml.dump({"default": value}, buf)
+            return buf.getvalue()
+
+        assert dump(freeze_models(models)) == dump(models)
+
+    def test_providers_with_equal_lists_are_not_aliased(self):
+        doc = YAML().load(
+            "endpoints:\n  custom:\n"
+            "    - name: a\n      models:\n        default:\n          - old\n"
+            "    - name: b\n      models:\n        default:\n          - older\n"
+        )
+        store = ModelListStore()
+        index = EndpointIndex(doc)
+        for provider in ("a", "b"):
+            assert update_yaml_models(doc, provider, store.share(provider, ["x", "y"]), index=index)
+        buf = io.StringIO()
+        yaml = YAML()
+        yaml.indent(mapping=2, sequence=4, offset=2)
+        yaml.dump(doc, buf)
+        text = buf.getvalue()
+        assert "&" not in text and "*" not in text
+        assert text.count("          - x\n          - y\n") == 2
+
+    def test_pickles(self):
+        frozen = freeze_models(["a"])
+        clone = pickle.loads(pickle.dumps(frozen))
+        assert isinstance(clone, FrozenModelList) and clone == ["a"]
+
+
+class TestModelListStore:
+
+    def test_equal_lists_share_one_object(self):
+        store = ModelListStore()
+        first = store.share("groq", ["a", "b"])
+        second = store.share("groq-mirror", ("a", "b"))
+        assert first is second
+        assert store.get("groq") is first
+        assert len(store) == 2
+
+    def test_ids_are_interned(self):
+        store = ModelListStore()
+        ids = ["".join(["model", "-x"])]
+        shared = store.share("groq", ids)
+        assert shared[0] is sys.intern("model-x")
+
+    def test_every_document_references_the_shared_list(self):
+        store = ModelListStore()
+        models = store.share("groq", ["new-1", "new-2"])
+        documents = [_doc() for _ in range(5)]
+        for doc in documents:
+            assert update_yaml_models(doc, "groq", models, index=EndpointIndex(doc))
+        assert all(
+            doc["endpoints"]["custom"][0]["models"]["default"] is models for doc in documents
+        )
+
+    def test_catalog_shares_lists(self):
+        catalog = ProviderCatalog({"A": ["x", "y"], "B": ["x", "y"]})
+        assert catalog.get("A") is catalog.get("B")
@@ -0,0 +1,231 @@
+"""Tests for report_staleness.py's git blame handling."""
+from __future__ import annotations
+
+import os
+import subprocess
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+import report_staleness
+from blame_cache import BlameCache, line_ranges, remap_lines
+from catalog import ProviderCatalog
+from git_utils import parse_hunks
+from report_staleness import (
+    blame_line_times,
+    blame_max_committer_time,
+    build_report,
+    resolve_files,
+    parse_porcelain,
+    range_max_times,
+    shard_times,
+)
+from shards import write_shards
+
+
+CONFIG = """\
+endpoints:
+  custom:
+    - name: "a"
+      models:
+        default:
+          - one
+          - two
+    - name: "b"
+      models:
+        default:
+          - three
+"""
+
+T1 = 1_700_000_000
+T2 = T1 + 86_400
+
+
+def _git(repo, *args, when=None):
+    env = dict(os.environ, GIT_AUTHOR_NAME="t", GIT_AUTHOR_EMAIL="t@example.com",
+               GIT_COMMITTER_NAME="t", GIT_COMMITTER_EMAIL="t@example.com")
+    if when is not None:
+        env["GIT_AUTHOR_DATE"] = env["GIT_COMMITTER_DATE"] = "@%d +0000" % when
+    subprocess.run(["git", "-C", str(repo), *args], check=True, env=env,
+                   capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A repo where provider "a" changed at T2 and "b" last changed at T1."""
+    _git(tmp_path, "init", "-q")
+    config = tmp_path / "c.yaml"
+    config.write_text(CONFIG, encoding="utf-8")
+    _git(tmp_path, "add", "c.yaml")
+    _git(tmp_path, "commit", "-q", "-m", "initial", when=T1)
+    config.write_text(CONFIG.replace("- two", "- two-v2"), encoding="utf-8")
+    _git(tmp_path, "commit", "-q", "-am", "update a", when=T2)
+    return tmp_path
+
+
+class TestPorcelain:
+
+    def test_commit_headers_are_shared_by_later_lines(self):
+        sha1, sha2 = "1" * 40, "2" * 40
+        output = "\n".join([
+            "%s 1 6 1" % sha1, "author x", "committer-time %d" % T1, "filename c.yaml", "\t- one",
+            "%s 2 7 1" % sha2, "committer-time %d" % T2, "filename c.yaml", "\t- two",
+            "%s 5 11 1" % sha1, "filename c.yaml", "\t- three",
+        ])
+        assert parse_porcelain(output) == {6: T1, 7: T2, 11: T1}
+
+    def test_range_max_times(self):
+        times = {6: T1, 7: T2, 11: T1}
+        assert range_max_times(times, {"a": (6, 7), "b": (11, 11), "c": (20, 21)}) == {
+            "a": T2, "b": T1, "c": 0,
+        }
+
+
+class TestBlame:
+
+    def test_one_blame_covers_every_range(self, repo):
+        ranges = report_staleness.find_provider_ranges(repo / "c.yaml")
+        assert ranges == {"a": (6, 7), "b": (11, 11)}
+
+        with patch("report_staleness.subprocess.run", wraps=subprocess.run) as run:
+            times = range_max_times(blame_line_times(repo, "c.yaml", list(ranges.values())), ranges)
+        assert run.call_count == 1
+        assert times == {"a": T2, "b": T1}
+
+    def test_single_range_wrapper(self, repo):
+        assert blame_max_committer_time(repo, "c.yaml", 11, 11) == T1
+
+    def test_failure_returns_nothing(self, tmp_path):
+        assert blame_line_times(tmp_path, "missing.yaml", [(1, 2)]) == {}
+        assert blame_max_committer_time(tmp_path, "missing.yaml", 1, 2) == 0
+
+
+class TestBlameCache:
+
+    def _cache(self, repo, tmp_path):
+        calls = []
+
+        def blame(root, rel_path, ranges):
+            calls.append(list(ranges))
+            return blame_line_times(root, rel_path, ranges)
+
+        return BlameCache(repo, blame, cache_dir=tmp_path / "cache"), calls
+
+    def test_line_ranges(self):
+        assert line_ranges([5, 1, 2, 3, 7, 8]) == [(1, 3), (5, 5), (7, 8)]
+
+    def test_remap_lines(self):
+        diff = "@@ -2,0 +3,2 @@\n+x\n+y\n@@ -5 +7 @@\n-a\n+b\n@@ -8,2 +9,0 @@\n-c\n-d\n"
+        hunks = parse_hunks(diff)
+        assert hunks == [(2, 0, 3, 2), (5, 1, 7, 1), (8, 2, 9, 0)]
+        times = {n: n * 10 for n in range(1, 11)}
+        assert remap_lines(times, hunks) == {
+            1: 10, 2: 20, 5: 30, 6: 40, 8: 60, 9: 70, 10: 100,
+        }
+
+    def test_unchanged_file_is_not_blamed_again(self, repo, tmp_path):
+        cache, calls = self._cache(repo, tmp_path)
+        first = cache.line_times("c.yaml", [(6, 7), (11, 11)])
+        second = cache.line_times("c.yaml", [(6, 7), (11, 11)])
+        assert first == second == {6: T1, 7: T2, 11: T1}
+        assert calls == [[(6, 7), (11, 11)]]
+
+    def test_new_commit_blames_only_changed_lines(self, repo, tmp_path):
+        cache, calls = self._cache(repo, tmp_path)
+        cache.line_times("c.yaml", [(6, 7), (11, 11)])
+
+        config = repo / "c.yaml"
+        text = config.read_text(encoding="utf-8")
+        config.write_text(text.replace("- one\n", "- zero\n          - one\n"), encoding="utf-8")
+        _git(repo, "commit", "-q", "-am", "add zero", when=T2 + 86_400)
+
+        times = cache.line_times("c.yaml", [(6, 8), (12, 12)])
+        assert calls[1] == [(6, 6)]
+        assert times == blame_line_times(repo, "c.yaml", [(6, 8), (12, 12)])
+        assert times == {6: T2 + 86_400, 7: T1, 8: T2, 12: T1}
+
+    def test_uncommitted_changes_are_blamed(self, repo, tmp_path):
+        cache, calls = self._cache(repo, tmp_path)
+        cache.line_times("c.yaml", [(11, 11)])
+        config = repo / "c.yaml"
+        config.write_text(config.read_text(encoding="utf-8") + "# note\n", encoding="utf-8")
+
+        assert cache.line_times("c.yaml", [(11, 11)]) == {11: T1}
+        assert calls == [[(11, 11)], [(11, 11)]]
+
+    def test_disabled_by_environment(self, repo, monkeypatch):
+        monkeypatch.setenv("BLAME_CACHE", "0")
+        with patch("report_staleness.BlameCache") as cache:
+            assert report_staleness.cached_blame_line_times(repo, "c.yaml", [(11, 11)]) == {11: T1}
+        cache.assert_not_called()
+
+
+class TestMultiFileReport:
+
+    # One week before NOW lies between T1 and T2.
+    NOW = datetime.fromtimestamp(T2 + 7 * 86_400 - 43_200, tz=timezone.utc)
+
+    @pytest.fixture
+    def two_files(self, repo):
+        """c.yaml as in `repo`; d.yaml lists "a" (unchanged since T1) and "c"."""
+        (repo / "d.yaml").write_text(CONFIG.replace('"b"', '"c"'), encoding="utf-8")
+        _git(repo, "add", "d.yaml")
+        _git(repo, "commit", "-q", "-m", "add d", when=T1)
+        return repo
+
+    def test_resolve_files(self, two_files):
+        assert resolve_files(two_files, ["*.yaml", "c.yaml"]) == ["c.yaml", "d.yaml"]
+        assert resolve_files(two_files, ["missing.yaml"]) == ["missing.yaml"]
+
+    def test_single_file_report_keeps_its_shape(self, repo):
+        report = build_report(repo, ["c.yaml"], weeks=1, now=self.NOW)
+        assert sorted(report) == ["blame_failed", "file", "fresh", "generated_at",
+                                  "stale", "threshold_weeks"]
+        assert report["file"] == "c.yaml"
+        assert report["fresh"] == ["a"]
+        assert [s["provider"] for s in report["stale"]] == ["b"]
+
+    def test_per_file_and_aggregate_buckets(self, two_files):
+        report = build_report(two_files, ["c.yaml", "d.yaml", "gone.yaml"], weeks=1, now=self.NOW)
+        assert sorted(report["files"]) == ["c.yaml", "d.yaml"]
+        assert report["files"]["c.yaml"]["fresh"] == ["a"]
+        assert [s["provider"] for s in report["files"]["d.yaml"]["stale"]] == ["a", "c"]
+        # "a" changed recently in c.yaml, so it is fresh overall.
+        assert report["fresh"] == ["a"]
+        assert sorted(s["provider"] for s in report["stale"]) == ["b", "c"]
+        assert report["blame_failed"] == []
+
+
+class TestShards:
+
+    T3 = T2 + 10 * 86_400
+    T4 = T3 + 86_400
+
+    @pytest.fixture
+    def sharded(self, repo):
+        """`repo` split into shards at T3; then only b's shard changed, at T4."""
+        write_shards(ProviderCatalog.from_files([repo / "c.yaml"]), repo / "models")
+        _git(repo, "add", "models")
+        _git(repo, "commit", "-q", "-m", "split", when=self.T3)
+        shard = repo / "models" / "b.yaml"
+        shard.write_text(shard.read_text(encoding="utf-8") + "  - four\n", encoding="utf-8")
+        _git(repo, "commit", "-q", "-am", "update b", when=self.T4)
+        return repo
+
+    def test_only_changes_after_the_split_count(self, sharded):
+        assert shard_times(sharded, sharded / "models") == {"b": self.T4}
+
+    def test_answered_providers_are_not_blamed_in_the_config(self, sharded):
+        answered = shard_times(sharded, sharded / "models")
+        with patch("report_staleness.cached_blame_line_times",
+                   wraps=report_staleness.cached_blame_line_times) as blame:
+            result = report_staleness.inspect_file(sharded, "c.yaml", answered)
+        assert result["times"] == {"a": T2, "b": self.T4}
+        blame.assert_called_once_with(sharded, "c.yaml", [(6, 7)])
+
+    def test_uncommitted_and_edited_shards_are_ignored(self, sharded):
+        (sharded / "models" / "new.yaml").write_text(
+            '# x\n# y\nname: "new"\nmodels:\n  - m\n', encoding="utf-8")
+        (sharded / "models" / "b.yaml").write_text("name: b\nmodels: [three]\n", encoding="utf-8")
+        assert shard_times(sharded, sharded / "models") == {}
@@ -0,0 +1,127 @@
+"""Tests for the SQLite run history."""
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from providers.base import FetchResult, FetchStatus
+from run_history import RunHistory, history_path, main, open_history, render_markdown
+
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _result(provider, models, day, status=FetchStatus.SUCCESS):
+    result = FetchResult(provider_name=provider, models=models, status=status,
+                         error_message=None if status == FetchStatus.SUCCESS else "boom")
+    result.timestamp = START + timedelta(days=day)
+    result.duration_s = 0.5
+    result.response_bytes = 1234
+    return result
+
+
+@pytest.fixture
+def history(tmp_path):
+    with RunHistory(tmp_path / "history.sqlite3") as history:
+        yield history
+
+
+def _record(history, *results):
+    run_id = history.start_run()
+    for result in results:
+        history.record(run_id, result)
+    history.finish_run(run_id)
+
+
+class TestRunHistory:
+
+    def test_changes_and_last_change(self, history):
+        _record(history, _result("groq", ["a"], 0))
+        _record(history, _result("groq", ["a"], 1))
+        _record(history, _result("groq", ["a", "b"], 2))
+        _record(history, _result("groq", [], 3, FetchStatus.NETWORK_ERROR))
+        _record(history, _result("groq", ["a", "b"], 4))
+
+        changes = history.changes("groq")
+        assert [c["model_count"] for c in changes] == [1, 2]
+        assert history.last_change("groq") == (START + timedelta(days=2)).isoformat()
+        assert history.failure_streak("groq") == 0
+
+    def test_reverting_to_an_earlier_list_is_a_change(self, history):
+        for day, models in enumerate([["a"], ["a", "b"], ["a"]]):
+            _record(history, _result("xai", models, day))
+        assert len(history.changes("xai")) == 3
+        assert history.last_change("xai") == (START + timedelta(days=2)).isoformat()
+
+    def test_failure_streak(self, history):
+        _record(history, _result("groq", ["a"], 0))
+        _record(history, _result("groq", [], 1, FetchStatus.AUTH_ERROR))
+        _record(history, _result("groq", [], 2, FetchStatus.EMPTY))
+        assert history.failure_streak("groq") == 2
+        assert history.failure_streak("never-fetched") == 0
+        assert history.summary("groq")["last_status"] == "empty"
+
+    def test_identical_lists_are_stored_once(self, history, tmp_path):
+        _record(history, _result("a", ["x", "y"], 0), _result("b", ["x", "y"], 0))
+        _record(history, _result("a", ["x", "y"], 1))
+        conn = sqlite3.connect(str(tmp_path / "history.sqlite3"))
+        assert conn.execute("SELECT COUNT(*) FROM model_lists").fetchone()[0] == 1
+        assert conn.execute("SELECT COUNT(*) FROM provider_results").fetchone()[0] == 3
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(provider_results)")}
+        assert {"provider_results_provider_time", "provider_results_time"} <= indexes
+
+    def test_timings_and_sizes_are_kept(self, history):
+        _record(history, _result("groq", ["a"], 0))
+        summary = history.summary("groq")
+        assert summary["duration_s"] == 0.5
+        assert summary["response_bytes"] == 1234
+
+    def test_markdown_lists_timings_and_flags_failure_streaks(self, history):
+        _record(history, _result("fast", ["a"], 0), _result("slow", ["b"], 0))
+        for day in (1, 2, 3):
+            _record(history, _result("fast", [], day, FetchStatus.NETWORK_ERROR))
+        slow = history.summary("slow")
+        slow["duration_s"] = 4.0
+        text = render_markdown([history.summary("fast"), slow])
+        rows = [line for line in text.splitlines() if line.startswith("| ")]
+        assert rows[1] == "| slow | success | 1 | 4.00s | 1.2 KiB | 0 | 2026-01-01 |"
+        assert rows[2].startswith("| fast | network_error | 0 | 0.50s | 1.2 KiB | 3 |")
+        assert text.endswith("Failing for 3+ runs in a row: fast\n")
+
+    def test_cli_reads_the_recorded_history(self, capsys):
+        assert main(["--markdown"]) == 1
+        with RunHistory(history_path()) as history:
+            _record(history, _result("groq", ["a"], 0))
+        assert main(["--markdown"]) == 0
+        assert "| groq | success | 1 | 0.50s |" in capsys.readouterr().out
+
+    def test_disabled_by_environment(self, monkeypatch):
+        monkeypatch.setenv("RUN_HISTORY", "0")
+        assert open_history() is None
+
+
+class TestUpdateIntegration:
+
+    def test_main_records_every_fetch(self):
+        from update_models import main as update_main
+
+        fetchers = {}
+        for name, status, models in [("good", FetchStatus.SUCCESS, ["m1"]),
+                                     ("bad", FetchStatus.NETWORK_ERROR, [])]:
+            fetcher = MagicMock()
+            fetcher.return_value.run.return_value = FetchResult(
+                provider_name=name, models=models, status=status)
+            fetchers[name] = fetcher
+
+        with patch("update_models.discover_providers", return_value=fetchers), \
+             patch("update_models.load_yaml_file", return_value=None), \
+             patch("update_models.cleanup_temp_files"):
+            update_main(dry_run=True)
+
+        with RunHistory(history_path()) as history:
+            assert history.providers() == ["bad", "good"]
+            assert history.failure_streak("bad") == 1
+            assert history.summary("good")["model_count"] == 1
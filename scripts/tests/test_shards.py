@@ -0,0 +1,99 @@
+"""Tests for per-provider model shards and the assembler."""
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from catalog import ProviderCatalog, config_paths
+from shards import (
+    assemble,
+    load_shards,
+    render_shard,
+    shard_item_range,
+    shard_name,
+    shards_enabled,
+    write_shards,
+)
+
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+
+
+@pytest.fixture
+def configs(tmp_path):
+    root = tmp_path / "repo"
+    root.mkdir()
+    for path in config_paths(REPO_ROOT):
+        shutil.copy(path, root / path.name)
+    return config_paths(root)
+
+
+class TestShardFiles:
+
+    @pytest.mark.parametrize("provider,name", [
+        ("OpenRouter", "openrouter.yaml"),
+        ("together.ai", "together-ai.yaml"),
+        ("FastAPI|NAI", "fastapi-nai.yaml"),
+        ("Github Models", "github-models.yaml"),
+    ])
+    def test_shard_name(self, provider, name):
+        assert shard_name(provider) == name
+
+    def test_round_trip_keeps_quoting(self, tmp_path):
+        catalog = ProviderCatalog({"A|B": ["7", "x/y", "---FREE---"]})
+        write_shards(catalog, tmp_path)
+        text = (tmp_path / "a-b.yaml").read_text(encoding="utf-8")
+        assert "  - '7'\n" in text
+        assert load_shards(tmp_path).get("A|B") == ["7", "x/y", "---FREE---"]
+
+    def test_only_changed_shards_are_rewritten(self, tmp_path):
+        write_shards(ProviderCatalog({"a": ["1"], "b": ["2"]}), tmp_path)
+        written = write_shards(ProviderCatalog({"a": ["1"], "b": ["3"]}), tmp_path)
+        assert written == [tmp_path / "b.yaml"]
+
+    def test_prunes_removed_providers(self, tmp_path):
+        write_shards(ProviderCatalog({"a": ["1"], "b": ["2"]}), tmp_path)
+        write_shards(ProviderCatalog({"a": ["1"]}), tmp_path)
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["a.yaml"]
+
+    def test_slug_collision_is_an_error(self, tmp_path):
+        with pytest.raises(ValueError):
+            write_shards(ProviderCatalog({"a.b": ["1"], "a b": ["2"]}), tmp_path)
+
+    def test_enabled_only_when_directory_exists(self, tmp_path):
+        assert not shards_enabled(tmp_path / "models")
+        (tmp_path / "models").mkdir()
+        assert shards_enabled(tmp_path / "models")
+
+    def test_render_shard_format(self):
+        text = render_shard(ProviderCatalog({"groq": ["a"]}), "groq")
+        assert text.endswith('name: "groq"\nmodels:\n  - a\n')
+
+    def test_shard_item_range(self, tmp_path):
+        write_shards(ProviderCatalog({"A|B": ["1", "2"], "empty": []}), tmp_path)
+        assert shard_item_range(tmp_path / "a-b.yaml") == ("A|B", 5, 6)
+        assert shard_item_range(tmp_path / "empty.yaml") is None
+        (tmp_path / "edited.yaml").write_text("name: x\nmodels: [1]\n", encoding="utf-8")
+        assert shard_item_range(tmp_path / "edited.yaml") is None
+        assert shard_item_range(tmp_path / "missing.yaml") is None
+
+
+class TestAssemble:
+
+    def test_split_then_assemble_is_identity(self, configs, tmp_path):
+        shard_dir = tmp_path / "models"
+        write_shards(ProviderCatalog.from_files(configs), shard_dir)
+        assert assemble(shard_dir, configs, check=True) == []
+
+    def test_edited_shard_reaches_every_config(self, configs, tmp_path):
+        shard_dir = tmp_path / "models"
+        write_shards(ProviderCatalog.from_files(configs), shard_dir)
+        shard = shard_dir / "xai.yaml"
+        shard.write_text(shard.read_text(encoding="utf-8") + "  - grok-new\n", encoding="utf-8")
+
+        written = assemble(shard_dir, configs)
+        assert sorted(written) == sorted(p for p in configs if "xai" in ProviderCatalog.from_files([p]))
+        for path in written:
+            assert "          - grok-new\n" in path.read_text(encoding="utf-8")
@@ -0,0 +1,106 @@
+"""Tests for tuned per-provider staleness thresholds."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import update_models
+from report_staleness import classify
+from staleness_thresholds import (
+    MAX_RATIO,
+    ProviderThreshold,
+    Thresholds,
+    change_points,
+    thresholds_path,
+    tune,
+    tune_provider,
+)
+
+
+DAY = 86_400
+T0 = 1_700_000_000
+
+
+def _points(counts, gap_days=1):
+    return [(T0 + i * gap_days * DAY, count) for i, count in enumerate(counts)]
+
+
+class TestTuning:
+
+    def test_change_points_net_each_commit(self):
+        events = [[T0, "p", "a", 1], [T0, "p", "b", 1], [T0 + DAY, "p", "c", 1],
+                  [T0 + DAY, "p", "a", -1], [T0 + 2 * DAY, "p", "d", 1]]
+        assert change_points(events) == {"p": [(T0, 2), (T0 + DAY, 2), (T0 + 2 * DAY, 3)]}
+
+    def test_too_little_history_keeps_the_defaults(self):
+        assert tune_provider(_points([10, 11, 12])) is None
+
+    def test_daily_steady_provider_gets_a_tight_gate(self):
+        threshold = tune_provider(_points([300, 302, 301, 305, 304, 306, 308, 307]))
+        assert threshold.weeks == 1
+        assert threshold.count_ratio == MAX_RATIO
+
+    def test_rare_changes_get_a_longer_window(self):
+        threshold = tune_provider(_points([4, 5, 5, 6, 5, 6], gap_days=70))
+        assert threshold.weeks == 15
+        # Dropping one of ~5 models must not trip the gate.
+        assert threshold.count_ratio <= 0.7
+
+    def test_gate_stays_below_the_deepest_legitimate_drop(self):
+        threshold = tune_provider(_points([100, 110, 60, 120, 125, 130]))
+        assert threshold.count_ratio < 60 / 110
+
+    def test_round_trip(self, tmp_path):
+        thresholds = tune([[T0 + i * DAY, "p", "m%d" % i, 1] for i in range(8)])
+        thresholds.save(tmp_path / "t.json")
+        loaded = Thresholds.load(tmp_path / "t.json")
+        assert loaded.providers == thresholds.providers
+        assert loaded.weeks("other") == 4 and loaded.count_ratio("other") == 0.5
+
+    def test_providers_with_little_history_are_listed_untuned(self, tmp_path):
+        events = [[T0, "p", "a", 1], [T0, "p", "b", 1], [T0 + DAY, "p", "c", 1]]
+        thresholds = tune(events)
+        assert thresholds.providers["p"] == ProviderThreshold(
+            weeks=None, count_ratio=None, changes=1, median_count=2)
+        thresholds.save(tmp_path / "t.json")
+        loaded = Thresholds.load(tmp_path / "t.json")
+        assert not loaded and loaded.tuned_weeks() == {}
+        assert loaded.weeks("p") == 4 and loaded.count_ratio("p", default=0.3) == 0.3
+
+    def test_unreadable_file_means_no_thresholds(self, tmp_path):
+        path = tmp_path / "t.json"
+        path.write_text('{"version": 1, "providers": {"p": {"weeks": 1}}}', encoding="utf-8")
+        assert not Thresholds.load(path)
+
+
+class TestGates:
+
+    @pytest.fixture
+    def stored(self):
+        thresholds = Thresholds({"Nvidia": ProviderThreshold(weeks=1, count_ratio=0.8,
+                                                             changes=20, median_count=10)})
+        thresholds.save(thresholds_path())
+        return Thresholds.load()
+
+    def test_count_gate_uses_the_tuned_ratio(self, stored):
+        data = {"endpoints": {"custom": [{"name": "Nvidia", "models": {"default": ["m"] * 10}}]}}
+        threshold = update_models.staleness_threshold("Nvidia", stored)
+        assert threshold == 0.8
+        assert update_models.check_staleness("Nvidia", ["m"] * 7, data, threshold=threshold)[0]
+        assert not update_models.check_staleness("Nvidia", ["m"] * 7, data)[0]
+        assert update_models.staleness_threshold("groq", stored) == update_models.STALENESS_THRESHOLD
+
+    def test_explicit_threshold_applies_to_every_provider(self, stored, monkeypatch):
+        monkeypatch.setattr(update_models, "STALENESS_THRESHOLD_FIXED", True)
+        assert update_models.staleness_threshold("Nvidia", stored) == update_models.STALENESS_THRESHOLD
+
+    def test_report_uses_per_provider_weeks(self):
+        now = datetime(2026, 5, 1, tzinfo=timezone.utc)
+        ten_days_ago = int((now - timedelta(days=10)).timestamp())
+        times = {"fast": ten_days_ago, "slow": ten_days_ago}
+        buckets = classify(times, now, 4, provider_weeks={"fast": 1})
+        assert buckets["fresh"] == ["slow"]
+        assert buckets["stale"][0]["provider"] == "fast"
+        assert buckets["stale"][0]["threshold_weeks"] == 1
+        assert "threshold_weeks" not in classify(times, now, 1)["stale"][0]
@@ -0,0 +1,130 @@
+"""Tests for the constant-memory models.default stream rewriter."""
+from __future__ import annotations
+
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from catalog import ProviderCatalog, render_file
+from stream_rewrite import iter_formatted_items, rewrite_models
+
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+
+CONFIG = """\
+version: 1.3.11
+endpoints:
+  custom:
+    # Alpha
+    - name: "Alpha"
+      models:
+        default:
+          - a-1
+          - a-2
+        fetch: false
+      dropParams:
+        - "stop"
+    - models:
+        default:
+          - x-1
+      name: "Late"
+    - name: "Flow"
+      models:
+        default: [f-1]
+    - name: "Beta"
+      models:
+        default:
+          - b-1
+        fetch: false
+"""
+
+
+def _write_synthetic(path, count):
+    with path.open("w", encoding="utf-8") as f:
+        f.write('version: 1.3.11\nendpoints:\n  custom:\n    - name: "Big"\n'
+                '      models:\n        default:\n')
+        for i in range(count):
+            f.write("          - org/model-%d\n" % i)
+        f.write("        fetch: false\n")
+
+
+@pytest.fixture
+def config(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text(CONFIG, encoding="utf-8")
+    return path
+
+
+class TestRewriteModels:
+
+    def test_replaces_only_targeted_blocks(self, config, tmp_path):
+        out = tmp_path / "out.yaml"
+        rewritten, skipped = rewrite_models(config, out, {"Beta": ["b-9", "7"]})
+        assert rewritten == ["Beta"]
+        assert skipped == []
+        assert out.read_text(encoding="utf-8") == CONFIG.replace(
+            "          - b-1\n", "          - b-9\n          - '7'\n"
+        )
+
+    def test_preserves_comments_and_other_blocks(self, config, tmp_path):
+        out = tmp_path / "out.yaml"
+        rewrite_models(config, out, {"Alpha": ["a-3"]})
+        text = out.read_text(encoding="utf-8")
+        assert "    # Alpha\n" in text
+        assert '        - "stop"\n' in text
+        assert "          - a-3\n        fetch: false\n" in text
+
+    def test_flow_blocks_are_skipped(self, config, tmp_path):
+        out = tmp_path / "out.yaml"
+        rewritten, skipped = rewrite_models(config, out, {"Flow": ["f-2"]})
+        assert (rewritten, skipped) == ([], ["Flow"])
+        assert out.read_text(encoding="utf-8") == CONFIG
+
+    def test_name_after_models_is_not_matched(self, config, tmp_path):
+        out = tmp_path / "out.yaml"
+        rewritten, _ = rewrite_models(config, out, {"Late": ["x-2"]})
+        assert rewritten == []
+        assert out.read_text(encoding="utf-8") == CONFIG
+
+    def test_refuses_in_place_rewrite(self, config):
+        with pytest.raises(ValueError):
+            rewrite_models(config, config, {"Beta": ["b-2"]})
+
+    def test_accepts_generators(self, config, tmp_path):
+        out = tmp_path / "out.yaml"
+        rewrite_models(config, out, {"Beta": ("b-%d" % i for i in range(2500))})
+        assert out.read_text(encoding="utf-8").count("          - b-") == 2500
+
+    def test_matches_catalog_renderer_on_real_config(self, tmp_path):
+        src = REPO_ROOT / "librechat-up-l.yaml"
+        replacements = {"OpenRouter": ["7", "new/model"], "xai": ["grok-9"]}
+        out = tmp_path / "out.yaml"
+        rewrite_models(src, out, replacements)
+
+        catalog = ProviderCatalog.from_files([src])
+        for name, models in replacements.items():
+            catalog.set_models(name, models)
+        assert out.read_text(encoding="utf-8") == render_file(src, catalog).text
+
+
+class TestMemory:
+
+    def test_chunked_formatting(self):
+        items = list(iter_formatted_items(["a", "7"] * 5, chunk_size=3))
+        assert items == ["- a", "- '7'"] * 5
+
+    def test_peak_memory_does_not_grow_with_file_size(self, tmp_path):
+        peaks = []
+        for count in (500, 4000):
+            src = tmp_path / ("big-%d.yaml" % count)
+            _write_synthetic(src, count)
+            replacement = ("new/model-%d" % i for i in range(count))
+
+            tracemalloc.start()
+            rewrite_models(src, tmp_path / "out.yaml", {"Big": replacement})
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        # 8x the input must not cost anywhere near 8x the memory.
+        assert peaks[1] < peaks[0] * 2
@@ -0,0 +1,75 @@
+"""Tests for the synthetic config history generator."""
+from __future__ import annotations
+
+import subprocess
+from datetime import datetime, timezone
+
+from catalog import ProviderCatalog
+from model_index import ModelIndex
+from report_staleness import build_report, parse_provider_ranges
+from synthetic_history import DAY, HistorySpec, build_history, iter_commits
+from yaml_scanner import scan_provider_ranges
+
+
+END = 1_780_000_000 - 1_780_000_000 % DAY
+SPEC = HistorySpec(commits=40, providers=5, models=6, files=2, dormant=0.4, seed=3, end=END)
+
+
+def _log(root, *args):
+    return subprocess.run(["git", "-C", str(root), "log", *args], check=True,
+                          capture_output=True, text=True).stdout.splitlines()
+
+
+class TestCommits:
+
+    def test_every_commit_changes_a_list(self):
+        states = [(when, {name: list(models) for name, models in lists.items()})
+                  for when, lists in iter_commits(SPEC)]
+        assert len(states) == SPEC.commits
+        assert [when // DAY for when, _ in states] == list(range(END // DAY - 39, END // DAY + 1))
+        assert all(a[1] != b[1] for a, b in zip(states, states[1:]))
+        assert all(models == sorted(models) for _, lists in states for models in lists.values())
+
+    def test_seed_repeats_the_history(self):
+        first = [{k: list(v) for k, v in lists.items()} for _, lists in iter_commits(SPEC)]
+        again = [{k: list(v) for k, v in lists.items()} for _, lists in iter_commits(SPEC)]
+        assert first == again
+
+    def test_dormant_providers_stop_changing(self):
+        last_change = {}
+        previous = {}
+        for number, (_, lists) in enumerate(iter_commits(SPEC)):
+            for name, models in lists.items():
+                if previous.get(name) != models:
+                    last_change[name] = number
+                previous[name] = list(models)
+        assert sum(number < SPEC.commits * 0.8 for number in last_change.values()) >= 2
+
+
+class TestRepository:
+
+    def test_daily_update_commits(self, tmp_path):
+        root = build_history(tmp_path / "repo", SPEC)
+        assert len(_log(root, "--format=%H")) == SPEC.commits
+        assert _log(root, "-1", "--format=%an|%s") == [
+            "github-actions[bot]|chore: update AI models (%s)"
+            % datetime.fromtimestamp(END, tz=timezone.utc).date().isoformat()]
+
+        *_, (_, final) = iter_commits(SPEC)
+        for name in SPEC.file_names:
+            path = root / name
+            assert ProviderCatalog.from_files([path]).get("provider00") == final["provider00"]
+            assert scan_provider_ranges(path) == parse_provider_ranges(path)
+
+    def test_tools_read_the_history(self, tmp_path):
+        root = build_history(tmp_path / "repo", SPEC)
+        index = ModelIndex(root, ["librechat-env-f.yaml"], tmp_path / "index.json")
+        assert index.update() == SPEC.commits
+        *_, (_, final) = iter_commits(SPEC)
+        listed = {name: sorted(m for m, e in models.items() if e["count"])
+                  for name, models in index.models.items()}
+        assert listed == final
+
+        now = datetime.fromtimestamp(END + DAY, tz=timezone.utc)
+        report = build_report(root, ["librechat-env-f.yaml"], 1, now=now)
+        assert report["stale"] and report["fresh"] and not report["blame_failed"]
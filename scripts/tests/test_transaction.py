@@ -0,0 +1,156 @@
+"""Tests for multi-file transactional commits."""
+from __future__ import annotations
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+import transaction as transaction_module
+from transaction import (
+    JOURNAL_NAME,
+    ORIGINAL_SUFFIX,
+    ConfigTransaction,
+    TransactionError,
+    recover,
+    write_atomic,
+)
+from update_models import save_yaml_file, validate_yaml_file
+
+
+VALID = "version: 1.3.11\nendpoints:\n  custom: []\n"
+
+
+@pytest.fixture
+def configs(tmp_path):
+    paths = []
+    for name in ("a.yaml", "b.yaml", "c.yaml"):
+        path = tmp_path / name
+        path.write_text(VALID, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def _writer(text):
+    return lambda f: f.write(text)
+
+
+def _leftovers(directory):
+    return sorted(p.name for p in directory.iterdir() if p.suffix != ".yaml")
+
+
+class TestCommit:
+
+    def test_commits_all_files(self, configs, tmp_path):
+        txn = ConfigTransaction(validator=validate_yaml_file)
+        for path in configs:
+            txn.stage(path, _writer(VALID.replace("1.3.11", "1.3.12")))
+        assert txn.commit() == configs
+        for path in configs:
+            assert "1.3.12" in path.read_text(encoding="utf-8")
+        assert _leftovers(tmp_path) == []
+
+    def test_invalid_file_aborts_everything(self, configs, tmp_path):
+        txn = ConfigTransaction(validator=validate_yaml_file)
+        txn.stage(configs[0], _writer(VALID.replace("1.3.11", "1.3.12")))
+        txn.stage(configs[1], _writer("endpoints: {}\n"))  # no version
+        with pytest.raises(TransactionError) as excinfo:
+            txn.commit()
+        assert excinfo.value.paths == configs[:2]
+        for path in configs:
+            assert path.read_text(encoding="utf-8") == VALID
+        assert _leftovers(tmp_path) == []
+
+    def test_unvalidated_files_skip_the_validator(self, configs, tmp_path):
+        txn = ConfigTransaction(validator=validate_yaml_file)
+        txn.stage(configs[0], _writer(VALID.replace("1.3.11", "1.3.12")))
+        txn.stage(tmp_path / "groq.yaml", _writer("name: groq\nmodels: []\n"), validate=False)
+        txn.commit()
+        assert (tmp_path / "groq.yaml").read_text(encoding="utf-8") == "name: groq\nmodels: []\n"
+
+    def test_failed_rename_rolls_back(self, configs, tmp_path):
+        txn = ConfigTransaction()
+        for path in configs:
+            txn.stage(path, _writer("new\n"))
+
+        real_replace = os.replace
+        calls = []
+
+        def flaky_replace(src, dst):
+            calls.append(dst)
+            if len(calls) == 3:
+                raise OSError("disk full")
+            return real_replace(src, dst)
+
+        with patch.object(transaction_module.os, "replace", side_effect=flaky_replace):
+            with pytest.raises(TransactionError):
+                txn.commit()
+        for path in configs:
+            assert path.read_text(encoding="utf-8") == VALID
+        assert _leftovers(tmp_path) == []
+
+    def test_restaging_keeps_latest(self, configs, tmp_path):
+        txn = ConfigTransaction()
+        txn.stage(configs[0], _writer("first\n"))
+        txn.stage(configs[0], _writer("second\n"))
+        assert len(txn) == 1
+        txn.commit()
+        assert configs[0].read_text(encoding="utf-8") == "second\n"
+        assert _leftovers(tmp_path) == []
+
+    def test_context_manager_aborts_on_error(self, configs, tmp_path):
+        with pytest.raises(RuntimeError):
+            with ConfigTransaction() as txn:
+                txn.stage(configs[0], _writer("new\n"))
+                raise RuntimeError("boom")
+        assert configs[0].read_text(encoding="utf-8") == VALID
+        assert _leftovers(tmp_path) == []
+
+    def test_save_yaml_file_stages_only(self, configs):
+        txn = ConfigTransaction(validator=validate_yaml_file)
+        save_yaml_file(configs[0], {"version": "1.3.12", "endpoints": {}}, transaction=txn)
+        assert configs[0].read_text(encoding="utf-8") == VALID
+        txn.commit()
+        assert "1.3.12" in configs[0].read_text(encoding="utf-8")
+
+
+class TestRecover:
+
+    def test_restores_files_listed_in_journal(self, configs, tmp_path):
+        # Simulate a crash after the first rename of a transaction.
+        original = configs[0].with_name(configs[0].name + ORIGINAL_SUFFIX)
+        os.link(configs[0], original)
+        configs[0].with_name("a.new").write_text("new\n", encoding="utf-8")
+        os.replace(configs[0].with_name("a.new"), configs[0])
+        (tmp_path / JOURNAL_NAME).write_text(
+            json.dumps({str(configs[0]): str(original)}), encoding="utf-8"
+        )
+
+        assert recover(tmp_path) == [configs[0]]
+        assert configs[0].read_text(encoding="utf-8") == VALID
+        assert _leftovers(tmp_path) == []
+
+    def test_nothing_to_recover(self, tmp_path):
+        assert recover(tmp_path) == []
+
+
+class TestWriteAtomic:
+
+    def test_new_file_is_0644_and_existing_mode_is_kept(self, tmp_path):
+        path = write_atomic(tmp_path / "a.json", "{}\n")
+        assert path.read_text(encoding="utf-8") == "{}\n"
+        assert path.stat().st_mode & 0o777 == 0o644
+        path.chmod(0o600)
+        write_atomic(path, b"[]\n", fsync=False)
+        assert path.read_bytes() == b"[]\n"
+        assert path.stat().st_mode & 0o777 == 0o600
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["a.json"]
+
+    def test_failed_write_leaves_the_file(self, tmp_path):
+        path = tmp_path / "a.json"
+        path.write_text("old\n", encoding="utf-8")
+        with pytest.raises(TypeError):
+            write_atomic(path, 42)
+        assert path.read_text(encoding="utf-8") == "old\n"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["a.json"]
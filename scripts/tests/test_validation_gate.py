@@ -126,3 +126,28 @@ class TestExitCodePropagation:
         ]
         assert any(f in error_messages for f in yaml_files)
         assert "YAML file is empty" in error_messages
+
+
+class TestConsistencyGate:
+    """Cross-file drift found after writing fails the run like validation."""
+
+    @patch("automated_update.setup_logging")
+    @patch("automated_update.update_models")
+    def test_drift_returns_validation_exit_code(self, mock_um, mock_log, tmp_path, monkeypatch):
+        from consistency import ConsistencyReport, ERROR, Finding
+
+        mock_um.main.return_value = _make_update_stats(["librechat-test.yaml"])
+        monkeypatch.setenv("GITHUB_ENV", str(tmp_path / "github_env"))
+        report = ConsistencyReport(
+            files=["a.yaml", "b.yaml"],
+            findings=[Finding(ERROR, "groq", "models.default differs: a.yaml vs b.yaml")],
+        )
+
+        with patch("automated_update.validate_yaml_file", return_value=(True, None)), \
+             patch("automated_update.check_files", return_value=report), \
+             patch("automated_update.Path", _make_fake_path(exists=True)):
+            import automated_update
+            result = automated_update.main()
+
+        assert result == 2
+        assert "groq: models.default differs" in (tmp_path / "github_env").read_text()
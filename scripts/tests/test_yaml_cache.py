@@ -0,0 +1,121 @@
+"""Tests for the content-hash keyed parsed-YAML cache."""
+from __future__ import annotations
+
+import io
+import shutil
+from pathlib import Path
+
+import pytest
+from ruamel.yaml import YAML
+
+from yaml_cache import YamlDocumentCache, load_yaml_cached, settings_key
+
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+
+
+def _writer_yaml():
+    yaml = YAML()
+    yaml.preserve_quotes = True
+    yaml.width = 4096
+    yaml.default_flow_style = False
+    yaml.indent(mapping=2, sequence=4, offset=2)
+    return yaml
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return YamlDocumentCache(tmp_path / "cache")
+
+
+@pytest.fixture
+def config(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("version: '1.0'\n# comment\nendpoints:\n  custom: []\n", encoding="utf-8")
+    return path
+
+
+class TestYamlDocumentCache:
+
+    def test_second_load_is_a_hit(self, cache, config):
+        first = cache.load(config, YAML())
+        second = cache.load(config, YAML())
+        assert (cache.misses, cache.hits) == (1, 1)
+        assert second == first
+        assert second is not first
+
+    def test_content_change_misses(self, cache, config):
+        cache.load(config, YAML())
+        config.write_text("version: '2.0'\nendpoints: {}\n", encoding="utf-8")
+        assert cache.load(config, YAML())["version"] == "2.0"
+        assert cache.misses == 2
+
+    def test_settings_change_misses(self, cache, config):
+        cache.load(config, YAML())
+        cache.load(config, _writer_yaml())
+        assert cache.misses == 2
+
+    def test_settings_key_covers_indent_settings(self):
+        assert settings_key(YAML()) != settings_key(_writer_yaml())
+
+    def test_parse_errors_propagate_and_are_not_cached(self, cache, tmp_path):
+        bad = tmp_path / "bad.yaml"
+        bad.write_text("key: [unclosed\n", encoding="utf-8")
+        with pytest.raises(Exception):
+            cache.load(bad, YAML())
+        assert list(cache.cache_dir.glob("*.pickle")) == []
+
+    def test_corrupt_entry_falls_back_to_parse(self, cache, config):
+        cache.load(config, YAML())
+        for entry in cache.cache_dir.glob("*.pickle"):
+            entry.write_bytes(b"not a pickle")
+        assert cache.load(config, YAML())["version"] == "1.0"
+        assert cache.misses == 2
+
+    def test_prunes_to_max_entries(self, tmp_path):
+        cache = YamlDocumentCache(tmp_path / "cache", max_entries=2)
+        for i in range(4):
+            path = tmp_path / ("f%d.yaml" % i)
+            path.write_text("n: %d\n" % i, encoding="utf-8")
+            cache.load(path, YAML())
+        assert len(list(cache.cache_dir.glob("*.pickle"))) == 2
+
+    @pytest.mark.parametrize("name", [
+        "librechat-env-f.yaml",
+        "librechat-up-l.yaml",
+    ])
+    def test_hit_round_trips_real_config_identically(self, cache, tmp_path, name):
+        path = tmp_path / name
+        shutil.copy(REPO_ROOT / name, path)
+        yaml = _writer_yaml()
+        cache.load(path, yaml)
+        document = cache.load(path, yaml)
+        assert cache.hits == 1
+
+        buf = io.StringIO()
+        yaml.dump(document, buf)
+        assert buf.getvalue() == path.read_text(encoding="utf-8")
+
+
+class TestLoadYamlCached:
+
+    def test_uses_env_cache_dir(self, tmp_path, monkeypatch, config):
+        monkeypatch.setenv("YAML_CACHE_DIR", str(tmp_path / "env-cache"))
+        load_yaml_cached(config)
+        assert len(list((tmp_path / "env-cache").glob("*.pickle"))) == 1
+
+    def test_disabled_by_env(self, tmp_path, monkeypatch, config):
+        monkeypatch.setenv("YAML_CACHE_DIR", str(tmp_path / "env-cache"))
+        monkeypatch.setenv("YAML_CACHE", "0")
+        assert load_yaml_cached(config)["version"] == "1.0"
+        assert not (tmp_path / "env-cache").exists()
+
+    def test_only_stable_files_are_validated_through_the_cache(self, tmp_path, monkeypatch, config):
+        from update_models import save_yaml_file, validate_yaml_file
+
+        monkeypatch.setenv("YAML_CACHE_DIR", str(tmp_path / "env-cache"))
+        save_yaml_file(config, {"version": "1.0", "endpoints": {"custom": []}})
+        assert validate_yaml_file(config) == (True, None)
+        assert not list((tmp_path / "env-cache").glob("*.pickle"))
+        assert validate_yaml_file(config, use_cache=True) == (True, None)
+        assert len(list((tmp_path / "env-cache").glob("*.pickle"))) == 1
@@ -0,0 +1,181 @@
+"""Tests for the line scanner behind find_provider_ranges."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from report_staleness import find_provider_ranges, parse_provider_ranges
+from yaml_scanner import UnsupportedYAML, scan_lines, scan_provider_ranges
+
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+
+HEADER = "version: 1.3.11\nendpoints:\n  custom:\n"
+
+SUPPORTED = {
+    "block": HEADER + """\
+    - name: "groq"
+      apiKey: x
+      models:
+        default:
+          - a
+          - "b"  # comment
+        fetch: false
+    - name: xai
+      models:
+        default:
+        - x
+""",
+    "zero_offset_and_name_last": """\
+endpoints:
+  custom:
+  - models:
+      default:
+      - '7'
+      - "x/y"
+    name: Nvidia
+  - name: 'it''s'
+    models:
+      default: [a, b]
+""",
+    "flow_lists": HEADER + """\
+    - name: one
+      models:
+        default: ["a", 'b, c', "d"]
+    - name: multi
+      models:
+        default: [
+          "a",
+          "b", "c",
+          "d"
+        ]
+        fetch: true
+    - name: empty
+      models:
+        default: []
+""",
+    "block_and_quoted_scalars": """\
+interface:
+  modalContent: |
+    endpoints:
+      custom:
+        - name: fake
+  privacy: "multi
+    line"
+endpoints:
+  custom:
+    - name: real
+      description: >
+        - name: fake
+          models:
+      models:
+        default:
+          - a
+          # trailing comment
+          - b
+      iconURL: https://example.com/a.png
+        continued
+""",
+    "skipped_entries": HEADER + """\
+    - name: 42
+      models:
+        default:
+          - a
+    - name: dup
+      models:
+        default:
+          - first
+    - name: dup
+      models:
+        default:
+          - second
+          - third
+    - models:
+        default:
+          - anonymous
+    - name: nodefault
+      models:
+        fetch: true
+""",
+    "other_sections": """\
+---
+custom:
+  - name: top
+    models:
+      default:
+        - a
+endpoints:
+  agents:
+    - name: agent
+      models:
+        default:
+          - a
+  custom:
+    - name: real
+      models:
+        default:
+          - a
+""",
+}
+
+UNSUPPORTED = {
+    "anchor": HEADER + "    - name: a\n      models: &m\n        default:\n          - x\n",
+    "alias": HEADER + "    - name: a\n      models:\n        default: *m\n",
+    "merge": HEADER + "    - name: a\n      <<: {models: {default: [x]}}\n",
+    "tag": HEADER + "    - name: a\n      models:\n        default: !!seq\n          - x\n",
+    "complex_key": HEADER + "    - ? name\n      : a\n",
+    "flow_models": HEADER + "    - name: a\n      models: {default: [x]}\n",
+    "flow_item": HEADER + "    - {name: a, models: {default: [x]}}\n",
+    "documents": HEADER + "    - name: a\n---\nother: 1\n",
+    "tab": HEADER + "    - name: a\n\tmodels:\n",
+    "unterminated": HEADER + "    - name: a\n      models:\n        default: [x,\n",
+}
+
+
+@pytest.fixture
+def write(tmp_path):
+    def write(text, name="c.yaml"):
+        path = tmp_path / name
+        path.write_text(text, encoding="utf-8")
+        return path
+    return write
+
+
+class TestAgainstParser:
+
+    @pytest.mark.parametrize("name", sorted(SUPPORTED))
+    def test_matches_round_trip_parse(self, write, name):
+        path = write(SUPPORTED[name])
+        ranges = scan_provider_ranges(path)
+        assert ranges is not None
+        assert ranges == parse_provider_ranges(path)
+
+    @pytest.mark.parametrize("path", sorted(REPO_ROOT.glob("librechat-*.yaml")), ids=lambda p: p.name)
+    def test_matches_on_the_real_configs(self, path):
+        assert scan_provider_ranges(path) == parse_provider_ranges(path)
+
+    def test_expected_ranges(self, write):
+        assert scan_provider_ranges(write(SUPPORTED["block"])) == {"groq": (8, 9), "xai": (14, 14)}
+        ranges = scan_provider_ranges(write(SUPPORTED["flow_lists"]))
+        assert ranges == {"one": (6, 6), "multi": (10, 12)}
+        assert scan_provider_ranges(write(SUPPORTED["skipped_entries"]))["dup"] == (15, 16)
+
+
+class TestFallback:
+
+    @pytest.mark.parametrize("name", sorted(UNSUPPORTED))
+    def test_declines(self, name):
+        with pytest.raises(UnsupportedYAML):
+            scan_lines(UNSUPPORTED[name].splitlines(keepends=True))
+
+    def test_find_provider_ranges_falls_back_to_the_parser(self, write):
+        path = write(HEADER + "    - name: a\n      models: &m\n        default:\n          - x\n")
+        assert scan_provider_ranges(path) is None
+        assert find_provider_ranges(path) == {"a": (7, 7)}
+
+    def test_empty_and_non_utf8_files(self, write, tmp_path):
+        assert scan_provider_ranges(write("")) == {}
+        path = tmp_path / "latin1.yaml"
+        path.write_bytes(HEADER.encode() + b"    - name: caf\xe9\n")
+        assert scan_provider_ranges(path) is None
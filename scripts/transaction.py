@@ -0,0 +1,295 @@
+"""All-or-nothing writes across several config files.
+
+``save_yaml_file`` on its own replaces one file at a time, so a failure
+while writing the third of five configs leaves two updated and three not.
+A ``ConfigTransaction`` stages every file first and only touches the
+published paths once all of them are durable and valid:
+
+1. ``stage()`` writes each new version to a temp file next to its target.
+2. ``commit()`` fsyncs all temp files in one pass and validates them. Any
+   failure discards every temp file and leaves the configs untouched.
+3. The current files are hard-linked aside, a journal listing them is
+   written, and the temp files are renamed into place. If a rename fails,
+   the files already replaced are restored from their links.
+4. Each affected directory is fsynced once, then the journal and links
+   are removed.
+
+A crash during step 3 leaves the journal behind; ``recover()`` (called
+at the start of ``commit()``) puts every listed file back to its
+pre-transaction version, so the configs are never left half updated.
+
+A single generated file (an artifact, a cache entry) needs none of this:
+``write_atomic`` writes it to a temp file and renames it into place.
+
+Usage:
+    txn = ConfigTransaction(validator=validate_yaml_file)
+    save_yaml_file(path_a, data_a, transaction=txn)
+    save_yaml_file(path_b, data_b, transaction=txn)
+    txn.commit()
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Callable, IO, Optional
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_NAME = ".config-transaction.json"
+ORIGINAL_SUFFIX = ".txn-orig"
+
+# validator(path) -> (is_valid, error_message)
+Validator = Callable[[str], "tuple[bool, Optional[str]]"]
+
+
+class TransactionError(Exception):
+    """Raised when a transaction could not be committed; no file changed."""
+
+    def __init__(self, message: str, paths: list[Path]):
+        super().__init__(message)
+        self.paths = paths
+
+
+def _fsync_path(path: Path) -> None:
+    fd = os.open(str(path), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_dir(directory: Path) -> None:
+    try:
+        _fsync_path(directory)
+    except OSError:
+        # Directories cannot be opened for fsync on every platform (Windows).
+        pass
+
+
+def _unlink(path: Path) -> None:
+    try:
+        path.unlink()
+    except OSError:
+        pass
+
+
+def _copy_mode(file_path: Path, tmp_path: Path) -> None:
+    # mkstemp creates 0600; keep the target's mode (or a normal 0644).
+    try:
+        shutil.copymode(file_path, tmp_path)
+    except FileNotFoundError:
+        os.chmod(tmp_path, 0o644)
+
+
+def write_atomic(file_path, data, fsync: bool = True) -> Path:
+    """Replace one file with ``data`` (str as UTF-8, or bytes) in a single rename.
+
+    The temp file keeps the target's mode (0644 for a new file) and is
+    fsynced first unless ``fsync`` is False, which suits caches that can
+    simply be rebuilt.
+    """
+    file_path = Path(file_path)
+    content = data.encode("utf-8") if isinstance(data, str) else data
+    fd, tmp_name = tempfile.mkstemp(suffix=".tmp", dir=str(file_path.parent))
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        _copy_mode(file_path, tmp_path)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        _unlink(tmp_path)
+        raise
+    return file_path
+
+
+class ConfigTransaction:
+    """Stage several file replacements and commit them together."""
+
+    def __init__(self, validator: Optional[Validator] = None):
+        self.validator = validator
+        self._staged: dict[Path, Path] = {}  # target -> temp file
+        self._unchecked: set[Path] = set()  # targets the validator skips
+        self.committed = False
+
+    def __len__(self) -> int:
+        return len(self._staged)
+
+    @property
+    def paths(self) -> list[Path]:
+        return list(self._staged)
+
+    def stage(self, file_path, write: Callable[[IO[str]], object], validate: bool = True) -> Path:
+        """Write the new content of ``file_path`` to a temp file.
+
+        ``write`` receives the open temp file and fills it in. Staging the
+        same path twice keeps the later content. ``validate=False`` exempts
+        a file that is not a config (a model shard) from the validator.
+
+        Returns:
+            Path: the temp file.
+        """
+        if self.committed:
+            raise RuntimeError("Transaction already committed")
+        file_path = Path(file_path)
+        fd, tmp_name = tempfile.mkstemp(suffix=".yaml.tmp", dir=str(file_path.parent))
+        tmp_path = Path(tmp_name)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                write(f)
+            _copy_mode(file_path, tmp_path)
+        except BaseException:
+            _unlink(tmp_path)
+            raise
+
+        previous = self._staged.pop(file_path, None)
+        if previous is not None:
+            _unlink(previous)
+        self._staged[file_path] = tmp_path
+        if validate:
+            self._unchecked.discard(file_path)
+        else:
+            self._unchecked.add(file_path)
+        return tmp_path
+
+    def abort(self) -> None:
+        """Discard every staged file."""
+        for tmp_path in self._staged.values():
+            _unlink(tmp_path)
+        self._staged.clear()
+
+    def commit(self) -> list[Path]:
+        """Publish every staged file, or none of them.
+
+        Returns:
+            list: the paths that were replaced.
+
+        Raises:
+            TransactionError: staging could not be made durable, a file
+                failed validation, or a rename failed. No config changed.
+        """
+        if self.committed:
+            raise RuntimeError("Transaction already committed")
+        paths = list(self._staged)
+        if not paths:
+            self.committed = True
+            return []
+
+        directories = sorted({p.parent for p in paths})
+        for directory in directories:
+            recover(directory)
+
+        try:
+            for tmp_path in self._staged.values():
+                _fsync_path(tmp_path)
+            if self.validator is not None:
+                for file_path, tmp_path in self._staged.items():
+                    if file_path in self._unchecked:
+                        continue
+                    is_valid, error = self.validator(str(tmp_path))
+                    if not is_valid:
+                        raise ValueError("Validation failed for %s: %s" % (file_path.name, error))
+        except Exception as e:
+            self.abort()
+            raise TransactionError(str(e), paths) from e
+
+        journal = directories[0] / JOURNAL_NAME
+        originals = self._keep_originals(paths, journal)
+        replaced: list[Path] = []
+        try:
+            for file_path, tmp_path in self._staged.items():
+                os.replace(tmp_path, file_path)
+                replaced.append(file_path)
+        except Exception as e:
+            logger.error("Rename failed, rolling back %d file(s): %s", len(replaced), e)
+            _restore(originals, replaced)
+            self.abort()
+            _finish(originals, journal, directories)
+            raise TransactionError(str(e), paths) from e
+
+        _finish(originals, journal, directories)
+        self._staged.clear()
+        self.committed = True
+        logger.info("Committed %d file(s)", len(paths))
+        return paths
+
+    @staticmethod
+    def _keep_originals(paths: list[Path], journal: Path) -> dict[Path, Path]:
+        originals = {}
+        for file_path in paths:
+            if not file_path.exists():
+                continue
+            original = file_path.with_name(file_path.name + ORIGINAL_SUFFIX)
+            _unlink(original)
+            try:
+                os.link(file_path, original)
+            except OSError:
+                shutil.copy2(file_path, original)
+            originals[file_path] = original
+
+        tmp_journal = journal.with_name(journal.name + ".tmp")
+        with open(tmp_journal, "w", encoding="utf-8") as f:
+            json.dump({str(p): str(o) for p, o in originals.items()}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_journal, journal)
+        _fsync_dir(journal.parent)
+        return originals
+
+    def __enter__(self) -> "ConfigTransaction":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.abort()
+        elif not self.committed:
+            self.commit()
+
+
+def _restore(originals: dict[Path, Path], replaced: list[Path]) -> None:
+    for file_path in replaced:
+        original = originals.get(file_path)
+        if original is not None:
+            os.replace(original, file_path)
+        else:
+            _unlink(file_path)
+
+
+def _finish(originals: dict[Path, Path], journal: Path, directories: list[Path]) -> None:
+    for directory in directories:
+        _fsync_dir(directory)
+    _unlink(journal)
+    for original in originals.values():
+        _unlink(original)
+
+
+def recover(directory) -> list[Path]:
+    """Undo a transaction that was interrupted while renaming.
+
+    Returns:
+        list: the files restored to their pre-transaction content.
+    """
+    journal = Path(directory) / JOURNAL_NAME
+    if not journal.exists():
+        return []
+    with open(journal, "r", encoding="utf-8") as f:
+        entries = {Path(p): Path(o) for p, o in json.load(f).items()}
+
+    restored = []
+    for file_path, original in entries.items():
+        if original.exists():
+            os.replace(original, file_path)
+            restored.append(file_path)
+    for directory in sorted({p.parent for p in entries} | {journal.parent}):
+        _fsync_dir(directory)
+    _unlink(journal)
+    logger.warning("Recovered %d file(s) from an interrupted transaction", len(restored))
+    return restored
@@ -6,38 +6,104 @@ import tempfile
 
 from ruamel.yaml import YAML
 
+from backup_store import BackupStore
+from catalog import CONFIG_FILES, ProviderCatalog, document_providers, render_all, write_rendered
+from catalog_export import write_artifact
+from diff_preview import BlockChange, block_range, file_diff
 from log_config import setup_logging
+from model_diff import diff_models
+from model_lock import write_lock
+from model_store import ModelListStore
 from providers import discover_providers, FetchStatus
+from run_history import open_history
+from shards import shards_enabled, source_catalog, write_shards
+from staleness_thresholds import Thresholds
+from transaction import ConfigTransaction, TransactionError
+from yaml_cache import load_yaml_cached
 
 logger = logging.getLogger(__name__)
 
 STALENESS_THRESHOLD = float(os.environ.get("STALENESS_THRESHOLD", "0.5"))
+# An explicit STALENESS_THRESHOLD applies to every provider; otherwise the
+# tuned per-provider ratios in staleness_thresholds.json take precedence.
+STALENESS_THRESHOLD_FIXED = "STALENESS_THRESHOLD" in os.environ
+ENDPOINT_NAME_IGNORE_CASE = os.environ.get(
+    "ENDPOINT_NAME_IGNORE_CASE", ""
+).lower() in ("true", "1", "yes")
 
 
-def check_staleness(provider_name, new_models, yaml_data):
+class EndpointIndex:
+    """Endpoint name -> ``endpoints.custom`` entry for one loaded document.
+
+    Built once per document so every provider lookup is a dict hit instead
+    of a scan over all endpoints. With ``ignore_case`` names are matched
+    case-insensitively (``groq`` vs ``Groq``). When a name occurs more than
+    once the first entry wins, the same one a linear scan would find.
+    """
+
+    def __init__(self, yaml_data, ignore_case=False):
+        self.ignore_case = ignore_case
+        self._endpoints = {}
+
+        if not yaml_data or 'endpoints' not in yaml_data:
+            return
+        for endpoint in yaml_data['endpoints'].get('custom', []):
+            name = endpoint.get('name')
+            if not isinstance(name, str):
+                continue
+            self._endpoints.setdefault(self._key(name), endpoint)
+
+    def _key(self, name):
+        return name.casefold() if self.ignore_case else name
+
+    def get(self, provider_name):
+        """Return the endpoint for ``provider_name``, or None."""
+        return self._endpoints.get(self._key(provider_name))
+
+    def __contains__(self, provider_name):
+        return self._key(provider_name) in self._endpoints
+
+    def __len__(self):
+        return len(self._endpoints)
+
+
+def check_staleness(provider_name, new_models, yaml_data, index=None, threshold=None):
     """Check if new model count is suspiciously low compared to existing.
 
+    Args:
+        index: Optional EndpointIndex of ``yaml_data``; built on the fly
+            when omitted.
+        threshold: Minimum new/old count ratio for this provider
+            (``staleness_threshold``); ``STALENESS_THRESHOLD`` when omitted.
+
     Returns:
         tuple: (is_stale, old_count, new_count)
     """
-    if not yaml_data or 'endpoints' not in yaml_data:
+    if index is None:
+        index = EndpointIndex(yaml_data, ignore_case=ENDPOINT_NAME_IGNORE_CASE)
+
+    endpoint = index.get(provider_name)
+    if endpoint is None:
         return False, 0, len(new_models)
 
-    for endpoint in yaml_data['endpoints'].get('custom', []):
-        if endpoint.get('name') == provider_name:
-            existing = endpoint.get('models', {}).get('default', [])
-            old_count = len(existing)
-            new_count = len(new_models)
+    existing = endpoint.get('models', {}).get('default', [])
+    old_count = len(existing)
+    new_count = len(new_models)
+
+    if old_count == 0:
+        return False, 0, new_count
 
-            if old_count == 0:
-                return False, 0, new_count
+    ratio = new_count / old_count
+    if ratio < (STALENESS_THRESHOLD if threshold is None else threshold):
+        return True, old_count, new_count
+    return False, old_count, new_count
 
-            ratio = new_count / old_count
-            if ratio < STALENESS_THRESHOLD:
-                return True, old_count, new_count
-            return False, old_count, new_count
 
-    return False, 0, len(new_models)
+def staleness_threshold(provider_name, thresholds):
+    """The count-ratio gate for ``provider_name`` (see staleness_thresholds)."""
+    if STALENESS_THRESHOLD_FIXED:
+        return STALENESS_THRESHOLD
+    return thresholds.count_ratio(provider_name, default=STALENESS_THRESHOLD)
 
 
 class UpdateStats:
@@ -47,9 +113,13 @@ class UpdateStats:
         self.stale_providers = []   # (name, old_count, new_count) tuples
         self.updated_files = []     # Successfully updated files
         self.failed_files = []      # Files that failed to update
+        self.model_diffs = {}       # name -> ModelDiff (when known)
+        self.file_diffs = {}        # filename -> unified diff (dry run only)
 
-    def add_provider_result(self, provider_name, old_count, new_count):
+    def add_provider_result(self, provider_name, old_count, new_count, diff=None):
         self.provider_results[provider_name] = (old_count, new_count)
+        if diff is not None:
+            self.model_diffs[provider_name] = diff
 
     def add_failed_provider(self, provider_name, error_message):
         self.failed_providers[provider_name] = error_message or "unknown error"
@@ -63,6 +133,22 @@ class UpdateStats:
         else:
             self.failed_files.append(filename)
 
+    def add_file_diff(self, filename, diff):
+        if diff:
+            self.file_diffs[filename] = diff
+
+    def combined_diff(self):
+        """All dry-run file diffs as one patch, in file order."""
+        return "".join(self.file_diffs.values())
+
+    def mark_files_failed(self, filenames):
+        """Move files counted as updated to failed (e.g. rolled back)."""
+        for filename in filenames:
+            if filename in self.updated_files:
+                self.updated_files.remove(filename)
+            if filename not in self.failed_files:
+                self.failed_files.append(filename)
+
     def print_summary(self):
         summary = "\nUpdate Summary\n============="
 
@@ -114,15 +200,30 @@ class UpdateStats:
         body = self._commit_body()
         return "%s\n\n%s" % (subject, body)
 
+    def _swapped(self, provider):
+        """ModelDiff of a provider whose count stayed the same but ids changed."""
+        diff = self.model_diffs.get(provider)
+        if diff is not None and diff.changed:
+            return diff
+        return None
+
     def _commit_subject(self):
         """Build commit subject line with provider deltas."""
         deltas = []
         for provider, (old, new) in sorted(self.provider_results.items()):
             diff = new - old
+            swapped = self._swapped(provider)
             if diff > 0:
                 deltas.append("%s +%d" % (provider, diff))
             elif diff < 0:
                 deltas.append("%s %d" % (provider, diff))
+            elif swapped:
+                # Same count, different ids: a rename is one in, one out.
+                deltas.append("%s +%d/-%d" % (
+                    provider,
+                    len(swapped.added) + len(swapped.renamed),
+                    len(swapped.removed) + len(swapped.renamed),
+                ))
 
         if not deltas:
             date_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
@@ -135,18 +236,23 @@ class UpdateStats:
         # Truncate: count gained vs lost
         gained = 0
         lost = 0
+        swapped = 0
         for provider, (old, new) in self.provider_results.items():
             diff = new - old
             if diff > 0:
                 gained += 1
             elif diff < 0:
                 lost += 1
+            elif self._swapped(provider):
+                swapped += 1
 
         parts = []
         if gained:
             parts.append("%d providers gained models" % gained)
         if lost:
             parts.append("%d lost models" % lost)
+        if swapped:
+            parts.append("%d swapped models" % swapped)
         return "chore: update models (%s)" % ", ".join(parts)
 
     def _commit_body(self):
@@ -160,7 +266,11 @@ class UpdateStats:
                     sign = "+"
                 else:
                     sign = ""
-                lines.append("%s: %d -> %d (%s%d)" % (provider, old, new, sign, delta))
+                line = "%s: %d -> %d (%s%d)" % (provider, old, new, sign, delta)
+                diff = self.model_diffs.get(provider)
+                if diff is not None and diff.changed:
+                    line += " [%s]" % diff.summary()
+                lines.append(line)
 
         if self.failed_providers:
             lines.append("")
@@ -176,24 +286,36 @@ class UpdateStats:
 
         return "\n".join(lines)
 
-def validate_yaml_file(file_path):
+def validation_yaml():
+    """The YAML instance validate_yaml_file parses with.
+
+    Loading a config through ``load_yaml_cached`` with these settings right
+    after a cached validation hits the document cache instead of parsing again.
+    """
+    yaml = YAML()
+    yaml.preserve_quotes = True
+    yaml.width = 4096
+    yaml.default_flow_style = False
+    yaml.indent(mapping=2, sequence=4, offset=2)
+    return yaml
+
+def validate_yaml_file(file_path, use_cache=False):
     """Validate YAML file can be parsed correctly.
 
     Args:
         file_path: Path to YAML file to validate
+        use_cache: Parse through the YAML document cache. Only for files
+            that stay (the published configs), not for temp files.
 
     Returns:
         tuple: (is_valid, error_message)
     """
     try:
-        yaml = YAML()
-        yaml.preserve_quotes = True
-        yaml.width = 4096
-        yaml.default_flow_style = False
-        yaml.indent(mapping=2, sequence=4, offset=2)
-
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = yaml.load(f)
+        if use_cache:
+            content = load_yaml_cached(file_path, validation_yaml())
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = validation_yaml().load(f)
 
         if content is None:
             return False, "YAML file is empty"
@@ -223,26 +345,21 @@ def load_yaml_file(file_path):
         yaml.preserve_quotes = True
         yaml.width = 4096
         yaml.default_flow_style = False
-
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return yaml.load(f)
+        return load_yaml_cached(file_path, yaml)
     except Exception as e:
         logger.error("Error loading YAML file %s: %s", file_path, e)
         return None
 
-def save_yaml_file(file_path, data):
-    """Save data to a YAML file atomically with validation."""
+def _atomic_write(file_path, write):
+    """Write a YAML file atomically, validating it before the rename.
+
+    ``write`` receives the open temp file and fills it in.
+    """
     file_path = Path(file_path)
     tmp_fd = None
     tmp_path = None
 
     try:
-        yaml = YAML()
-        yaml.preserve_quotes = True
-        yaml.width = 4096
-        yaml.default_flow_style = False
-        yaml.indent(mapping=2, sequence=4, offset=2)
-
         # Create temp file in same directory (same filesystem = atomic rename)
         tmp_fd, tmp_path = tempfile.mkstemp(
             suffix='.yaml.tmp',
@@ -252,7 +369,7 @@ def save_yaml_file(file_path, data):
         # Write to temp file
         with os.fdopen(tmp_fd, 'w', encoding='utf-8') as f:
             tmp_fd = None  # os.fdopen takes ownership of fd
-            yaml.dump(data, f)
+            write(f)
             f.flush()
             os.fsync(f.fileno())
 
@@ -280,8 +397,52 @@ def save_yaml_file(file_path, data):
             except OSError:
                 pass
 
-def update_yaml_models(yaml_data, provider_name, models):
-    """Update the models list for a specific provider in the YAML data."""
+def save_yaml_file(file_path, data, transaction=None):
+    """Save data to a YAML file atomically with validation.
+
+    Args:
+        transaction: Optional ConfigTransaction; the file is only staged
+            and gets written when the transaction commits.
+    """
+    yaml = YAML()
+    yaml.preserve_quotes = True
+    yaml.width = 4096
+    yaml.default_flow_style = False
+    yaml.indent(mapping=2, sequence=4, offset=2)
+
+    if transaction is not None:
+        transaction.stage(file_path, lambda f: yaml.dump(data, f))
+        return
+    _atomic_write(file_path, lambda f: yaml.dump(data, f))
+
+def save_yaml_text(file_path, text, transaction=None):
+    """Save already-rendered YAML text atomically with validation."""
+    if transaction is not None:
+        transaction.stage(file_path, lambda f: f.write(text))
+        return
+    _atomic_write(file_path, lambda f: f.write(text))
+
+def _current_block(index, provider_name):
+    """Line range of the provider's models.default items, or None."""
+    endpoint = index.get(provider_name)
+    if endpoint is None:
+        return None
+    return block_range(endpoint.get('models', {}).get('default'))
+
+def _current_models(index, provider_name):
+    """The provider's models.default before the update, or []."""
+    endpoint = index.get(provider_name)
+    if endpoint is None:
+        return []
+    return list(endpoint.get('models', {}).get('default') or [])
+
+def update_yaml_models(yaml_data, provider_name, models, index=None):
+    """Update the models list for a specific provider in the YAML data.
+
+    Args:
+        index: Optional EndpointIndex of ``yaml_data``; built on the fly
+            when omitted.
+    """
     if not yaml_data or 'endpoints' not in yaml_data:
         return False
 
@@ -289,32 +450,73 @@ def update_yaml_models(yaml_data, provider_name, models):
         logger.error("No valid models found for %s", provider_name)
         return False
 
-    for endpoint in yaml_data['endpoints'].get('custom', []):
-        if endpoint.get('name') == provider_name:
-            endpoint['models']['default'] = models
-            endpoint['models']['fetch'] = False
-            logger.info("Updated %d models for %s", len(models), provider_name)
-            return True
-    return False
+    if index is None:
+        index = EndpointIndex(yaml_data, ignore_case=ENDPOINT_NAME_IGNORE_CASE)
+
+    endpoint = index.get(provider_name)
+    if endpoint is None:
+        return False
+
+    endpoint['models']['default'] = models
+    endpoint['models']['fetch'] = False
+    logger.info("Updated %d models for %s", len(models), provider_name)
+    return True
 
 def create_backup(yaml_path):
-    """Create a backup of the YAML file with timestamp."""
-    backup_path = yaml_path.with_suffix(f'.yaml.bak')
+    """Snapshot the YAML file into the rotating backup store (see backup_store)."""
+    try:
+        return BackupStore().backup(yaml_path)
+    except Exception as e:
+        logger.error("Error creating backup: %s", e)
+        return None
+
+def compact_backups(yaml_paths):
+    """Compress older backup generations once all files are written."""
+    store = BackupStore()
+    for yaml_path in yaml_paths:
+        try:
+            store.compact(yaml_path)
+        except Exception as e:
+            logger.error("Error compacting backups of %s: %s", yaml_path, e)
 
+def export_catalog(catalog, fetched_at, config_providers=None):
+    """Write the catalog artifact and the lockfile.
+
+    ``config_providers`` maps each written config to the providers it
+    lists; the lockfile is only refreshed when it is given.
+    """
+    if not len(catalog):
+        return
     try:
-        # Read original content
-        with open(yaml_path, 'r', encoding='utf-8') as source:
-            content = source.read()
+        write_artifact(catalog, fetched_at=fetched_at)
+    except Exception as e:
+        logger.error("Error writing catalog artifact: %s", e)
+    if config_providers:
+        try:
+            write_lock(catalog, config_providers)
+        except Exception as e:
+            logger.error("Error writing model lockfile: %s", e)
 
-        # Write to backup with original content
-        with open(backup_path, 'w', encoding='utf-8') as target:
-            target.write(content)
+def record_history(history, result):
+    """Store one fetch result in the run history (see run_history)."""
+    if history is None:
+        return
+    store, run_id = history
+    try:
+        store.record(run_id, result)
+    except Exception as e:
+        logger.warning("Cannot record %s in the run history: %s", result.provider_name, e)
 
-        logger.info("Created backup at %s", backup_path)
-        return backup_path
+def close_history(history):
+    if history is None:
+        return
+    store, run_id = history
+    try:
+        store.finish_run(run_id)
     except Exception as e:
-        logger.error("Error creating backup: %s", e)
-        return None
+        logger.warning("Cannot finish the run history entry: %s", e)
+    finally:
+        store.close()
 
 def cleanup_temp_files():
     """Delete all temporary .txt files created by the fetcher scripts, except requirements.txt."""
@@ -328,6 +530,21 @@ def cleanup_temp_files():
         except Exception as e:
             logger.error("Error deleting %s: %s", txt_file, e)
 
+def _splice_blocked(index, provider_name):
+    """Whether the provider's block cannot be updated by splicing its items.
+
+    ``catalog.render_config`` only replaces the item lines of a non-empty
+    block list; an empty or missing list, or a ``fetch`` flag that has to
+    be turned off, needs the round-trip edit of ``update_yaml_models``.
+    """
+    endpoint = index.get(provider_name)
+    if endpoint is None:
+        return False
+    models = endpoint.get('models')
+    if not isinstance(models, dict) or not models.get('default'):
+        return True
+    return models.get('fetch') is not False
+
 def main(dry_run=False):
     setup_logging()
     if dry_run:
@@ -339,35 +556,37 @@ def main(dry_run=False):
     # Get parent directory path
     parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-    yaml_files = [
-        'librechat-env-f.yaml',
-        'librechat-env-l.yaml',
-        'librechat-up-f.yaml',
-        'librechat-up-l.yaml',
-        'librechat-test.yaml',
-        # 'librechat.yaml',
-    ]
-
     # Fetch all models from contract-based providers
     logger.info("Fetching models from all providers...")
     provider_models = {}
+    model_store = ModelListStore()  # one shared list per provider for all files
+    fetched_at = {}
 
     registry = discover_providers()
     logger.info("Discovered %d contract-based providers: %s", len(registry), list(registry.keys()))
+    history = open_history(dry_run)
+    thresholds = Thresholds.load()
 
     for provider_name, fetcher_cls in registry.items():
         logger.info("Running %s fetcher", provider_name)
         fetcher = fetcher_cls()
         result = fetcher.run()
+        record_history(history, result)
         if result.status == FetchStatus.SUCCESS:
-            provider_models[result.provider_name] = result.models
+            provider_models[result.provider_name] = model_store.share(result.provider_name, result.models)
+            fetched_at[result.provider_name] = result.timestamp.isoformat(timespec="seconds")
             logger.info("%s: %s (%d models)", result.provider_name, result.status.value, result.model_count)
         else:
             logger.warning("%s: %s - %s", result.provider_name, result.status.value, result.error_message)
             stats.add_failed_provider(result.provider_name, result.error_message)
 
-    # Now process each YAML file with the fetched models
-    for yaml_file in yaml_files:
+    close_history(history)
+
+    # Load every config. They are only read here: the staleness gate and
+    # the per-provider diffs need the current lists.
+    backed_up = []
+    documents = {}  # yaml_file -> (yaml_path, yaml_data, index)
+    for yaml_file in CONFIG_FILES:
         yaml_path = Path(os.path.join(parent_dir, yaml_file))
         if not yaml_path.exists():
             stats.add_file_result(yaml_file, False)
@@ -379,47 +598,164 @@ def main(dry_run=False):
                 if not backup_path:
                     stats.add_file_result(yaml_file, False)
                     continue
+                backed_up.append(yaml_path)
 
-            # Load YAML data
             yaml_data = load_yaml_file(yaml_path)
             if not yaml_data:
                 stats.add_file_result(yaml_file, False)
                 continue
+            index = EndpointIndex(yaml_data, ignore_case=ENDPOINT_NAME_IGNORE_CASE)
+            documents[yaml_file] = (yaml_path, yaml_data, index)
+        except Exception as e:
+            logger.error("Error processing %s: %s", yaml_file, e)
+            stats.add_file_result(yaml_file, False)
 
-            updates_made = False
-            seen_providers = set()
-
-            # Update YAML with previously fetched models
-            for provider_name, models in provider_models.items():
-                is_stale, old_count, new_count = check_staleness(
-                    provider_name, models, yaml_data
-                )
-                if is_stale:
-                    logger.warning(
-                        "Staleness detected for %s: %d -> %d models "
-                        "(%.0f%% of previous, threshold %.0f%%)",
-                        provider_name, old_count, new_count,
-                        (new_count / old_count) * 100,
-                        STALENESS_THRESHOLD * 100,
-                    )
-                    stats.add_stale_provider(provider_name, old_count, new_count)
-                    continue
-
-                if update_yaml_models(yaml_data, provider_name, models):
-                    updates_made = True
-                    if provider_name not in seen_providers:
-                        stats.add_provider_result(provider_name, old_count, new_count)
-                        seen_providers.add(provider_name)
+    # One catalog of the fetched lists that pass the staleness gate in every
+    # config listing the provider, keyed by the endpoint names in the files.
+    updates = ProviderCatalog()
+    accepted = []
+    for provider_name, models in provider_models.items():
+        if not models:
+            logger.error("No valid models found for %s", provider_name)
+            continue
+        threshold = staleness_threshold(provider_name, thresholds)
+        listed = [(yaml_data, index) for _, yaml_data, index in documents.values()
+                  if provider_name in index]
+        stale = None
+        for yaml_data, index in listed:
+            is_stale, old_count, new_count = check_staleness(
+                provider_name, models, yaml_data, index=index, threshold=threshold
+            )
+            if is_stale:
+                stale = (old_count, new_count)
+                break
+        if stale is not None:
+            old_count, new_count = stale
+            logger.warning(
+                "Staleness detected for %s: %d -> %d models "
+                "(%.0f%% of previous, threshold %.0f%%)",
+                provider_name, old_count, new_count,
+                (new_count / old_count) * 100,
+                threshold * 100,
+            )
+            stats.add_stale_provider(provider_name, old_count, new_count)
+            continue
+        if not listed:
+            continue
 
-            if updates_made and not dry_run:
-                save_yaml_file(yaml_path, yaml_data)
-            stats.add_file_result(yaml_file, updates_made)
+        current = _current_models(listed[0][1], provider_name)
+        stats.add_provider_result(provider_name, len(current), len(models),
+                                  diff=diff_models(provider_name, current, models))
+        accepted.append(provider_name)
+        for _, index in listed:
+            updates.set_models(index.get(provider_name)['name'], models)
+        logger.info("Updated %d models for %s", len(models), provider_name)
+
+    # Render every config from the catalog in one parallel pass. Files with
+    # a block the splice cannot express get the round-trip edit instead.
+    # With the shard layout the shards are the source of truth: the configs
+    # are assembled from every shard, the accepted lists staged in first.
+    source = updates  # lists the configs are rendered from
+    if shards_enabled() and not dry_run:
+        try:
+            source = source_catalog(updates)
+        except Exception as e:
+            logger.error("Cannot read the model shards, rendering the fetched lists only: %s", e)
+    rendered = []  # files spliced by render_all
+    round_trip = []  # files dumped after update_yaml_models
+    file_names = {}  # yaml_file -> accepted providers it lists
+    for yaml_file, (yaml_path, yaml_data, index) in documents.items():
+        names = file_names[yaml_file] = [name for name in accepted if name in index]
+        if not names and source is updates:
+            continue
+        if dry_run:
+            changes = []
+            for name in names:
+                block = _current_block(index, name)
+                if block is not None:
+                    changes.append(BlockChange(name, block[0], block[1], tuple(provider_models[name])))
+            try:
+                stats.add_file_diff(yaml_file, file_diff(yaml_path, changes))
+            except Exception as e:
+                logger.warning("Cannot preview changes to %s: %s", yaml_file, e)
+        elif any(_splice_blocked(index, name) for name in names):
+            round_trip.append(yaml_file)
+        else:
+            rendered.append(yaml_file)
 
+    results = {}
+    if not dry_run and rendered:
+        try:
+            by_path = render_all(source, [documents[yaml_file][0] for yaml_file in rendered])
+            for yaml_file in list(rendered):
+                result = by_path[Path(documents[yaml_file][0])]
+                index = documents[yaml_file][2]
+                updated = {index.get(name)['name'] for name in file_names[yaml_file]}
+                blocked = [name for name in result.skipped_providers if name in updated]
+                if blocked:
+                    logger.info("%s: %s not block style, dumping the whole file",
+                                yaml_file, ", ".join(blocked))
+                    rendered.remove(yaml_file)
+                    round_trip.append(yaml_file)
+                else:
+                    results[yaml_file] = result
         except Exception as e:
-            logger.error("Error processing %s: %s", yaml_file, e)
-            stats.add_file_result(yaml_file, False)
+            logger.warning("Cannot render the configs, dumping them instead: %s", e)
+            round_trip.extend(yaml_file for yaml_file in rendered if file_names[yaml_file])
+            rendered, results = [], {}
+
+    for yaml_file in documents:
+        result = results.get(yaml_file)
+        stats.add_file_result(yaml_file, bool(file_names[yaml_file])
+                              or (result is not None and result.changed))
+
+    catalog = ProviderCatalog()  # model lists as written, for the catalog artifact
+    for name, models in source.items():
+        if any(name in index for _, _, index in documents.values()):
+            catalog.set_models(name, models)
+    config_providers = {}  # config path -> providers it lists, for the lockfile
+    staged_files = []
+    if not dry_run:
+        # Writes are staged and committed together: all files update, or none.
+        transaction = ConfigTransaction(validator=validate_yaml_file)
+        try:
+            write_rendered({result.path: result for result in results.values()},
+                           transaction=transaction)
+            staged_files.extend(yaml_file for yaml_file, result in results.items() if result.changed)
+        except Exception as e:
+            logger.error("Error staging rendered configs: %s", e)
+            stats.mark_files_failed(rendered)
+        if shards_enabled():
+            try:
+                write_shards(source, prune=False, transaction=transaction)
+            except Exception as e:
+                logger.error("Error staging model shards: %s", e)
+        for yaml_file in round_trip:
+            yaml_path, yaml_data, index = documents[yaml_file]
+            try:
+                for name in accepted:
+                    update_yaml_models(yaml_data, name, provider_models[name], index=index)
+                save_yaml_file(yaml_path, yaml_data, transaction=transaction)
+                staged_files.append(yaml_file)
+            except Exception as e:
+                logger.error("Error processing %s: %s", yaml_file, e)
+                stats.mark_files_failed([yaml_file])
+
+    for yaml_file, (yaml_path, yaml_data, index) in documents.items():
+        catalog.add_document(yaml_data)
+        providers = document_providers(yaml_data)
+        providers += [index.get(name)['name'] for name in accepted
+                      if name in index and index.get(name)['name'] not in providers]
+        config_providers[yaml_path] = providers
 
     if not dry_run:
+        try:
+            transaction.commit()
+            export_catalog(catalog, fetched_at, config_providers)
+        except TransactionError as e:
+            logger.error("No files were written, the update was rolled back: %s", e)
+            stats.mark_files_failed(staged_files)
+        compact_backups(backed_up)
         cleanup_temp_files()
 
     # Print summary
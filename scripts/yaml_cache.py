@@ -0,0 +1,154 @@
+"""On-disk cache of parsed YAML documents, keyed by content hash.
+
+``update_models``, ``automated_update``, ``convert_yaml_style`` and
+``report_staleness`` all round-trip parse the same five ~3,300-line
+configs, most of the time without any of them having changed. A ruamel
+round-trip parse of one file costs a few hundred milliseconds; unpickling
+the resulting ``CommentedMap`` costs a few milliseconds and dumps back
+byte for byte (comments, quotes and ``.lc`` line info included).
+
+The cache key is the SHA-256 of the file bytes plus a fingerprint of the
+loader settings and the ruamel version, so a changed file, a differently
+configured ``YAML()`` or a ruamel upgrade all miss and re-parse.
+
+Every hit returns a freshly unpickled object; callers may mutate it
+freely. Entries are plain pickle files under ``YAML_CACHE_DIR`` (default
+``scripts/.cache/yaml``); set ``YAML_CACHE=0`` to bypass the cache. The
+directory is local, git-ignored state: never point it at files you did
+not write yourself, since loading a pickle executes code.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+import ruamel.yaml
+from ruamel.yaml import YAML
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "yaml"
+DEFAULT_MAX_ENTRIES = 64
+
+
+def cache_enabled() -> bool:
+    return os.environ.get("YAML_CACHE", "1").lower() not in ("0", "false", "no")
+
+
+def settings_key(yaml: YAML) -> str:
+    """Describe everything about ``yaml`` that can change a parsed document."""
+    parts = (
+        ruamel.yaml.__version__,
+        pickle.HIGHEST_PROTOCOL,
+        tuple(yaml.typ),
+        yaml.pure,
+        yaml.preserve_quotes,
+        yaml.version,
+        yaml.width,
+        yaml.default_flow_style,
+        yaml.map_indent,
+        yaml.sequence_indent,
+        yaml.sequence_dash_offset,
+    )
+    return repr(parts)
+
+
+class YamlDocumentCache:
+    """Content-addressed store of pickled ruamel documents."""
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if cache_dir is None:
+            cache_dir = Path(os.environ.get("YAML_CACHE_DIR", DEFAULT_CACHE_DIR))
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, content: bytes, yaml: YAML) -> str:
+        digest = hashlib.sha256(content)
+        digest.update(b"\0")
+        digest.update(settings_key(yaml).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / ("%s.pickle" % key)
+
+    def load(self, file_path, yaml: YAML) -> Any:
+        """Parse ``file_path`` with ``yaml``, or return the cached result.
+
+        Parse errors propagate exactly as ``yaml.load`` raises them; only
+        successful parses are cached.
+        """
+        return self.load_bytes(Path(file_path).read_bytes(), yaml)
+
+    def load_bytes(self, content: bytes, yaml: YAML) -> Any:
+        """Like ``load`` for YAML text that is not (all of) a file."""
+        key = self.key(content, yaml)
+        entry = self._entry_path(key)
+
+        try:
+            with entry.open("rb") as f:
+                document = pickle.load(f)
+            self.hits += 1
+            return document
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            # Truncated or stale entry: drop it and fall back to parsing.
+            logger.warning("Discarding unreadable YAML cache entry %s: %s", entry.name, e)
+            self._unlink(entry)
+
+        self.misses += 1
+        document = yaml.load(content.decode("utf-8"))
+        self._store(entry, document)
+        return document
+
+    def _store(self, entry: Path, document: Any) -> None:
+        tmp_path = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_fd, tmp_path = tempfile.mkstemp(suffix=".pickle.tmp", dir=str(self.cache_dir))
+            with os.fdopen(tmp_fd, "wb") as f:
+                pickle.dump(document, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, entry)
+            tmp_path = None
+            self._prune()
+        except Exception as e:
+            # The cache is an optimization; never fail the caller over it.
+            logger.warning("Could not write YAML cache entry %s: %s", entry.name, e)
+        finally:
+            if tmp_path is not None:
+                self._unlink(Path(tmp_path))
+
+    def _prune(self) -> None:
+        entries = sorted(self.cache_dir.glob("*.pickle"), key=lambda p: p.stat().st_mtime)
+        for stale in entries[:max(0, len(entries) - self.max_entries)]:
+            self._unlink(stale)
+
+    def clear(self) -> None:
+        for entry in self.cache_dir.glob("*.pickle"):
+            self._unlink(entry)
+
+    @staticmethod
+    def _unlink(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def load_yaml_cached(file_path, yaml: Optional[YAML] = None) -> Any:
+    """Load ``file_path`` through the default cache (or directly if disabled)."""
+    if yaml is None:
+        yaml = YAML()
+    if not cache_enabled():
+        with open(file_path, "r", encoding="utf-8") as f:
+            return yaml.load(f)
+    return YamlDocumentCache().load(file_path, yaml)
+
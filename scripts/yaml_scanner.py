@@ -0,0 +1,326 @@
+"""Find ``models.default`` line ranges without parsing the YAML.
+
+``report_staleness.find_provider_ranges`` needs only the first and last
+line of each ``endpoints.custom[*].models.default`` list. A ruamel
+round-trip parse of a 3,300-line config builds every node of the
+document for that; this scanner reads the memory-mapped file once, line
+by line, and tracks just enough structure to answer it:
+
+- a stack of the enclosing mapping keys and sequence items, popped by
+  indentation (a sequence may sit at its parent key's indent);
+- flow collections and quoted scalars that continue over several lines,
+  and block scalars (``|``, ``>``), whose content lines are skipped;
+- the ``name`` of each ``endpoints.custom`` item and the lines of its
+  ``models.default`` items, block or flow style.
+
+The result matches the round-trip parse: 1-based inclusive
+``(start, end)`` lines of the first and last item, only for items whose
+``name`` is a string and whose list is not empty, the last item winning
+for duplicate names. YAML the scanner does not model (tabs, anchors,
+aliases, merge keys, tags, complex keys, several documents) raises
+``UnsupportedYAML``; ``scan_provider_ranges`` then returns None and the
+caller falls back to the parser. ``tests/test_yaml_scanner.py`` checks
+the two against each other.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+# YAML 1.2 core schema plain scalars that do not load as strings.
+_NON_STRING = re.compile(
+    r"^(?:~|null|Null|NULL|true|True|TRUE|false|False|FALSE"
+    r"|[-+]?[0-9]+|0o[0-7]+|0x[0-9a-fA-F]+"
+    r"|[-+]?(?:\.[0-9]+|[0-9]+(?:\.[0-9]*)?)(?:[eE][-+]?[0-9]+)?"
+    r"|[-+]?\.(?:inf|Inf|INF)|\.(?:nan|NaN|NAN))$"
+)
+_ENDPOINT_PATH = ("endpoints", "custom")
+
+
+class UnsupportedYAML(ValueError):
+    """The text uses YAML the scanner does not model."""
+
+
+@dataclass
+class _Frame:
+    kind: str  # "key" or "item"
+    indent: int
+    key: Optional[str] = None
+    inline: bool = False  # key with a value on its own line (not a block below)
+
+
+@dataclass
+class _Endpoint:
+    name: Optional[str] = None
+    start: Optional[int] = None
+    end: Optional[int] = None
+
+
+def _strip_comment(text: str) -> str:
+    """``text`` without a trailing `` # comment`` outside quotes."""
+    quote = None
+    for position, char in enumerate(text):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"" and (position == 0 or text[position - 1] in " [{,:"):
+            quote = char
+        elif char == "#" and (position == 0 or text[position - 1] in " \t"):
+            return text[:position].rstrip()
+    return text.rstrip()
+
+
+def _split_key(text: str) -> Optional[tuple[str, str]]:
+    """``(key, rest)`` if ``text`` starts with a mapping key, else None."""
+    if text[:1] in "'\"":
+        close = text.find(text[0], 1)
+        while close != -1 and text[0] == "'" and text[close + 1:close + 2] == "'":
+            close = text.find("'", close + 2)
+        if close == -1 or text[close + 1:close + 2] != ":":
+            return None
+        after = text[close + 2:]
+        if after and after[0] != " ":
+            return None
+        return _string_value(text[:close + 1]), after.strip()
+    match = re.match(r"([^\s#'\"\[\]{},][^#]*?):(?:\s+|$)", text)
+    if match is None:
+        return None
+    return match.group(1).rstrip(), text[match.end():]
+
+
+def _string_value(text: str) -> Optional[str]:
+    """The string a one-line scalar loads as, or None if it is not a string."""
+    text = _strip_comment(text.strip())
+    if not text:
+        return None
+    if text[0] == "'":
+        if len(text) < 2 or text[-1] != "'":
+            raise UnsupportedYAML("multi-line single-quoted scalar")
+        return text[1:-1].replace("''", "'")
+    if text[0] == '"':
+        try:
+            return json.loads(text)
+        except ValueError:
+            raise UnsupportedYAML("double-quoted scalar %s" % text) from None
+    if text[0] in "|>":
+        raise UnsupportedYAML("block scalar name")
+    if _NON_STRING.match(text):
+        return None
+    return text
+
+
+class _Scanner:
+    def __init__(self) -> None:
+        self.stack: list[_Frame] = []
+        self.endpoints: list[_Endpoint] = []
+        self.current: Optional[_Endpoint] = None
+        self.block_indent: Optional[int] = None  # skip lines deeper than this
+        self.flow: Optional[dict] = None  # open flow collection / quoted scalar
+
+    # -- structure ---------------------------------------------------------
+
+    def _path(self) -> tuple:
+        return tuple(frame.key if frame.kind == "key" else "-" for frame in self.stack)
+
+    def _in_endpoints(self) -> bool:
+        return bool(self.stack) and self.stack[0].key == "endpoints"
+
+    def _endpoint_key(self, key: str) -> bool:
+        return self._path() == _ENDPOINT_PATH + ("-", key)
+
+    def _default_key(self) -> bool:
+        return self._path() == _ENDPOINT_PATH + ("-", "models", "default")
+
+    def _add_item_line(self, number: int) -> None:
+        if self.current.start is None:
+            self.current.start = number
+        self.current.end = number
+
+    # -- values spanning lines ---------------------------------------------
+
+    def _scan_flow(self, text: str, number: int) -> None:
+        """Advance the open flow collection / quoted scalar over ``text``."""
+        state = self.flow
+        position = 0
+        while position < len(text):
+            char = text[position]
+            if state["quote"]:
+                if char == state["quote"]:
+                    if state["quote"] == "'" and text[position + 1:position + 2] == "'":
+                        position += 2
+                        continue
+                    state["quote"] = None
+                elif char == "\\" and state["quote"] == '"':
+                    position += 1
+            elif char == "#" and (position == 0 or text[position - 1] in " \t"):
+                break
+            elif char in "'\"":
+                state["quote"] = char
+                self._flow_item(state, number)
+            elif char in "[{":
+                self._flow_item(state, number)
+                state["depth"] += 1
+            elif char in "]}":
+                state["depth"] -= 1
+            elif char == ",":
+                if state["depth"] == 1:
+                    state["expect"] = True
+            elif char not in " \t":
+                self._flow_item(state, number)
+            position += 1
+            if state["depth"] == 0 and not state["quote"]:
+                if _strip_comment(text[position:]).strip():
+                    raise UnsupportedYAML("text after a flow collection on line %d" % number)
+                self.flow = None
+                return
+
+    @staticmethod
+    def _flow_item(state: dict, number: int) -> None:
+        if state["depth"] == 1 and state["expect"]:
+            state["expect"] = False
+            if state["items"] is not None:
+                state["items"].append(number)
+
+    def _value(self, value: str, number: int, frame: _Frame) -> None:
+        """Handle what follows ``key:`` on the key's line."""
+        value = value.strip()
+        if value[:1] in ("&", "*", "!") or frame.key == "<<":
+            if self._in_endpoints():
+                raise UnsupportedYAML("anchor, alias, tag or merge key on line %d" % number)
+        if not _strip_comment(value):
+            return
+        frame.inline = True
+        if value[0] == "{" and self._endpoint_key("models"):
+            raise UnsupportedYAML("flow mapping of models on line %d" % number)
+        if value[0] in "|>":
+            self.block_indent = frame.indent
+            return
+        if value[0] in "[{'\"":
+            items = [] if value[0] == "[" and self._default_key() else None
+            self.flow = {"quote": None, "depth": 0, "expect": True, "items": items}
+            self._scan_flow(value, number)
+            for line in items or ():
+                self._add_item_line(line)
+
+    # -- lines ---------------------------------------------------------------
+
+    def line(self, raw: str, number: int) -> None:
+        body = raw.rstrip("\r\n")
+        if self.flow is not None:
+            state = self.flow
+            before = len(state["items"]) if state["items"] is not None else 0
+            self._scan_flow(body, number)
+            if state["items"] is not None:
+                for line in state["items"][before:]:
+                    self._add_item_line(line)
+            return
+        stripped = body.lstrip(" ")
+        if not stripped or stripped.startswith("#"):
+            return
+        indent = len(body) - len(stripped)
+        if self.block_indent is not None:
+            if indent > self.block_indent:
+                return
+            self.block_indent = None
+        if stripped[0] == "\t":
+            raise UnsupportedYAML("tab indentation on line %d" % number)
+        if stripped.startswith(("---", "...")) and indent == 0:
+            if self.stack or stripped.startswith("..."):
+                raise UnsupportedYAML("several documents")
+            return
+
+        is_item = stripped == "-" or stripped.startswith("- ")
+        while self.stack:
+            top = self.stack[-1]
+            if top.indent < indent:
+                break
+            if top.indent == indent and is_item and top.kind == "key" and not top.inline:
+                break  # a block sequence may sit at its key's indent
+            self._pop()
+        if self.stack and self.stack[-1].kind == "key" and self.stack[-1].inline:
+            return  # continuation of a multi-line plain scalar
+
+        column, text = indent, stripped
+        while text == "-" or text.startswith("- "):
+            if self._default_key():
+                self._add_item_line(number)
+                self._push(_Frame("item", column))
+                return
+            self._push(_Frame("item", column))
+            rest = text[1:].lstrip(" ")
+            column += len(text) - len(rest)
+            text = rest
+            if not text:
+                return
+        if not text or text.startswith("#"):
+            return
+        if text == "?" or text.startswith("? "):
+            raise UnsupportedYAML("complex key on line %d" % number)
+        if text[0] in "[{" and self.stack and self.stack[-1].kind == "item":
+            if self._in_endpoints():
+                raise UnsupportedYAML("flow collection item on line %d" % number)
+        split = _split_key(text)
+        if split is None:
+            if text[0] in "[{'\"":
+                self.flow = {"quote": None, "depth": 0, "expect": True, "items": None}
+                self._scan_flow(text, number)
+            return
+        key, value = split
+        frame = _Frame("key", column, key)
+        self._push(frame)
+        if self._endpoint_key("name"):
+            self.current.name = _string_value(value)
+            return
+        self._value(value, number, frame)
+
+    def _push(self, frame: _Frame) -> None:
+        if frame.kind == "item" and self._path() == _ENDPOINT_PATH:
+            self.current = _Endpoint()
+            self.endpoints.append(self.current)
+        self.stack.append(frame)
+
+    def _pop(self) -> None:
+        frame = self.stack.pop()
+        if frame.kind == "item" and self._path() == _ENDPOINT_PATH:
+            self.current = None
+
+    def ranges(self) -> dict[str, tuple[int, int]]:
+        if self.flow is not None:
+            raise UnsupportedYAML("unterminated flow collection or quoted scalar")
+        ranges: dict[str, tuple[int, int]] = {}
+        for endpoint in self.endpoints:
+            if isinstance(endpoint.name, str) and endpoint.start is not None:
+                ranges[endpoint.name] = (endpoint.start, endpoint.end)
+        return ranges
+
+
+def scan_lines(lines: Iterable[str]) -> dict[str, tuple[int, int]]:
+    """``{provider: (start, end)}`` for the config ``lines``; raises ``UnsupportedYAML``."""
+    scanner = _Scanner()
+    for number, line in enumerate(lines, start=1):
+        scanner.line(line, number)
+    return scanner.ranges()
+
+
+def _mapped_lines(path: Path) -> Iterable[str]:
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return
+        with mapped:
+            for raw in iter(mapped.readline, b""):
+                yield raw.decode("utf-8")
+
+
+def scan_provider_ranges(path: Path) -> Optional[dict[str, tuple[int, int]]]:
+    """``{provider: (start, end)}`` of a config file, or None if it needs a real parser."""
+    try:
+        return scan_lines(_mapped_lines(Path(path)))
+    except (UnsupportedYAML, UnicodeDecodeError):
+        return None